@@ -0,0 +1,46 @@
+import random
+import time
+from benchmarks.boards import even_board
+from srcs.board import Board
+from srcs.solver import Solver
+
+
+def measure(digit_list: list[int]) -> tuple[float, float, int]:
+    """
+    测量逐步求解得到第一步的耗时与完整求解的耗时
+
+    Args:
+        digit_list: 表示局面的整数列表
+
+    Returns:
+        result: (第一步耗时（秒）, 完整求解耗时（秒）, 步数)
+    """
+    board = Board()
+    board.set_digits(list(digit_list))
+    solver = Solver()
+    solver.set_board(board)
+    start = time.perf_counter()
+    moves = solver.solve_iter()
+    next(moves, None)
+    first_seconds = time.perf_counter() - start
+    moves.close()
+
+    solver.set_board(board)
+    start = time.perf_counter()
+    solver.solve()
+    return first_seconds, time.perf_counter() - start, len(solver.get_solution())
+
+
+def main() -> None:
+    """打印不同棋盘大小下第一步与完整求解的耗时，各取5个随机棋盘的中位数"""
+    rng = random.Random(0)
+    print(f"{'cells':>5} {'steps':>6} {'first_ms':>9} {'total_ms':>9} {'ratio':>6}")
+    for length in (28, 90, 180, 360):
+        result_list = sorted(measure(even_board(rng, length)) for _ in range(5))
+        first_seconds, total_seconds, steps = result_list[2]
+        print(f'{length:>5} {steps:>6} {first_seconds * 1000:>9.2f} {total_seconds * 1000:>9.2f} '
+              f'{total_seconds / first_seconds:>6.1f}')
+
+
+if __name__ == '__main__':
+    main()
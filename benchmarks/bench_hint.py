@@ -0,0 +1,78 @@
+import random
+import sys
+import time
+from benchmarks.boards import even_board
+from srcs.board import Board
+from srcs.solver import Solver
+
+
+def percentile(value_list: list[float], fraction: float) -> float:
+    """
+    最近秩法求百分位数
+
+    Args:
+        value_list: 样本
+        fraction: 百分位（0到1）
+
+    Returns:
+        percentile: 百分位数
+    """
+    value_list = sorted(value_list)
+    return value_list[min(int(fraction * len(value_list)), len(value_list) - 1)]
+
+
+def measure(length: int, budget: float, count: int, seed: int = 0) -> tuple[list[float], list[float]]:
+    """
+    测量在随机局面上提示的延迟与置信度
+
+    每个棋盘先贪心执行随机步数，得到对局中途的局面，再调用一次hint()。每个局面使用新的求解器，不复用搜索树。
+
+    Args:
+        length: 初始棋盘的格子数
+        budget: 提示的时限（秒）
+        count: 局面数
+        seed: 随机种子
+
+    Returns:
+        result: (各次提示的延迟（秒）, 各次提示的置信度)
+    """
+    rng = random.Random(seed)
+    latency_list, confidence_list = [], []
+    while len(latency_list) < count:
+        board = Board()
+        board.set_digits(even_board(rng, length))
+        solver = Solver()
+        solver.set_board(board)
+        for move, _ in zip(solver.solve_iter(), range(rng.randrange(length // 4 + 1))):
+            board.match(*move[0])
+
+        solver = Solver()
+        start = time.perf_counter()
+        digit_pair, confidence = solver.hint(board, budget)
+        latency = time.perf_counter() - start
+        if digit_pair is not None:
+            latency_list.append(latency)
+            confidence_list.append(confidence)
+    return latency_list, confidence_list
+
+
+def main() -> None:
+    """
+    打印典型与大棋盘上不同时限的提示延迟与平均置信度，每组默认100个局面
+
+    延迟以p50/p99给出，超出时限的部分以p99减去时限（毫秒）及p99与时限之比给出。
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f"{'cells':>5} {'budget_ms':>9} {'p50_ms':>7} {'p99_ms':>7} {'over_ms':>7} {'p99/budget':>10} "
+          f"{'confidence':>10}")
+    for length in (28, 54, 180, 360):
+        for budget in (0.002, 0.01, 0.05):
+            latency_list, confidence_list = measure(length, budget, count)
+            p99 = percentile(latency_list, 0.99)
+            print(f'{length:>5} {budget * 1000:>9.0f} {percentile(latency_list, 0.5) * 1000:>7.2f} '
+                  f'{p99 * 1000:>7.2f} {(p99 - budget) * 1000:>7.2f} {p99 / budget:>10.2f} '
+                  f'{sum(confidence_list) / len(confidence_list):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
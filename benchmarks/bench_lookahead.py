@@ -0,0 +1,43 @@
+import sys
+import time
+from benchmarks.boards import solvable_boards
+from srcs.board import Board
+from srcs.solver import Solver
+
+
+def measure(depth: int, digit_lists: list[list[int]]) -> tuple[int, float, float]:
+    """
+    测量给定前瞻步数的求解率与耗时
+
+    Args:
+        depth: 前瞻步数
+        digit_lists: 各棋盘的局面
+
+    Returns:
+        result: (清空的棋盘数, 总耗时（秒）, 备忘录命中率)
+    """
+    solved, lookups, hits = 0, 0, 0
+    start = time.perf_counter()
+    for digit_list in digit_lists:
+        board = Board()
+        board.set_digits(list(digit_list))
+        solver = Solver()
+        solver.set_board(board)
+        solved += solver.solve_lookahead(depth)
+        lookups += solver.stats['memo_lookups']
+        hits += solver.stats['memo_hits']
+    return solved, time.perf_counter() - start, hits / max(lookups, 1)
+
+
+def main() -> None:
+    """打印前瞻1到N步的求解率与耗时，N默认为5"""
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    digit_lists = solvable_boards(150)
+    print(f"{'depth':>5} {'solved':>7} {'rate':>6} {'seconds':>8} {'hit_rate':>9}")
+    for depth in range(1, max_depth + 1):
+        solved, elapsed, hit_rate = measure(depth, digit_lists)
+        print(f'{depth:>5} {solved:>7} {solved / len(digit_lists):>6.1%} {elapsed:>8.2f} {hit_rate:>9.1%}')
+
+
+if __name__ == '__main__':
+    main()
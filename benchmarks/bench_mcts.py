@@ -0,0 +1,54 @@
+import random
+import sys
+import time
+from benchmarks.boards import solvable_boards
+from srcs.board import Board
+from srcs.solver import Solver, _playout
+
+
+def playout_rate(length: int, seconds: float = 1.0, seed: int = 0) -> float:
+    """
+    测量随机模拟的吞吐量
+
+    Args:
+        length: 棋盘的格子数
+        seconds: 测量时长（秒）
+        seed: 随机种子
+
+    Returns:
+        rate: 每秒完成的模拟次数
+    """
+    rng = random.Random(seed)
+    digit_list = [min(digit, 10 - digit) for digit in (rng.randint(1, 9) for _ in range(length))]
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        _playout(list(digit_list), rng, [])
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """打印各棋盘大小的模拟吞吐量，以及不同模拟次数下150个可解棋盘的求解率，模拟次数默认为10和100"""
+    rollouts_list = [int(arg) for arg in sys.argv[1:]] or [10, 100]
+    print(f"{'cells':>5} {'playouts/s':>11}")
+    for length in (18, 27, 54, 90):
+        print(f'{length:>5} {playout_rate(length):>11.0f}')
+
+    digit_lists = solvable_boards(150)
+    print(f"{'rollouts':>8} {'solved':>7} {'rate':>6} {'seconds':>8}")
+    for rollouts in rollouts_list:
+        solved = 0
+        start = time.perf_counter()
+        for digit_list in digit_lists:
+            board = Board()
+            board.set_digits(list(digit_list))
+            solver = Solver()
+            solver.set_board(board)
+            solved += solver.solve_mcts(rollouts)
+        elapsed = time.perf_counter() - start
+        print(f'{rollouts:>8} {solved:>7} {solved / len(digit_lists):>6.1%} {elapsed:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import random
+import tracemalloc
+from srcs.board import Board
+from srcs.twin_board import TwinBoard
+from srcs.compact_board import CompactBoard, CompactTwinBoard
+
+
+class ListBoard:
+    """基线表示：加入邻居索引之前的Board，只以列表保存局面，实例带有__dict__"""
+
+    def set_digits(self, digit_list: list[int]) -> None:
+        """
+        设置局面
+
+        Args:
+            digit_list: 表示局面的整数列表，使用0表示空格
+        """
+        self.digit_list = digit_list
+
+
+def measure(board_class: type, twin_class: type | None, digit_lists: list[list[int]],
+            searched: bool = False) -> float:
+    """
+    测量同时持有多个棋盘时每个棋盘占用的内存
+
+    Args:
+        board_class: 棋盘类
+        twin_class: 孪生棋盘类，为None时只持有棋盘
+        digit_lists: 各棋盘的局面
+        searched: 是否在持有前列出一次可消除数字对，使延迟建立的邻居索引也计入
+
+    Returns:
+        size: 平均每个棋盘占用的字节数
+    """
+    tracemalloc.start()
+    boards = []
+    for digit_list in digit_lists:
+        board = board_class()
+        board.set_digits(list(digit_list))
+        if searched:
+            board._find_pairs()
+        boards.append(twin_class(board) if twin_class else board)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(boards)
+
+
+def main() -> None:
+    """打印基线表示、列表存储与紧凑存储的内存对比"""
+    rng = random.Random(0)
+    print(f"{'rows':>5} {'baseline':>9} {'Board':>8} {'CompactBoard':>13} {'searched':>9} "
+          f"{'TwinBoard':>10} {'CompactTwinBoard':>17}")
+    for row_count in (5, 15, 45):
+        digit_lists = [[rng.randint(1, 9) for _ in range(9 * row_count)] for _ in range(200)]
+        sizes = (measure(ListBoard, None, digit_lists), measure(Board, None, digit_lists),
+                 measure(CompactBoard, None, digit_lists), measure(CompactBoard, None, digit_lists, True),
+                 measure(Board, TwinBoard, digit_lists), measure(CompactBoard, CompactTwinBoard, digit_lists))
+        print(f"{row_count:>5} {sizes[0]:>9.0f} {sizes[1]:>8.0f} {sizes[2]:>13.0f} {sizes[3]:>9.0f} "
+              f"{sizes[4]:>10.0f} {sizes[5]:>17.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import os
+import random
+import sys
+import time
+from benchmarks.boards import even_board
+from srcs.board import Board
+from srcs.solver import Solver
+
+
+def measure(workers: int, digit_lists: list[list[int]]) -> tuple[float, list]:
+    """
+    测量使用给定进程数贪心求解一组棋盘的耗时
+
+    Args:
+        workers: 评估候选数字对的进程数
+        digit_lists: 各棋盘的局面
+
+    Returns:
+        result: (总耗时（秒）, 各棋盘的消除路径)
+    """
+    path_list = []
+    with Solver(workers) as solver:
+        start = time.perf_counter()
+        for digit_list in digit_lists:
+            board = Board()
+            board.set_digits(list(digit_list))
+            solver.set_board(board)
+            solver.solve()
+            path_list.append(solver.get_solution())
+        return time.perf_counter() - start, path_list
+
+
+def main() -> None:
+    """打印1到N个进程的耗时与加速比，N默认为CPU核数"""
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    rng = random.Random(0)
+    digit_lists = [even_board(rng, 9 * 40) for _ in range(3)]
+    print(f'cpu_count={os.cpu_count()}')
+    print(f"{'workers':>7} {'seconds':>8} {'speedup':>8}")
+    base_time, base_path_list = measure(1, digit_lists)
+    print(f'{1:>7} {base_time:>8.2f} {1:>8.2f}')
+    for workers in range(2, max_workers + 1):
+        elapsed, path_list = measure(workers, digit_lists)
+        assert path_list == base_path_list
+        print(f'{workers:>7} {elapsed:>8.2f} {base_time / elapsed:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable
+from benchmarks.boards import even_board
+from srcs.board import Board
+from srcs.solver import Solver
+from srcs.twin_board import TwinBoard
+
+# 默认的基线文件，与本脚本放在一起
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+ROWS = (1, 2, 4, 8, 16, 32, 64)
+QUICK_ROWS = (1, 4, 16)
+DENSITIES = (0.25, 0.5, 1.0)
+
+# 每项测量至少运行的次数与持续时长（秒），取单次耗时的最小值
+MIN_RUNS = 3
+MIN_SECONDS = 0.05
+
+
+def make_board(rng: random.Random, rows: int, density: float) -> list[int]:
+    """
+    生成给定行数与填充密度的随机局面，各互补数的格子数都为偶数
+
+    Args:
+        rng: 随机数发生器
+        rows: 行数
+        density: 非空格子的比例
+
+    Returns:
+        digit_list: 表示局面的整数列表，长度为9 * rows
+    """
+    length = 9 * rows
+    count = max(2, int(length * density) // 2 * 2)
+    digit_list = [0] * length
+    for global_index, digit in zip(sorted(rng.sample(range(length), count)), even_board(rng, count)):
+        digit_list[global_index] = digit
+    return digit_list
+
+
+def _board(digit_list: list[int]) -> Board:
+    """
+    由局面的拷贝构造棋盘
+
+    Args:
+        digit_list: 表示局面的整数列表
+
+    Returns:
+        board: Board实例
+    """
+    board = Board()
+    board.set_digits(list(digit_list))
+    return board
+
+
+def _clear_board(digit_list: list[int]) -> Board:
+    """
+    构造中间一行为空行的棋盘，用于测量清理空行
+
+    Args:
+        digit_list: 表示局面的整数列表
+
+    Returns:
+        board: Board实例
+    """
+    digit_list = list(digit_list)
+    row_start = len(digit_list) // 18 * 9
+    digit_list[row_start: row_start + 9] = [0] * 9
+    return _board(digit_list)
+
+
+def _twin_board(digit_list: list[int]) -> TwinBoard:
+    """
+    构造孪生棋盘
+
+    Args:
+        digit_list: 表示局面的整数列表
+
+    Returns:
+        twin_board: TwinBoard实例
+    """
+    return TwinBoard(_board(digit_list))
+
+
+def _solver(digit_list: list[int]) -> Solver:
+    """
+    构造设置好棋盘的求解器
+
+    Args:
+        digit_list: 表示局面的整数列表
+
+    Returns:
+        solver: Solver实例
+    """
+    solver = Solver()
+    solver.set_board(_board(digit_list))
+    return solver
+
+
+def _is_pair_batch(board: Board) -> int:
+    """
+    对每个非空格子与其后的若干格子调用_is_pair()
+
+    Args:
+        board: Board实例
+
+    Returns:
+        calls: 调用次数
+    """
+    length = len(board.digit_list)
+    calls = 0
+    for global_index1 in range(length):
+        for global_index2 in range(global_index1 + 1, min(global_index1 + 20, length)):
+            board._is_pair(global_index1, global_index2)
+            calls += 1
+    return max(calls, 1)
+
+
+def _match_target(digit_list: list[int]) -> tuple[Board, tuple[int, int] | None]:
+    """
+    构造棋盘并选出第一个可消除数字对
+
+    Args:
+        digit_list: 表示局面的整数列表
+
+    Returns:
+        target: (Board实例, 第一个可消除数字对，不存在时为None)
+    """
+    board = _board(digit_list)
+    pair_list = board._find_pairs()
+    return board, pair_list[0] if pair_list else None
+
+
+def _match(target: tuple[Board, tuple[int, int] | None]) -> None:
+    """
+    消除选出的数字对，棋盘因此出现空行时同时清理
+
+    Args:
+        target: _match_target()的结果
+    """
+    board, digit_pair = target
+    if digit_pair is not None:
+        board.match(*digit_pair)
+
+
+# 测量项：(名称, 构造测量对象（不计时）, 被测操作（返回int时为本次的调用次数，其他返回值视为1次）)
+OPERATIONS: tuple[tuple[str, Callable, Callable], ...] = (
+    ('is_pair', _board, _is_pair_batch),
+    ('match', _match_target, _match),
+    ('clear', _clear_board, Board._clear),
+    ('fill', _board, Board.fill),
+    ('twin_init', _board, TwinBoard),
+    ('analyze', _twin_board, TwinBoard._analyze),
+    ('solve', _solver, Solver.solve),
+)
+
+
+def time_operation(setup: Callable, operation: Callable, digit_list: list[int]) -> float:
+    """
+    测量一项操作的单次耗时
+
+    每次运行前重新构造测量对象（不计时），至少运行MIN_RUNS次且包括构造在内持续MIN_SECONDS秒，取最小值。
+
+    Args:
+        setup: 由局面构造测量对象
+        operation: 被测操作，返回int时为本次的调用次数
+        digit_list: 表示局面的整数列表
+
+    Returns:
+        seconds: 单次调用的耗时（秒）
+    """
+    best = math.inf
+    runs = 0
+    end_time = time.perf_counter() + MIN_SECONDS
+    while runs < MIN_RUNS or time.perf_counter() < end_time:
+        target = setup(digit_list)
+        start = time.perf_counter()
+        calls = operation(target)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed / (calls if type(calls) is int else 1))
+        runs += 1
+    return best
+
+
+def run_suite(rows_tuple: tuple[int, ...] = ROWS, densities: tuple[float, ...] = DENSITIES,
+              seed: int = 0) -> dict[str, float]:
+    """
+    在各行数与填充密度的随机局面上测量所有操作
+
+    同一行数与密度下所有操作使用同一个局面，局面只由种子决定。
+
+    Args:
+        rows_tuple: 行数
+        densities: 填充密度
+        seed: 随机种子
+
+    Returns:
+        results: 键为'操作/行数/密度'，值为单次调用的耗时（微秒）
+    """
+    results = {}
+    for rows in rows_tuple:
+        for density in densities:
+            digit_list = make_board(random.Random(f'{seed}:{rows}:{density}'), rows, density)
+            for name, setup, operation in OPERATIONS:
+                seconds = time_operation(setup, operation, digit_list)
+                results[f'{name}/{rows}/{density}'] = round(seconds * 1e6, 3)
+    return results
+
+
+def scaling_exponent(results: dict[str, float], name: str, density: float) -> float | None:
+    """
+    耗时关于行数的对数斜率，即耗时约为行数的多少次方
+
+    Args:
+        results: run_suite()的结果
+        name: 操作名称
+        density: 填充密度
+
+    Returns:
+        exponent: 最小与最大行数之间的对数斜率，不足两个行数时为None
+    """
+    point_list = sorted((int(key.split('/')[1]), microseconds) for key, microseconds in results.items()
+                        if key.split('/')[0] == name and float(key.split('/')[2]) == density)
+    if len(point_list) < 2 or point_list[0][1] <= 0:
+        return None
+    (rows1, microseconds1), (rows2, microseconds2) = point_list[0], point_list[-1]
+    return math.log(microseconds2 / microseconds1) / math.log(rows2 / rows1)
+
+
+def print_curves(results: dict[str, float], densities: tuple[float, ...]) -> None:
+    """
+    打印各操作的耗时随行数变化的曲线，每个密度一列，最后一行为对数斜率
+
+    Args:
+        results: run_suite()的结果
+        densities: 填充密度
+    """
+    rows_list = sorted({int(key.split('/')[1]) for key in results})
+    for name, _, _ in OPERATIONS:
+        print(f'\n{name} (us)')
+        print(f"{'rows':>6}" + ''.join(f'{f"d={density}":>12}' for density in densities))
+        for rows in rows_list:
+            print(f'{rows:>6}' + ''.join(f'{results[f"{name}/{rows}/{density}"]:>12.2f}' for density in densities))
+        exponent_list = [scaling_exponent(results, name, density) for density in densities]
+        print(f"{'slope':>6}" + ''.join(f'{"-" if exponent is None else f"{exponent:.2f}":>12}'
+                                        for exponent in exponent_list))
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float,
+            normalize: bool = True) -> tuple[float, list[tuple[str, float]], list[tuple[str, float]]]:
+    """
+    与基线比较
+
+    一次修改通常只影响少数测量项，因此所有测量项耗时之比的中位数反映的是机器整体速度的差异与漂移，
+    normalize为True时各项耗时之比先除以该中位数。除以中位数会掩盖使所有测量项同时变慢的修改，
+    因此中位数本身超过阈值时也作为名为'median'的一项报告为退化，低于阈值的倒数时报告为改进。
+
+    Args:
+        results: run_suite()的结果
+        baseline: 基线中的结果
+        threshold: 耗时之比超过该值视为退化，低于其倒数视为改进
+        normalize: 是否除以耗时之比的中位数
+
+    Returns:
+        report: (耗时之比的中位数, 退化的测量项及耗时之比, 改进的测量项及耗时之比)，后两者各自按比值从极端到温和排序
+    """
+    ratio_list = [(key, results[key] / baseline[key]) for key in results if baseline.get(key)]
+    scale = statistics.median(ratio for _, ratio in ratio_list) if ratio_list else 1.0
+    if normalize:
+        ratio_list = [(key, ratio / scale) for key, ratio in ratio_list] + [('median', scale)]
+    regression_list = sorted(((key, ratio) for key, ratio in ratio_list if ratio > threshold), key=lambda x: -x[1])
+    improvement_list = sorted(((key, ratio) for key, ratio in ratio_list if ratio < 1 / threshold),
+                              key=lambda x: x[1])
+    return scale, regression_list, improvement_list
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    命令行入口：运行基准测试，打印扩展曲线，并与基线比较
+
+    Args:
+        argv: 命令行参数，默认使用sys.argv[1:]
+
+    Returns:
+        code: 退出码，存在退化时为1，否则为0
+    """
+    parser = argparse.ArgumentParser(description='NumberMatch基准测试套件')
+    parser.add_argument('--quick', action='store_true', help=f'只测量{QUICK_ROWS}行')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子，默认为0')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='基线文件，默认为benchmarks/baseline.json')
+    parser.add_argument('--repeat', type=int, default=3, help='重复运行整个套件的次数，每项取最小值，默认为3')
+    parser.add_argument('--threshold', type=float, default=1.5, help='耗时之比超过该值视为退化，默认为1.5')
+    parser.add_argument('--absolute', action='store_true', help='直接比较耗时，不除以耗时之比的中位数')
+    parser.add_argument('--update-baseline', action='store_true', help='将本次结果写入基线文件')
+    parser.add_argument('-o', '--output', default=None, help='将本次结果写入JSON文件')
+    args = parser.parse_args(argv)
+
+    rows_tuple = QUICK_ROWS if args.quick else ROWS
+    start = time.perf_counter()
+    results = run_suite(rows_tuple, DENSITIES, args.seed)
+    for _ in range(args.repeat - 1):
+        for key, microseconds in run_suite(rows_tuple, DENSITIES, args.seed).items():
+            results[key] = min(results[key], microseconds)
+    print(f'{len(results)} measurements in {time.perf_counter() - start:.1f}s')
+    print_curves(results, DENSITIES)
+
+    document = {'python': platform.python_version(), 'machine': platform.machine(), 'seed': args.seed,
+                'repeat': args.repeat, 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=1)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=1)
+        print(f'\nbaseline written to {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f'\nno baseline at {args.baseline}')
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+    if baseline.get('seed') != args.seed:
+        print(f"\nbaseline seed {baseline.get('seed')} differs from {args.seed}, skipping comparison")
+        return 0
+    scale, regression_list, improvement_list = compare(results, baseline['results'], args.threshold,
+                                                       not args.absolute)
+    print(f'\ncompared with {args.baseline} (threshold {args.threshold}x, median ratio {scale:.2f}x'
+          f'{"" if args.absolute else ", normalized"})')
+    for key, ratio in regression_list:
+        print(f'  REGRESSION  {key:<24} {ratio:>6.2f}x')
+    for key, ratio in improvement_list:
+        print(f'  improvement {key:<24} {ratio:>6.2f}x')
+    print(f'{len(regression_list)} regressions, {len(improvement_list)} improvements')
+    return 1 if regression_list else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import random
+from srcs.board import Board
+from srcs.solver import Solver
+
+
+def even_board(rng: random.Random, length: int) -> list[int]:
+    """
+    生成各互补数格子数都为偶数的随机局面
+
+    某个互补数的格子数为奇数的棋盘会被预检查直接拒绝，不能用于测量求解耗时。
+
+    Args:
+        rng: 随机数发生器
+        length: 格子数，为偶数
+
+    Returns:
+        digit_list: 表示局面的整数列表
+    """
+    half = [rng.randint(1, 9) for _ in range(length // 2)]
+    digit_list = half + [10 - digit if rng.random() < 0.5 else digit for digit in half]
+    rng.shuffle(digit_list)
+    return digit_list
+
+
+def solvable_boards(count: int, seed: int = 0) -> list[list[int]]:
+    """
+    生成精确求解可以清空的均匀随机棋盘，12到16格
+
+    与generate()倒推得到的棋盘分布不同，用于比较各求解方法在同一批可解棋盘上的求解率。
+
+    Args:
+        count: 棋盘数
+        seed: 随机种子
+
+    Returns:
+        digit_lists: 各棋盘的局面
+    """
+    rng = random.Random(seed)
+    digit_lists = []
+    while len(digit_lists) < count:
+        digit_list = [rng.randint(1, 9) for _ in range(rng.choice([12, 14, 16]))]
+        board = Board()
+        board.set_digits(list(digit_list))
+        solver = Solver()
+        solver.set_board(board)
+        if solver.solve_exact():
+            digit_lists.append(digit_list)
+    return digit_lists
@@ -0,0 +1,191 @@
+from functools import lru_cache
+from srcs.board import Board, LINEAR_AXIS, COLUMN_AXIS, DIAGONAL_AXIS, ANTI_DIAGONAL_AXIS
+from srcs.twin_board import TwinBoard
+
+# 各视线轴上相邻格子的全局索引差
+AXIS_STEPS = {LINEAR_AXIS: 1, COLUMN_AXIS: 9, DIAGONAL_AXIS: 10, ANTI_DIAGONAL_AXIS: 8}
+
+# 将数字映射为互补数字符，用于一次性构造各互补数的位掩码
+CLASS_TABLES = [bytes(ord('1') if digit and min(digit, 10 - digit) == digit_class else ord('0') for digit in range(256))
+                for digit_class in range(6)]
+OCCUPANCY_TABLE = bytes(ord('1') if digit else ord('0') for digit in range(256))
+
+
+@lru_cache(maxsize=64)
+def line_masks(length: int) -> tuple:
+    """
+    给定棋盘长度下的视线掩码
+
+    Args:
+        length: 棋盘的格子数
+
+    Returns:
+        line_masks: (每条视线轴上经过各格子的视线掩码, 每行的掩码, 各视线轴的防越界掩码)
+    """
+    full_mask = (1 << length) - 1
+    row_mask_list = [((1 << 9) - 1) << (9 * row_index) & full_mask for row_index in range((length + 8) // 9)]
+    col_mask_list = [0] * 9
+    line_dict = {}
+    for global_index in range(length):
+        row_index, col_index = divmod(global_index, 9)
+        col_mask_list[col_index] |= 1 << global_index
+        for axis, line in ((DIAGONAL_AXIS, col_index - row_index), (ANTI_DIAGONAL_AXIS, col_index + row_index)):
+            line_dict[axis, line] = line_dict.get((axis, line), 0) | 1 << global_index
+
+    axis_mask_list = [[full_mask] * length, [0] * length, [0] * length, [0] * length]
+    for global_index in range(length):
+        row_index, col_index = divmod(global_index, 9)
+        axis_mask_list[COLUMN_AXIS][global_index] = col_mask_list[col_index]
+        axis_mask_list[DIAGONAL_AXIS][global_index] = line_dict[DIAGONAL_AXIS, col_index - row_index]
+        axis_mask_list[ANTI_DIAGONAL_AXIS][global_index] = line_dict[ANTI_DIAGONAL_AXIS, col_index + row_index]
+
+    # 沿主对角线移动时第0列是从上一行末尾绕回的格子，沿副对角线移动时第8列同理
+    guard_mask_list = [full_mask, full_mask, full_mask & ~col_mask_list[0], full_mask & ~col_mask_list[8]]
+    return axis_mask_list, row_mask_list, guard_mask_list
+
+
+class BitBoardEngine:
+    """位棋盘引擎，覆盖Board中与最近非空邻居索引相关的方法"""
+
+    __slots__ = ()
+
+    def _build_index(self) -> None:
+        """
+        建立位棋盘
+
+        以Python大整数的第i位表示第i个格子：一个占用掩码，以及每个互补数（1-5）各一个掩码。
+        位棋盘不需要最近非空邻居指针。
+        """
+        digit_bytes = bytes(reversed(self.digit_list))
+        self._occupancy = int(digit_bytes.translate(OCCUPANCY_TABLE) or b'0', 2)
+        self._class_mask_list = [int(digit_bytes.translate(table) or b'0', 2) for table in CLASS_TABLES]
+        self._next_list = self._prev_list = self._row_count_list = None
+        self._empty_row_count = sum(not self._occupancy & row_mask for row_mask in line_masks(len(self.digit_list))[1])
+
+    def _unlink(self, global_index: int) -> None:
+        """
+        将被消除的格子从位棋盘中移除
+
+        Args:
+            global_index: 全局索引（0-based）
+        """
+        bit = 1 << global_index
+        self._occupancy &= ~bit
+        for digit_class in range(1, 6):
+            self._class_mask_list[digit_class] &= ~bit
+        if not self._occupancy & line_masks(len(self.digit_list))[1][global_index // 9]:
+            self._empty_row_count += 1
+
+    def _relink(self, global_index: int) -> None:
+        """
+        将格子重新放回位棋盘
+
+        Args:
+            global_index: 全局索引（0-based）
+        """
+        digit = self.digit_list[global_index]
+        self._occupancy |= 1 << global_index
+        self._class_mask_list[min(digit, 10 - digit)] |= 1 << global_index
+
+    def _is_clear(self, global_index1: int, global_index2: int, axis: int) -> bool:
+        """
+        视线轴上两个非空格子之间是否没有其他非空格子
+
+        Args:
+            global_index1: 较小的全局索引（0-based）
+            global_index2: 较大的全局索引（0-based）
+            axis: 视线轴编号
+
+        Returns:
+            is_clear: 如果两者之间的视线掩码与占用掩码不相交则返回True，否则返回False
+        """
+        between_mask = line_masks(len(self.digit_list))[0][axis][global_index1] & \
+            ((1 << global_index2) - (1 << (global_index1 + 1)))
+        return not self._occupancy & between_mask
+
+    def _neighbours(self, global_index: int, axis: int) -> tuple[int, int]:
+        """
+        视线轴上前后最近的非空格子
+
+        Args:
+            global_index: 全局索引（0-based）
+            axis: 视线轴编号
+
+        Returns:
+            neighbours: 前后最近非空格子的全局索引，不存在则为-1
+        """
+        line_mask = self._occupancy & line_masks(len(self.digit_list))[0][axis][global_index]
+        before_mask = line_mask & ((1 << global_index) - 1)
+        after_mask = line_mask >> (global_index + 1) << (global_index + 1)
+        return before_mask.bit_length() - 1, (after_mask & -after_mask).bit_length() - 1
+
+    def _find_pairs(self) -> list[tuple[int, int]]:
+        """
+        列出所有可消除数字对
+
+        对每个视线轴，把占用掩码整体沿轴移动一步、两步……，只允许穿过空格继续移动；
+        第k步命中的非空格子与其前方k步的格子之间全为空格，再与互补数掩码相交即得到可消除数字对。
+        循环次数只取决于最长的空格间隔，与格子数无关。
+
+        Returns:
+            pair_list: 按全局索引排序的可消除数字对列表
+        """
+        occupancy = self._occupancy
+        guard_mask_list = line_masks(len(self.digit_list))[2]
+        pair_set = set()
+        for axis, step in AXIS_STEPS.items():
+            frontier = occupancy
+            distance = 0
+            # 跨行首尾规则只适用于相邻两行，按索引顺序最多相距17格
+            while frontier and (axis != LINEAR_AXIS or distance < 17):
+                frontier = (frontier << step) & guard_mask_list[axis]
+                distance += step
+                hit_mask = frontier & occupancy
+                if hit_mask:
+                    for class_mask in self._class_mask_list[1:]:
+                        pair_mask = hit_mask & class_mask & (class_mask << distance)
+                        while pair_mask:
+                            global_index2 = (pair_mask & -pair_mask).bit_length() - 1
+                            pair_mask &= pair_mask - 1
+                            global_index1 = global_index2 - distance
+                            if axis != LINEAR_AXIS or global_index2 // 9 - global_index1 // 9 <= 1:
+                                pair_set.add((global_index1, global_index2))
+                frontier &= ~occupancy
+        return sorted(pair_set)
+
+    def _journal_entry(self, global_index1: int, global_index2: int) -> tuple:
+        """
+        记录消除或填充前的局面及位掩码
+
+        Args:
+            global_index1: 全局索引（0-based）
+            global_index2: 全局索引（0-based）
+
+        Returns:
+            entry: 日志条目
+        """
+        return super()._journal_entry(global_index1, global_index2), self._occupancy, list(self._class_mask_list)
+
+    def _rollback(self, entry: tuple) -> None:
+        """
+        根据日志条目撤销一次消除或填充
+
+        Args:
+            entry: _journal_entry()返回的日志条目
+        """
+        board_entry, occupancy, class_mask_list = entry
+        super()._rollback(board_entry)
+        self._occupancy = occupancy
+        self._class_mask_list = class_mask_list
+
+
+class BitBoard(BitBoardEngine, Board):
+    """位棋盘引擎的棋盘类"""
+
+    __slots__ = ('_occupancy', '_class_mask_list')
+
+
+class BitTwinBoard(BitBoardEngine, TwinBoard):
+    """位棋盘引擎的孪生棋盘类"""
+
+    __slots__ = ('_occupancy', '_class_mask_list')
@@ -1,9 +1,71 @@
+# 视线轴编号：全局索引顺序（同行及跨行首尾）、相同列、主对角线、副对角线
+LINEAR_AXIS, COLUMN_AXIS, DIAGONAL_AXIS, ANTI_DIAGONAL_AXIS = range(4)
+
+# 路径中表示一次拷贝填充的步骤，可以传给apply()
+FILL_MOVE = (-1, -1)
+
+# Zobrist键表：第10 * i + d项为第i个格子上数字d的键，第i项长度键对应长度为i的局面，按需增长
+ZOBRIST_KEYS = []
+LENGTH_KEYS = []
+
+
+def _splitmix64(seed: int) -> int:
+    """
+    SplitMix64混合函数，由序号确定性地生成64位键，键值与生成顺序和进程无关
+
+    Args:
+        seed: 序号
+
+    Returns:
+        key: 64位整数
+    """
+    z = (seed * 0x9E3779B97F4A7C15 + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return z ^ (z >> 31)
+
+
+def _grow_keys(length: int) -> None:
+    """
+    保证键表覆盖长度不超过length的局面
+
+    Args:
+        length: 局面长度
+    """
+    while len(LENGTH_KEYS) <= length:
+        LENGTH_KEYS.append(_splitmix64(2 * len(LENGTH_KEYS) + 1))
+    while len(ZOBRIST_KEYS) < 10 * length:
+        ZOBRIST_KEYS.append(_splitmix64(2 * len(ZOBRIST_KEYS)))
+
+
+def _cells_hash(digit_list: list[int], start: int = 0) -> int:
+    """
+    第start个格子及之后所有非空格子的键的异或
+
+    Args:
+        digit_list: 表示局面的整数列表，使用0表示空格
+        start: 起始全局索引
+
+    Returns:
+        cells_hash: 64位整数
+    """
+    _grow_keys(len(digit_list))
+    cells_hash = 0
+    for global_index in range(start, len(digit_list)):
+        if digit_list[global_index]:
+            cells_hash ^= ZOBRIST_KEYS[10 * global_index + digit_list[global_index]]
+    return cells_hash
+
+
 class Board:
     """棋盘类"""
 
+    __slots__ = ('digit_list', '_journal', '_next_list', '_prev_list', '_row_count_list', '_empty_row_count',
+                 '_hash')
+
     def __init__(self):
         """初始化棋盘"""
-        self.digit_list = []
+        self.set_digits([])
 
     def __str__(self):
         """可视化棋盘"""
@@ -18,6 +80,112 @@ class Board:
             digit_list: 表示局面的整数列表，使用0表示空格
         """
         self.digit_list = digit_list
+        self._journal = []
+        self._hash = _cells_hash(digit_list) ^ LENGTH_KEYS[len(digit_list)]
+        self._build_index()
+
+    @property
+    def zobrist_hash(self) -> int:
+        """
+        局面的64位Zobrist哈希值
+
+        由每个非空格子（位置与数字）的键以及局面长度的键异或得到，相同局面的哈希值在不同进程中也相同。
+        消除时O(1)更新，清理空行时只重新计算被移动的格子，填充时只加入新增的格子。
+
+        Returns:
+            zobrist_hash: 64位整数
+        """
+        return self._hash
+
+    def _build_index(self) -> None:
+        """
+        建立最近非空邻居索引
+
+        对每个非空格子，记录其在每条视线轴上前后最近的非空格子（-1表示不存在），
+        各视线轴上的非空格子因此构成双向链表；同时记录每行的非空格子数量。
+        """
+        length = len(self.digit_list)
+        self._next_list = [self._new_index(length) for _ in range(4)]
+        self._prev_list = [self._new_index(length) for _ in range(4)]
+        self._row_count_list = self._new_counts((length + 8) // 9)
+
+        tail_dict = {}
+        for global_index, digit in enumerate(self.digit_list):
+            if not digit:
+                continue
+            row_index, col_index = divmod(global_index, 9)
+            self._row_count_list[row_index] += 1
+            for axis, line in enumerate((0, col_index, col_index - row_index, col_index + row_index)):
+                tail = tail_dict.get((axis, line), -1)
+                if tail >= 0:
+                    self._next_list[axis][tail] = global_index
+                self._prev_list[axis][global_index] = tail
+                tail_dict[(axis, line)] = global_index
+
+        self._empty_row_count = self._row_count_list.count(0)
+
+    def _new_index(self, length: int) -> list[int]:
+        """
+        创建一条视线轴的指针数组
+
+        Args:
+            length: 数组长度
+
+        Returns:
+            index_list: 全部为-1的指针数组
+        """
+        return [-1] * length
+
+    def _new_counts(self, length: int) -> list[int]:
+        """
+        创建每行非空格子数量的计数数组
+
+        Args:
+            length: 数组长度
+
+        Returns:
+            count_list: 全部为0的计数数组
+        """
+        return [0] * length
+
+    def _unlink(self, global_index: int) -> None:
+        """
+        将被消除的格子从最近非空邻居索引中摘除
+
+        被摘除格子自身的指针保持不变，可沿其继续找到前后最近的非空格子。
+
+        Args:
+            global_index: 全局索引（0-based）
+        """
+        for axis in range(4):
+            prev_index = self._prev_list[axis][global_index]
+            next_index = self._next_list[axis][global_index]
+            if prev_index >= 0:
+                self._next_list[axis][prev_index] = next_index
+            if next_index >= 0:
+                self._prev_list[axis][next_index] = prev_index
+
+        row_index = global_index // 9
+        self._row_count_list[row_index] -= 1
+        if not self._row_count_list[row_index]:
+            self._empty_row_count += 1
+
+    def _relink(self, global_index: int) -> None:
+        """
+        将格子重新接回最近非空邻居索引，需按与_unlink()相反的顺序调用
+
+        Args:
+            global_index: 全局索引（0-based）
+        """
+        for axis in range(4):
+            prev_index = self._prev_list[axis][global_index]
+            next_index = self._next_list[axis][global_index]
+            if prev_index >= 0:
+                self._next_list[axis][prev_index] = global_index
+            if next_index >= 0:
+                self._prev_list[axis][next_index] = global_index
+
+        self._row_count_list[global_index // 9] += 1
 
     def _can_match(self, global_index1: int, global_index2: int) -> bool:
         """
@@ -57,56 +225,138 @@ class Board:
         if digit1 == 0 or digit2 == 0:
             return False
 
+        if global_index1 > global_index2:
+            global_index1, global_index2 = global_index2, global_index1
+
         row_index1, col_index1 = divmod(global_index1, 9)
         row_index2, col_index2 = divmod(global_index2, 9)
 
         # 相同行
         if row_index1 == row_index2:
-            for col_index in range(min(col_index1, col_index2) + 1, max(col_index1, col_index2)):
-                if self.digit_list[9 * row_index1 + col_index]:
-                    return False
-            return True
+            axis = LINEAR_AXIS
 
         # 相同列
         elif col_index1 == col_index2:
-            for row_index in range(min(row_index1, row_index2) + 1, max(row_index1, row_index2)):
-                if self.digit_list[9 * row_index + col_index1]:
-                    return False
-            return True
+            axis = COLUMN_AXIS
 
         # 对角线
-        elif (row_index1 + col_index1 == row_index2 + col_index2 or
-              row_index1 - row_index2 == col_index1 - col_index2):
-            row_step = 1 if row_index2 > row_index1 else -1
-            col_step = 1 if col_index2 > col_index1 else -1
-            for row_index, col_index in zip(range(row_index1 + row_step, row_index2, row_step),
-                                            range(col_index1 + col_step, col_index2, col_step)):
-                if self.digit_list[9 * row_index + col_index]:
-                    return False
-            return True
+        elif row_index1 + col_index1 == row_index2 + col_index2:
+            axis = ANTI_DIAGONAL_AXIS
+        elif row_index1 - row_index2 == col_index1 - col_index2:
+            axis = DIAGONAL_AXIS
 
         # 跨行首尾
-        elif abs(row_index1 - row_index2) == 1:
-            for global_index in range(min(global_index1, global_index2) + 1, max(global_index1, global_index2)):
-                if self.digit_list[global_index]:
-                    return False
-            return True
+        elif row_index2 - row_index1 == 1:
+            axis = LINEAR_AXIS
 
         # 不相关
         else:
             return False
 
+        return self._is_clear(global_index1, global_index2, axis)
+
+    def _is_clear(self, global_index1: int, global_index2: int, axis: int) -> bool:
+        """
+        视线轴上两个非空格子之间是否没有其他非空格子
+
+        Args:
+            global_index1: 较小的全局索引（0-based）
+            global_index2: 较大的全局索引（0-based）
+            axis: 视线轴编号
+
+        Returns:
+            is_clear: 如果后者是前者在该视线轴上最近的非空格子则返回True，否则返回False
+        """
+        return self._next_list[axis][global_index1] == global_index2
+
+    def _neighbours(self, global_index: int, axis: int) -> tuple[int, int]:
+        """
+        视线轴上前后最近的非空格子
+
+        可用于非空格子或刚被摘除的格子：被摘除格子的指针可能指向同样被摘除的格子，沿指针跳过即可。
+
+        Args:
+            global_index: 全局索引（0-based）
+            axis: 视线轴编号
+
+        Returns:
+            neighbours: 前后最近非空格子的全局索引，不存在则为-1
+        """
+        prev_index = self._prev_list[axis][global_index]
+        while prev_index >= 0 and not self.digit_list[prev_index]:
+            prev_index = self._prev_list[axis][prev_index]
+        next_index = self._next_list[axis][global_index]
+        while next_index >= 0 and not self.digit_list[next_index]:
+            next_index = self._next_list[axis][next_index]
+        return prev_index, next_index
+
+    def _find_pairs(self) -> list[tuple[int, int]]:
+        """
+        列出所有可消除数字对
+
+        每个非空格子只需检查其在各视线轴上后方最近的非空格子。
+
+        Returns:
+            pair_list: 按全局索引排序的可消除数字对列表
+        """
+        pair_set = set()
+        for global_index, digit in enumerate(self.digit_list):
+            if not digit:
+                continue
+            for axis in range(4):
+                next_index = self._next_list[axis][global_index]
+                if next_index >= 0 and self._is_pair(global_index, next_index):
+                    pair_set.add((global_index, next_index))
+        return sorted(pair_set)
+
     def _clear(self) -> None:
         """清理空行"""
-        digit_grid = [self.digit_list[i: i + 9] for i in range(0, len(self.digit_list), 9)]
-        self.digit_list = [digit for row in digit_grid if any(row) for digit in row]
+        digit_list = self.digit_list[:0]
+        first_index = len(self.digit_list)
+        for i in range(0, len(self.digit_list), 9):
+            row = self.digit_list[i: i + 9]
+            if any(row):
+                digit_list += row
+            else:
+                first_index = min(first_index, i)
+        # 第一个空行之前的格子位置不变，只需重新计算之后的格子
+        self._hash ^= _cells_hash(self.digit_list, first_index) ^ _cells_hash(digit_list, first_index) ^ \
+            LENGTH_KEYS[len(self.digit_list)] ^ LENGTH_KEYS[len(digit_list)]
+        self.digit_list = digit_list
+        self._build_index()
 
     def fill(self) -> None:
-        """拷贝填充"""
-        remaining_digits = [digit for digit in self.digit_list if digit]
-        self.digit_list += remaining_digits
+        """拷贝填充，不记入日志并清空日志；需要撤销时使用apply(*FILL_MOVE)"""
+        self._fill()
+        self._journal = []
+
+    def _fill(self) -> None:
+        """
+        拷贝填充
+
+        在新的列表上追加剩余数字并重建邻居索引，不原地修改原有对象，因此日志条目中保存的引用仍然有效。
+        """
+        length = len(self.digit_list)
+        digit_list = self.digit_list[:]
+        digit_list.extend([digit for digit in self.digit_list if digit])
+        self._hash ^= _cells_hash(digit_list, length) ^ LENGTH_KEYS[length] ^ LENGTH_KEYS[len(digit_list)]
+        self.digit_list = digit_list
+        self._build_index()
 
     def match(self, global_index1: int, global_index2: int) -> None:
+        """
+        配对消除，不记入日志并清空日志；需要撤销时使用apply()
+
+        日志条目保存的是消除之前的局面对象，不记入日志的消除之后它们不再对应当前局面，因此与fill()一样清空日志。
+
+        Args:
+            global_index1: 全局索引（0-based）
+            global_index2: 全局索引（0-based）
+        """
+        self._match(global_index1, global_index2)
+        self._journal = []
+
+    def _match(self, global_index1: int, global_index2: int) -> None:
         """
         配对消除
 
@@ -115,6 +365,78 @@ class Board:
             global_index2: 全局索引（0-based）
         """
         if self._is_pair(global_index1, global_index2):
+            self._hash ^= ZOBRIST_KEYS[10 * global_index1 + self.digit_list[global_index1]] ^ \
+                ZOBRIST_KEYS[10 * global_index2 + self.digit_list[global_index2]]
             self.digit_list[global_index1] = 0
             self.digit_list[global_index2] = 0
-            self._clear()
+            self._unlink(global_index1)
+            self._unlink(global_index2)
+            if self._empty_row_count:
+                self._clear()
+
+    def _journal_entry(self, global_index1: int, global_index2: int) -> tuple:
+        """
+        记录消除或填充前的局面
+
+        match()只会原地修改数字和邻居索引，而_clear()和_fill()会整体替换它们，
+        因此保存这些对象的引用即可在撤销时找回被清理的空行或去掉填充的格子，无需拷贝。
+
+        Args:
+            global_index1: 全局索引（0-based），填充时为FILL_MOVE[0]
+            global_index2: 全局索引（0-based），填充时为FILL_MOVE[1]
+
+        Returns:
+            entry: 日志条目
+        """
+        if global_index1 < 0:
+            return (global_index1, global_index2, 0, 0,
+                    self.digit_list, self._next_list, self._prev_list, self._row_count_list, self._empty_row_count,
+                    self._hash)
+        return (global_index1, global_index2,
+                self.digit_list[global_index1], self.digit_list[global_index2],
+                self.digit_list, self._next_list, self._prev_list, self._row_count_list, self._empty_row_count,
+                self._hash)
+
+    def _rollback(self, entry: tuple) -> None:
+        """
+        根据日志条目撤销一次消除或填充
+
+        Args:
+            entry: _journal_entry()返回的日志条目
+        """
+        (global_index1, global_index2, digit1, digit2,
+         self.digit_list, self._next_list, self._prev_list, self._row_count_list, empty_row_count,
+         self._hash) = entry
+        if global_index1 >= 0:
+            self.digit_list[global_index1] = digit1
+            self.digit_list[global_index2] = digit2
+            self._relink(global_index2)
+            self._relink(global_index1)
+        self._empty_row_count = empty_row_count
+
+    def apply(self, global_index1: int, global_index2: int) -> bool:
+        """
+        配对消除并记入日志，之后可通过undo()撤销；传入FILL_MOVE时改为拷贝填充
+
+        Args:
+            global_index1: 全局索引（0-based）
+            global_index2: 全局索引（0-based）
+
+        Returns:
+            applied: 如果完成消除或填充则返回True，否则返回False（不记入日志）；没有剩余数字时不填充
+        """
+        if (global_index1, global_index2) == FILL_MOVE:
+            if not any(self.digit_list):
+                return False
+            self._journal.append(self._journal_entry(global_index1, global_index2))
+            self._fill()
+            return True
+        if not self._is_pair(global_index1, global_index2):
+            return False
+        self._journal.append(self._journal_entry(global_index1, global_index2))
+        self._match(global_index1, global_index2)
+        return True
+
+    def undo(self) -> None:
+        """撤销最近一次apply()"""
+        self._rollback(self._journal.pop())
@@ -0,0 +1,154 @@
+import sqlite3
+from array import array
+from collections import OrderedDict
+from typing import List, Tuple
+
+
+class SolutionCache:
+    """求解结果缓存类，内存中的LRU缓存位于本地sqlite数据库之前"""
+
+    def __init__(self, path: str | None = None, capacity: int = 4096):
+        """
+        初始化缓存
+
+        Args:
+            path: sqlite数据库文件路径，为None时只使用内存缓存
+            capacity: 内存缓存的最大条目数
+        """
+        self.capacity = capacity
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        self._memory = OrderedDict()
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS solution ('
+                'mode TEXT NOT NULL, hash INTEGER NOT NULL, digits BLOB NOT NULL, '
+                'solvable INTEGER NOT NULL, path BLOB NOT NULL, PRIMARY KEY (mode, hash))')
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        """
+        内存缓存中的条目数
+
+        Returns:
+            length: 条目数
+        """
+        return len(self._memory)
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def get(self, mode: str, zobrist_hash: int, digit_bytes: bytes) -> tuple[bool, List[Tuple[int, int]]] | None:
+        """
+        查询求解结果
+
+        以哈希值定位条目，再比较完整局面，哈希碰撞时视为未命中。
+
+        Args:
+            mode: 求解模式
+            zobrist_hash: 局面的Zobrist哈希值
+            digit_bytes: 局面的字节串
+
+        Returns:
+            entry: (是否能够清空棋盘, 消除路径)，未命中时为None
+        """
+        key = (mode, zobrist_hash)
+        entry = self._memory.get(key)
+        if entry is not None and entry[0] == digit_bytes:
+            self._memory.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return entry[1], list(entry[2])
+
+        if self._connection is not None:
+            row = self._connection.execute(
+                'SELECT solvable, path FROM solution WHERE mode = ? AND hash = ? AND digits = ?',
+                (mode, self._to_signed(zobrist_hash), digit_bytes)).fetchone()
+            if row is not None:
+                path = self._decode_path(row[1])
+                self._remember(key, (digit_bytes, bool(row[0]), path))
+                self.stats['disk_hits'] += 1
+                return bool(row[0]), list(path)
+
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, mode: str, zobrist_hash: int, digit_bytes: bytes, solvability: bool,
+            path: List[Tuple[int, int]]) -> None:
+        """
+        写入求解结果
+
+        Args:
+            mode: 求解模式
+            zobrist_hash: 局面的Zobrist哈希值
+            digit_bytes: 局面的字节串
+            solvability: 是否能够清空棋盘
+            path: 消除路径
+        """
+        path = tuple(path)
+        self._remember((mode, zobrist_hash), (digit_bytes, solvability, path))
+        if self._connection is not None:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO solution VALUES (?, ?, ?, ?, ?)',
+                (mode, self._to_signed(zobrist_hash), digit_bytes, int(solvability), self._encode_path(path)))
+            self._connection.commit()
+
+    def _remember(self, key: tuple, entry: tuple) -> None:
+        """
+        写入内存缓存，超出容量时淘汰最久未使用的条目（数据库中的条目保留）
+
+        Args:
+            key: (求解模式, 哈希值)
+            entry: (局面的字节串, 是否能够清空棋盘, 消除路径)
+        """
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    @staticmethod
+    def _to_signed(zobrist_hash: int) -> int:
+        """
+        将64位无符号哈希值转换为sqlite可以存储的有符号整数
+
+        Args:
+            zobrist_hash: 64位无符号整数
+
+        Returns:
+            signed_hash: 64位有符号整数
+        """
+        return zobrist_hash - (1 << 64) if zobrist_hash >= 1 << 63 else zobrist_hash
+
+    @staticmethod
+    def _encode_path(path: tuple) -> bytes:
+        """
+        将消除路径编码为32位有符号整数数组的字节串，填充步骤FILL_MOVE编码为(-1, -1)
+
+        Args:
+            path: 消除路径
+
+        Returns:
+            path_bytes: 字节串
+        """
+        return array('i', [global_index for digit_pair in path for global_index in digit_pair]).tobytes()
+
+    @staticmethod
+    def _decode_path(path_bytes: bytes) -> tuple:
+        """
+        解码消除路径
+
+        Args:
+            path_bytes: _encode_path()返回的字节串
+
+        Returns:
+            path: 消除路径
+        """
+        index_list = array('i')
+        index_list.frombytes(path_bytes)
+        return tuple(zip(index_list[::2], index_list[1::2]))
@@ -0,0 +1,115 @@
+from array import array
+from srcs.board import Board
+from srcs.twin_board import TwinBoard
+
+
+class CompactBoard(Board):
+    """
+    紧凑存储的棋盘类
+
+    最近非空邻居索引每格需要8个指针，远大于数字本身，因此只在第一次判断配对、列出数字对或记入日志时建立；
+    只被持有、或只用于构造TwinBoard的棋盘不建立索引。
+    """
+
+    __slots__ = ()
+
+    def set_digits(self, digit_list: list[int]) -> None:
+        """
+        设置局面，数字以每格一个字节的bytearray存储
+
+        Args:
+            digit_list: 表示局面的整数列表，使用0表示空格
+        """
+        super().set_digits(bytearray(digit_list))
+
+    def _build_index(self) -> None:
+        """推迟建立最近非空邻居索引，直到第一次需要时由_ensure_index()建立"""
+        self._next_list = self._prev_list = self._row_count_list = None
+        self._empty_row_count = 0
+
+    def _ensure_index(self) -> None:
+        """尚未建立最近非空邻居索引时建立"""
+        if self._next_list is None:
+            super()._build_index()
+
+    def _is_pair(self, global_index1: int, global_index2: int) -> bool:
+        """
+        是否为可消除数字对
+
+        Args:
+            global_index1: 全局索引（0-based）
+            global_index2: 全局索引（0-based）
+
+        Returns:
+            is_pair: 如果是可消除数字对则返回True，否则返回False
+        """
+        self._ensure_index()
+        return super()._is_pair(global_index1, global_index2)
+
+    def _neighbours(self, global_index: int, axis: int) -> tuple[int, int]:
+        """
+        视线轴上前后最近的非空格子
+
+        Args:
+            global_index: 全局索引（0-based）
+            axis: 视线轴编号
+
+        Returns:
+            neighbours: 前后最近非空格子的全局索引，不存在则为-1
+        """
+        self._ensure_index()
+        return super()._neighbours(global_index, axis)
+
+    def _find_pairs(self) -> list[tuple[int, int]]:
+        """
+        列出所有可消除数字对
+
+        Returns:
+            pair_list: 按全局索引排序的可消除数字对列表
+        """
+        self._ensure_index()
+        return super()._find_pairs()
+
+    def _journal_entry(self, global_index1: int, global_index2: int) -> tuple:
+        """
+        记录消除或填充前的局面，日志条目中的索引总是已经建立，撤销时可以直接重新接回格子
+
+        Args:
+            global_index1: 全局索引（0-based），填充时为FILL_MOVE[0]
+            global_index2: 全局索引（0-based），填充时为FILL_MOVE[1]
+
+        Returns:
+            entry: 日志条目
+        """
+        self._ensure_index()
+        return super()._journal_entry(global_index1, global_index2)
+
+    def _new_index(self, length: int) -> array:
+        """
+        创建一条视线轴的指针数组，以32位整数数组存储
+
+        Args:
+            length: 数组长度
+
+        Returns:
+            index_list: 全部为-1的指针数组
+        """
+        return array('i', [-1]) * length
+
+    def _new_counts(self, length: int) -> bytearray:
+        """
+        创建每行非空格子数量的计数数组，每行最多9个格子，以字节存储
+
+        Args:
+            length: 数组长度
+
+        Returns:
+            count_list: 全部为0的计数数组
+        """
+        return bytearray(length)
+
+
+class CompactTwinBoard(TwinBoard, CompactBoard):
+    """紧凑存储的孪生棋盘类"""
+
+    __slots__ = ()
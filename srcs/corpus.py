@@ -0,0 +1,207 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator
+from srcs.board import Board
+from srcs.twin_board import TwinBoard
+
+# 文件头：魔数、版本号、保留字节、棋盘数、索引的偏移
+MAGIC = b'NMBC'
+VERSION = 1
+HEADER = struct.Struct('<4sB3xQQ')
+
+# 每个棋盘的头部：宽度、行数
+RECORD_HEADER = struct.Struct('<BH')
+WIDTH = 9
+
+# 局面末尾不存在的格子（最后一行不满时）以该值填充
+PADDING = 0xF
+
+# 字节到高4位、低4位的查找表，以及数字到互补数的查找表，均用于bytes.translate()
+_HIGH_TABLE = bytes(byte >> 4 for byte in range(256))
+_LOW_TABLE = bytes(byte & 0xF for byte in range(256))
+_CLASS_TABLE = bytes(min(digit, 10 - digit) if 0 < digit < 10 else 0 for digit in range(256))
+
+
+def encode(digit_list: list[int]) -> bytes:
+    """
+    将局面编码为紧凑的二进制记录
+
+    记录为宽度（1字节）、行数（2字节），以及每格4位的数字，每字节先高4位后低4位；
+    最后一行不满时，不存在的格子以PADDING填充，因此解码时可以恢复局面的长度。
+
+    Args:
+        digit_list: 表示局面的整数列表，使用0表示空格
+
+    Returns:
+        record: 二进制记录
+    """
+    rows = (len(digit_list) + WIDTH - 1) // WIDTH
+    cells = bytearray(digit_list)
+    cells.extend([PADDING] * (rows * WIDTH - len(digit_list) + (rows * WIDTH) % 2))
+    packed = bytes(high << 4 | low for high, low in zip(cells[0::2], cells[1::2]))
+    return RECORD_HEADER.pack(WIDTH, rows) + packed
+
+
+def decode(record: bytes | memoryview) -> bytearray:
+    """
+    解码二进制记录
+
+    拆分高低4位与交错合并都由bytes.translate()和切片赋值完成，不逐格执行Python代码。
+
+    Args:
+        record: encode()生成的记录，可以是内存映射上的memoryview
+
+    Returns:
+        digit_list: 每格一个字节的局面
+    """
+    width, rows = RECORD_HEADER.unpack_from(record)
+    if width != WIDTH:
+        raise ValueError(f'unsupported board width {width}')
+    packed = bytes(record[RECORD_HEADER.size: RECORD_HEADER.size + (rows * WIDTH + 1) // 2])
+    cells = bytearray(2 * len(packed))
+    cells[0::2] = packed.translate(_HIGH_TABLE)
+    cells[1::2] = packed.translate(_LOW_TABLE)
+    length = cells.find(PADDING, (rows - 1) * WIDTH) if rows else 0
+    if length >= 0:
+        del cells[length:]
+    return cells
+
+
+def save_boards(path: str, digit_lists: Iterable[list[int]]) -> int:
+    """
+    将大量局面写入一个语料文件
+
+    逐个编码并写出，结束时在末尾写入各记录偏移的索引（小端64位整数），再回填文件头；内存中只保留每个棋盘8字节的偏移。
+
+    Args:
+        path: 输出文件路径
+        digit_lists: 各棋盘的局面，可以是生成器
+
+    Returns:
+        count: 棋盘数
+    """
+    offset_array = array('Q')
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        offset = HEADER.size
+        for digit_list in digit_lists:
+            record = encode(digit_list)
+            offset_array.append(offset)
+            file.write(record)
+            offset += len(record)
+        if sys.byteorder != 'little':
+            offset_array.byteswap()
+        file.write(offset_array.tobytes())
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, len(offset_array), offset))
+    return len(offset_array)
+
+
+class Corpus:
+    """棋盘语料类，以内存映射读取save_boards()生成的文件，按偏移索引随机访问任意棋盘"""
+
+    def __init__(self, path: str):
+        """
+        打开语料文件
+
+        Args:
+            path: 语料文件路径
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a corpus file')
+        magic, version, self._count, index_offset = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a corpus file')
+        self._index_offset = index_offset
+        self._view = memoryview(self._mmap)
+
+    def __enter__(self) -> 'Corpus':
+        """
+        进入上下文
+
+        Returns:
+            corpus: 语料自身
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """退出上下文时关闭内存映射"""
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        棋盘数
+
+        Returns:
+            length: 棋盘数
+        """
+        return self._count
+
+    def __getitem__(self, index: int) -> bytearray:
+        """
+        解码第index个棋盘的局面，只读取其偏移与记录所在的页面
+
+        Args:
+            index: 棋盘序号，支持负数
+
+        Returns:
+            digit_list: 每格一个字节的局面
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('corpus index out of range')
+        offset, = struct.unpack_from('<Q', self._mmap, self._index_offset + 8 * index)
+        return decode(self._view[offset:])
+
+    def __iter__(self) -> Iterator[bytearray]:
+        """
+        按顺序解码所有棋盘
+
+        Returns:
+            digit_lists: 各棋盘局面的迭代器
+        """
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self) -> None:
+        """释放视图并关闭内存映射"""
+        self._view.release()
+        self._mmap.close()
+
+    def board(self, index: int, board_class: type = Board) -> Board:
+        """
+        将第index个棋盘解码为棋盘实例
+
+        Args:
+            index: 棋盘序号
+            board_class: 棋盘类，Board或其子类（例如CompactBoard）
+
+        Returns:
+            board: 棋盘实例
+        """
+        board = board_class()
+        board.set_digits(list(self[index]))
+        return board
+
+    def twin_board(self, index: int, twin_class: type = TwinBoard) -> TwinBoard:
+        """
+        将第index个棋盘直接解码为孪生棋盘，不经过Board实例，只建立一次邻居索引
+
+        Args:
+            index: 棋盘序号
+            twin_class: 孪生棋盘类，TwinBoard或其子类（例如CompactTwinBoard）
+
+        Returns:
+            twin_board: 孪生棋盘实例
+        """
+        twin_board = twin_class.__new__(twin_class)
+        twin_board.set_digits(list(self[index].translate(_CLASS_TABLE)))
+        return twin_board
@@ -0,0 +1,288 @@
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Iterator, TextIO, Tuple
+from srcs.board import Board, FILL_MOVE
+from srcs.corpus import save_boards
+
+# 列方向与两条对角线方向的(行增量, 列增量)，线性方向单独处理
+_STEPS = ((1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1))
+
+# 在已有空格中放置一对数字的尝试次数，全部失败时改为插入新行
+_ATTEMPTS = 8
+
+FORMATS = ('text', 'jsonl', 'binary')
+
+
+def _sight_lines(digit_list: list[int], global_index: int) -> list[tuple[list[int], int]]:
+    """
+    从一个格子出发，沿各视线方向依次经过的空格以及挡住视线的非空格子
+
+    与Board._is_pair()一致：同一行或相邻两行之间的线性方向、相同列、两条对角线，中间没有非空格子即可配对。
+
+    Args:
+        digit_list: 表示局面的整数列表，使用0表示空格
+        global_index: 出发格子的全局索引（0-based）
+
+    Returns:
+        lines: 各方向的(由近及远的空格列表, 挡住视线的非空格子的全局索引，没有时为-1)，不含没有空格的方向
+    """
+    length = len(digit_list)
+    row_index, col_index = divmod(global_index, 9)
+    lines = []
+    for step in (1, -1):
+        cell_list = []
+        next_index = global_index + step
+        while 0 <= next_index < length and abs(next_index // 9 - row_index) <= 1 and not digit_list[next_index]:
+            cell_list.append(next_index)
+            next_index += step
+        blocker = next_index if 0 <= next_index < length and abs(next_index // 9 - row_index) <= 1 else -1
+        if cell_list:
+            lines.append((cell_list, blocker))
+    for row_step, col_step in _STEPS:
+        cell_list = []
+        next_row, next_col = row_index + row_step, col_index + col_step
+        blocker = -1
+        while next_row >= 0 and 0 <= next_col < 9 and 9 * next_row + next_col < length:
+            next_index = 9 * next_row + next_col
+            if digit_list[next_index]:
+                blocker = next_index
+                break
+            cell_list.append(next_index)
+            next_row, next_col = next_row + row_step, next_col + col_step
+        if cell_list:
+            lines.append((cell_list, blocker))
+    return lines
+
+
+def _insert_pair(rng: random.Random, digit_list: list[int], new_row: bool,
+                 difficulty: float) -> tuple[list[int], Tuple[int, int]] | None:
+    """
+    倒推一步：在局面中放入一对可消除的数字，消除这对数字之后恰好回到原局面
+
+    在已有空格中放置时，所在行原本都有非空格子，消除后不会被清理；插入新行时至少一个格子在新行中，
+    消除后新行变为空行被清理。新行只能插在已有行之间，或局面长度为9的倍数时插在末尾。
+    以difficulty为概率把第二个格子放在视线的最远处（正向消除时需要先消除中间放入的格子才能看到），
+    并避开第一个格子视线上已有的互补数，使这对数字在被看到之前没有其他配对对象；否则放在最近处，
+    并使用视线上已有的互补数，棋盘上可以消除的数字对更多。难度越高，贪心求解的成功率越低。
+
+    Args:
+        rng: 随机数发生器
+        digit_list: 倒推前的局面，不修改
+        new_row: 是否插入新行
+        difficulty: 难度，0到1
+
+    Returns:
+        result: (倒推后的局面, 放入的数字对)，在已有空格中找不到可配对的位置时为None
+    """
+    if new_row:
+        row_count = (len(digit_list) + 8) // 9
+        row_index = rng.randrange(row_count + 1 if len(digit_list) % 9 == 0 else row_count)
+        digit_list = digit_list[:9 * row_index] + [0] * 9 + digit_list[9 * row_index:]
+        candidate_list = list(range(9 * row_index, 9 * row_index + 9))
+    else:
+        candidate_list = [global_index for global_index, digit in enumerate(digit_list) if not digit]
+        if not candidate_list:
+            return None
+
+    for _ in range(_ATTEMPTS):
+        global_index1 = rng.choice(candidate_list)
+        lines = _sight_lines(digit_list, global_index1)
+        if not lines:
+            continue
+        cell_list, _ = rng.choice(lines)
+        class_set = {min(digit_list[blocker], 10 - digit_list[blocker]) for _, blocker in lines if blocker >= 0}
+        if rng.random() < difficulty:
+            global_index2 = cell_list[-1]
+            class_list = [digit_class for digit_class in range(1, 6) if digit_class not in class_set] or [1, 2, 3, 4, 5]
+        else:
+            global_index2 = cell_list[0]
+            class_list = sorted(class_set) or [1, 2, 3, 4, 5]
+        digit_class = rng.choice(class_list)
+        digit1, digit2 = (digit_class if digit_class == 5 or rng.random() < 0.5 else 10 - digit_class
+                          for _ in range(2))
+        digit_list = list(digit_list)
+        digit_list[global_index1], digit_list[global_index2] = digit1, digit2
+        return digit_list, (min(global_index1, global_index2), max(global_index1, global_index2))
+    return None
+
+
+def _fill_core(rng: random.Random, cells: int, density: float,
+               fills: int) -> tuple[list[int], list[Tuple[int, int]]]:
+    """
+    生成需要拷贝填充才能按给定方案清空的局面
+
+    非空格子的互补数序列s为回文时，拷贝填充后的非空格子序列为s + s，正中间的两个格子互补数相同，
+    且二者之间（线性顺序上）只有空格；消除后中间各行变为空行被清理，二者所在行至多相差1，因此总能消除。
+    依次消除正中间的一对，剩下的序列仍为回文，既可以继续消除直到清空，也可以停在中途再次填充。
+
+    Args:
+        rng: 随机数发生器
+        cells: 非空格子数
+        density: 非空格子的比例，决定格子之间的空格数
+        fills: 填充次数，至少为1
+
+    Returns:
+        result: (局面, 从该局面出发清空棋盘的路径，填充步骤为FILL_MOVE)
+    """
+    half = [rng.randint(1, 5) for _ in range((cells + 1) // 2)]
+    class_list = half + half[:cells // 2][::-1]
+    digit_list = []
+    for digit_class in class_list:
+        # 连续的空格不超过8个，因此不会出现空行
+        gap = 0
+        while gap < 8 and rng.random() > density:
+            gap += 1
+        digit_list.extend([0] * gap)
+        digit_list.append(digit_class if digit_class == 5 or rng.random() < 0.5 else 10 - digit_class)
+
+    board = Board()
+    board.set_digits(list(digit_list))
+    path = []
+    for fill_index in range(fills):
+        count = sum(1 for digit in board.digit_list if digit)
+        board.apply(*FILL_MOVE)
+        path.append(FILL_MOVE)
+        for _ in range(count if fill_index == fills - 1 else rng.randint(1, count - 1)):
+            index_list = [global_index for global_index, digit in enumerate(board.digit_list) if digit]
+            middle = len(index_list) // 2
+            digit_pair = (index_list[middle - 1], index_list[middle])
+            board.apply(*digit_pair)
+            path.append(digit_pair)
+    return digit_list, path
+
+
+def generate(rng: random.Random, rows: int = 5, density: float = 1.0, fills: int = 0,
+             difficulty: float = 0.5) -> tuple[list[int], list[Tuple[int, int]]]:
+    """
+    倒推生成一个能够清空的棋盘
+
+    从空棋盘（fills大于0时从需要填充的回文局面）出发，每一步放入一对可消除的数字，消除这对数字恰好回到上一步的局面，
+    因此按相反的顺序消除即可清空棋盘。新行的插入分散在各步之间，使最终的行数接近rows。
+
+    Args:
+        rng: 随机数发生器
+        rows: 行数，非空格子很少时可能达不到（每一步至多插入一行），已有空格中放不下时可能超出
+        density: 非空格子的比例
+        fills: 清空棋盘的方案中拷贝填充的次数
+        difficulty: 难度，0到1
+
+    Returns:
+        result: (局面, 清空棋盘的路径，填充步骤为FILL_MOVE)
+    """
+    target = max(2, int(9 * rows * density) // 2 * 2)
+    if fills:
+        digit_list, core_path = _fill_core(rng, max(2, target // 2), density, fills)
+    else:
+        digit_list, core_path = [], []
+    cells = sum(1 for digit in digit_list if digit)
+
+    move_list = []
+    while cells < target:
+        row_count = (len(digit_list) + 8) // 9
+        new_row = rng.random() * (target - cells) / 2 < rows - row_count
+        result = _insert_pair(rng, digit_list, new_row, difficulty)
+        if result is None:
+            result = _insert_pair(rng, digit_list, True, difficulty)
+        digit_list, digit_pair = result
+        move_list.append(digit_pair)
+        cells += 2
+    return digit_list, move_list[::-1] + core_path
+
+
+def iter_boards(count: int, seed: int = 0, rows: int = 5, density: float = 1.0, fills: int = 0,
+                difficulty: float = 0.5) -> Iterator[tuple[list[int], list[Tuple[int, int]]]]:
+    """
+    逐个生成棋盘
+
+    第i个棋盘只由种子与i决定，与生成的数量和顺序无关。
+
+    Args:
+        count: 棋盘数
+        seed: 随机种子
+        rows: 行数
+        density: 非空格子的比例
+        fills: 清空棋盘的方案中拷贝填充的次数
+        difficulty: 难度，0到1
+
+    Returns:
+        boards: (局面, 清空棋盘的路径)的迭代器
+    """
+    for index in range(count):
+        yield generate(random.Random(f'{seed}:{index}'), rows, density, fills, difficulty)
+
+
+def write_boards(stream: TextIO, count: int, seed: int = 0, rows: int = 5, density: float = 1.0, fills: int = 0,
+                 difficulty: float = 0.5, fmt: str = 'text') -> int:
+    """
+    生成棋盘并逐行写出
+
+    text格式每行一个棋盘（0表示空格），可以直接作为python -m srcs.main的输入；
+    jsonl格式每行为{"board": ..., "path": ...}，路径中的[-1, -1]表示拷贝填充。两种格式的第一行都是以'#'开头的参数说明。
+
+    Args:
+        stream: 输出流
+        count: 棋盘数
+        seed: 随机种子
+        rows: 行数
+        density: 非空格子的比例
+        fills: 清空棋盘的方案中拷贝填充的次数
+        difficulty: 难度，0到1
+        fmt: 输出格式，text或jsonl
+
+    Returns:
+        count: 写出的棋盘数
+    """
+    stream.write(f'# seed={seed} rows={rows} density={density} fills={fills} difficulty={difficulty}\n')
+    for digit_list, path in iter_boards(count, seed, rows, density, fills, difficulty):
+        line = ''.join(map(str, digit_list))
+        if fmt == 'jsonl':
+            line = json.dumps({'board': line, 'path': [list(digit_pair) for digit_pair in path]})
+        stream.write(line + '\n')
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    命令行入口，生成能够清空的棋盘
+
+    Args:
+        argv: 命令行参数，默认使用sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(description='倒推生成能够清空的NumberMatch棋盘')
+    parser.add_argument('-n', '--count', type=int, default=1000, help='棋盘数，默认为1000')
+    parser.add_argument('-o', '--output', default='-', help="输出文件，'-'或省略时写到标准输出")
+    parser.add_argument('--seed', type=int, default=0, help='随机种子，默认为0')
+    parser.add_argument('--rows', type=int, default=5, help='行数，默认为5')
+    parser.add_argument('--density', type=float, default=1.0, help='非空格子的比例，默认为1.0')
+    parser.add_argument('--fills', type=int, default=0, help='清空棋盘的方案中拷贝填充的次数，默认为0')
+    parser.add_argument('--difficulty', type=float, default=0.5, help='难度，0到1，默认为0.5')
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help='输出格式，默认为text；binary为每格4位的语料文件，需要指定-o')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.format == 'binary':
+        if args.output == '-':
+            parser.error('binary format requires -o')
+        count = save_boards(args.output, (digit_list for digit_list, _ in iter_boards(
+            args.count, args.seed, args.rows, args.density, args.fills, args.difficulty)))
+        elapsed = time.perf_counter() - start
+        print(f'{count} boards in {elapsed:.3f}s ({count / max(elapsed, 1e-9):.1f} boards/s)', file=sys.stderr)
+        return
+
+    output_stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        count = write_boards(output_stream, args.count, args.seed, args.rows, args.density, args.fills,
+                             args.difficulty, args.format)
+    finally:
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    elapsed = time.perf_counter() - start
+    print(f'{count} boards in {elapsed:.3f}s ({count / max(elapsed, 1e-9):.1f} boards/s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
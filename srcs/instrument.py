@@ -0,0 +1,279 @@
+import json
+import time
+from functools import wraps
+from typing import Callable
+from srcs.board import Board
+from srcs.solver import Solver
+from srcs.twin_board import TwinBoard
+
+# 类属性中不存在被替换的方法（继承自父类）时的占位值，恢复时删除替换的属性
+_MISSING = object()
+
+# 当前启用的Instrumentation实例，替换的是类属性，同一时刻只能启用一个
+_active = None
+
+
+def _counting_neighbours(board: Board, global_index: int, axis: int) -> tuple[tuple[int, int], int]:
+    """
+    与Board._neighbours()相同地沿指针跳过空格，同时统计经过的格子数
+
+    Args:
+        board: Board实例
+        global_index: 全局索引（0-based）
+        axis: 视线轴编号
+
+    Returns:
+        result: (前后最近非空格子的全局索引, 经过的格子数)
+    """
+    digit_list, prev_list, next_list = board.digit_list, board._prev_list[axis], board._next_list[axis]
+    scanned = 0
+    prev_index = prev_list[global_index]
+    while prev_index >= 0:
+        scanned += 1
+        if digit_list[prev_index]:
+            break
+        prev_index = prev_list[prev_index]
+    next_index = next_list[global_index]
+    while next_index >= 0:
+        scanned += 1
+        if digit_list[next_index]:
+            break
+        next_index = next_list[next_index]
+    return (prev_index, next_index), scanned
+
+
+class Instrumentation:
+    """
+    插桩类，启用时替换Board、TwinBoard和Solver上的关键方法，记录调用次数、耗时、路径遍历的格子数、展开节点数和pair_list的峰值
+
+    未启用时各方法就是原来的函数对象，没有任何额外开销；启用期间只统计本进程中的调用，进程池中的子进程不在统计范围内。
+    """
+
+    def __init__(self):
+        """初始化插桩，所有计数为0，尚未启用"""
+        self._originals = []
+        self.reset()
+
+    def __enter__(self) -> 'Instrumentation':
+        """
+        进入上下文时启用
+
+        Returns:
+            instrumentation: 插桩自身
+        """
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """退出上下文时停用"""
+        self.disable()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        是否已经启用
+
+        Returns:
+            enabled: 如果已经启用则返回True，否则返回False
+        """
+        return bool(self._originals)
+
+    def reset(self) -> None:
+        """清零所有计数"""
+        self.calls = {}
+        self.seconds = {}
+        self.cells_scanned = 0
+        self.nodes = 0
+        self.peak_pair_list = 0
+
+    def enable(self) -> None:
+        """替换各方法，开始统计；已经启用时不做任何事，另一个实例已经启用时抛出RuntimeError"""
+        global _active
+        if _active is self:
+            return
+        if _active is not None:
+            raise RuntimeError('another Instrumentation is enabled')
+        _active = self
+
+        self._patch(Board, '_is_pair', self._counted('is_pair', Board._is_pair))
+        self._patch(Board, '_neighbours', self._neighbours_hook())
+        self._patch(Board, '_clear', self._clear_hook(Board._clear))
+        self._patch(Board, '_find_pairs', self._timed('find_pairs', Board._find_pairs))
+        self._patch(TwinBoard, '_analyze', self._timed('analyze', TwinBoard._analyze))
+        self._patch(TwinBoard, 'pair_list', self._pair_list_hook(TwinBoard.pair_list))
+        self._patch(TwinBoard, 'apply', self._timed('simulate', TwinBoard.apply))
+        self._patch(TwinBoard, 'undo', self._timed('undo', TwinBoard.undo))
+        self._patch(Solver, 'precheck', self._timed('precheck', Solver.precheck))
+        self._patch(Solver, 'solve', self._solve_hook(Solver.solve))
+
+    def disable(self) -> None:
+        """恢复各方法，停止统计，保留已有的计数"""
+        global _active
+        if _active is not self:
+            return
+        for cls, name, original in reversed(self._originals):
+            if original is _MISSING:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._originals = []
+        _active = None
+
+    def snapshot(self) -> dict:
+        """
+        当前的统计结果
+
+        各阶段的耗时包含其中嵌套调用的耗时，例如solve包含precheck与simulate。
+
+        Returns:
+            snapshot: 可以直接序列化为JSON的字典
+        """
+        return {
+            'calls': dict(self.calls),
+            'seconds': {name: round(seconds, 6) for name, seconds in self.seconds.items()},
+            'cells_scanned': self.cells_scanned,
+            'nodes': self.nodes,
+            'peak_pair_list': self.peak_pair_list,
+        }
+
+    def export(self, path: str) -> None:
+        """
+        将当前的统计结果追加到本地指标文件，每次一行JSON
+
+        Args:
+            path: 指标文件路径
+        """
+        record = {'timestamp': round(time.time(), 3), **self.snapshot()}
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(record) + '\n')
+
+    def _patch(self, cls: type, name: str, replacement) -> None:
+        """
+        替换类属性并记录原值
+
+        Args:
+            cls: 类
+            name: 属性名
+            replacement: 替换后的属性
+        """
+        self._originals.append((cls, name, cls.__dict__.get(name, _MISSING)))
+        setattr(cls, name, replacement)
+
+    def _count(self, name: str, seconds: float | None = None) -> None:
+        """
+        记录一次调用
+
+        Args:
+            name: 统计项名称
+            seconds: 本次调用的耗时，None表示不计时
+        """
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if seconds is not None:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def _counted(self, name: str, function: Callable) -> Callable:
+        """
+        只计数不计时的包装，用于调用极其频繁的方法
+
+        Args:
+            name: 统计项名称
+            function: 原方法
+
+        Returns:
+            wrapper: 包装后的方法
+        """
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            self._count(name)
+            return function(*args, **kwargs)
+        return wrapper
+
+    def _timed(self, name: str, function: Callable) -> Callable:
+        """
+        计数并计时的包装
+
+        Args:
+            name: 统计项名称
+            function: 原方法
+
+        Returns:
+            wrapper: 包装后的方法
+        """
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._count(name, time.perf_counter() - start)
+        return wrapper
+
+    def _neighbours_hook(self) -> Callable:
+        """
+        Board._neighbours()的替换，统计沿指针经过的格子数
+
+        Returns:
+            wrapper: 替换后的方法
+        """
+        def wrapper(board: Board, global_index: int, axis: int) -> tuple[int, int]:
+            neighbours, scanned = _counting_neighbours(board, global_index, axis)
+            self._count('neighbours')
+            self.cells_scanned += scanned
+            return neighbours
+        wrapper.__doc__ = Board._neighbours.__doc__
+        return wrapper
+
+    def _clear_hook(self, function: Callable) -> Callable:
+        """
+        Board._clear()的包装，清理空行时扫描整个局面，计入经过的格子数
+
+        Args:
+            function: 原方法
+
+        Returns:
+            wrapper: 包装后的方法
+        """
+        timed = self._timed('clear', function)
+
+        @wraps(function)
+        def wrapper(board: Board) -> None:
+            self.cells_scanned += len(board.digit_list)
+            timed(board)
+        return wrapper
+
+    def _pair_list_hook(self, pair_list: property) -> property:
+        """
+        TwinBoard.pair_list的替换，记录读取到的最大长度
+
+        Args:
+            pair_list: 原属性
+
+        Returns:
+            pair_list: 替换后的属性
+        """
+        def getter(twin_board: TwinBoard) -> list[tuple[int, int]]:
+            result = pair_list.fget(twin_board)
+            if len(result) > self.peak_pair_list:
+                self.peak_pair_list = len(result)
+            return result
+        return property(getter, doc=pair_list.__doc__)
+
+    def _solve_hook(self, function: Callable) -> Callable:
+        """
+        Solver.solve()的包装，计时并累计本次求解展开的节点数
+
+        Args:
+            function: 原方法
+
+        Returns:
+            wrapper: 包装后的方法
+        """
+        timed = self._timed('solve', function)
+
+        @wraps(function)
+        def wrapper(solver: Solver, *args, **kwargs) -> bool:
+            try:
+                return timed(solver, *args, **kwargs)
+            finally:
+                self.nodes += solver.stats.get('nodes', 0)
+        return wrapper
@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, TextIO
+from srcs.board import Board
+from srcs.solver import Solver
+from srcs.tablebase import open_tablebase
+
+MODES = ('greedy', 'exact', 'beam', 'fill')
+
+
+def parse_board(line: str) -> list[int]:
+    """
+    解析一行文本表示的棋盘
+
+    每个字符表示一个格子：数字1-9，'0'或'.'表示空格；空白和逗号作为分隔符忽略。
+
+    Args:
+        line: 一行文本
+
+    Returns:
+        digit_list: 表示局面的整数列表，使用0表示空格
+    """
+    digit_list = []
+    for char in line:
+        if char in '0123456789':
+            digit_list.append(int(char))
+        elif char == '.':
+            digit_list.append(0)
+        elif not char.isspace() and char != ',':
+            raise ValueError(f'invalid character {char!r}')
+    return digit_list
+
+
+def iter_boards(stream: TextIO) -> Iterator[tuple[int, str]]:
+    """
+    逐行读取棋盘，跳过空行和以'#'开头的注释行
+
+    Args:
+        stream: 输入流
+
+    Returns:
+        boards: (行号（1-based）, 该行文本)的迭代器
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line_number, line
+
+
+def solve_board(line_number: int, line: str, mode: str = 'greedy', deadline: float | None = None,
+                width: int = 8, max_fills: int = 1, tablebase_path: str | None = None) -> dict:
+    """
+    求解一行文本表示的棋盘
+
+    在工作进程中执行，输入输出都是可以直接序列化为JSON的简单类型。
+
+    Args:
+        line_number: 行号（1-based）
+        line: 一行文本
+        mode: 求解模式，greedy、exact、beam或fill
+        deadline: 贪心求解及fill模式的时限（秒），默认不限制
+        width: 束搜索的束宽
+        max_fills: fill模式最多填充的次数
+        tablebase_path: exact模式使用的残局库文件路径，每个进程只映射一次，默认不使用
+
+    Returns:
+        result: 求解结果，fill模式的路径中[-1, -1]表示拷贝填充
+    """
+    start = time.perf_counter()
+    try:
+        digit_list = parse_board(line)
+    except ValueError as error:
+        return {'line': line_number, 'error': str(error)}
+
+    board = Board()
+    board.set_digits(digit_list)
+    solver = Solver(tablebase=None if tablebase_path is None else open_tablebase(tablebase_path))
+    solver.set_board(board)
+    setup_seconds = time.perf_counter() - start
+
+    if mode == 'exact':
+        solvability = solver.solve_exact()
+    elif mode == 'beam':
+        solvability = solver.solve_beam(width)
+    elif mode == 'fill':
+        solvability = solver.solve_with_fills(max_fills, deadline=deadline)
+    else:
+        solvability = solver.solve(deadline=deadline)
+    path = solver.get_solution()
+    return {
+        'line': line_number,
+        'solvable': solvability,
+        'status': solver.status,
+        'rejected_by': solver.stats.get('rejected_by'),
+        'steps': len(path),
+        'path': [list(digit_pair) for digit_pair in path],
+        'setup_seconds': round(setup_seconds, 6),
+        'solve_seconds': round(time.perf_counter() - start - setup_seconds, 6),
+    }
+
+
+def run(input_stream: TextIO, output_stream: TextIO, workers: int = 1, mode: str = 'greedy',
+        deadline: float | None = None, width: int = 8, max_pending: int | None = None, max_fills: int = 1,
+        tablebase_path: str | None = None) -> int:
+    """
+    流式批量求解，每个棋盘求解完成后立即写出一行JSON
+
+    workers大于1时在进程池中求解，输出顺序为完成顺序，可以按line字段对应输入。
+    同时提交的棋盘数不超过max_pending，因此内存占用与输入规模无关。
+
+    Args:
+        input_stream: 输入流，每行一个棋盘
+        output_stream: 输出流，每行一个JSON结果
+        workers: 进程数
+        mode: 求解模式，greedy、exact、beam或fill
+        deadline: 贪心求解及fill模式的时限（秒），默认不限制
+        width: 束搜索的束宽
+        max_pending: 同时提交的棋盘数上限，默认为4 * workers
+        max_fills: fill模式最多填充的次数
+        tablebase_path: exact模式使用的残局库文件路径，默认不使用
+
+    Returns:
+        count: 求解的棋盘数
+    """
+    def write(result: dict) -> None:
+        """写出一行结果并立即刷新"""
+        output_stream.write(json.dumps(result) + '\n')
+        output_stream.flush()
+
+    count = 0
+    if workers <= 1:
+        for line_number, line in iter_boards(input_stream):
+            write(solve_board(line_number, line, mode, deadline, width, max_fills, tablebase_path))
+            count += 1
+        return count
+
+    max_pending = max_pending or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for line_number, line in iter_boards(input_stream):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+                    count += 1
+            pending.add(pool.submit(solve_board, line_number, line, mode, deadline, width, max_fills, tablebase_path))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                write(future.result())
+                count += 1
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    命令行入口
+
+    Args:
+        argv: 命令行参数，默认使用sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(description='批量求解NumberMatch棋盘，每行输入一个棋盘，每行输出一个JSON结果')
+    parser.add_argument('input', nargs='?', default='-', help="输入文件，'-'或省略时读取标准输入")
+    parser.add_argument('-o', '--output', default='-', help="输出文件，'-'或省略时写到标准输出")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help='进程数，默认为CPU核数')
+    parser.add_argument('-m', '--mode', choices=MODES, default='greedy', help='求解模式，默认为greedy')
+    parser.add_argument('--deadline', type=float, default=None, help='每个棋盘贪心求解及fill模式的时限（秒）')
+    parser.add_argument('--width', type=int, default=8, help='beam模式的束宽')
+    parser.add_argument('--max-fills', type=int, default=1, help='fill模式最多填充的次数')
+    parser.add_argument('--tablebase', default=None, help='exact模式使用的残局库文件，由python -m srcs.tablebase生成')
+    args = parser.parse_args(argv)
+
+    input_stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    output_stream = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    try:
+        count = run(input_stream, output_stream, args.workers, args.mode, args.deadline, args.width,
+                    max_fills=args.max_fills, tablebase_path=args.tablebase)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    elapsed = time.perf_counter() - start
+    print(f'{count} boards in {elapsed:.3f}s ({count / max(elapsed, 1e-9):.1f} boards/s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
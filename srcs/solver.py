@@ -1,17 +1,272 @@
-import copy
-from typing import Tuple, List
-from srcs.board import Board
+import heapq
+import math
+import random
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Callable, Iterator, List, Tuple
+from srcs.board import Board, FILL_MOVE
+from srcs.cache import SolutionCache
+from srcs.tablebase import Tablebase, open_tablebase
 from srcs.twin_board import TwinBoard
 
+# 求解状态
+SOLVED, UNSOLVABLE, TIMED_OUT, CANCELLED = 'solved', 'unsolvable', 'timed_out', 'cancelled'
+
+# 预检查，按代价从低到高排列
+EMPTY_BOARD, ODD_CLASS, NO_PAIRS = 'empty_board', 'odd_class', 'no_pairs'
+
+# 候选数字对少于该数量时，进程间通信的开销超过并行评估的收益，仍在本进程中评估
+PARALLEL_MIN_PAIRS = 32
+
+# hint()保留的搜索树数量
+HINT_MEMO_SIZE = 64
+
+
+def twin_board_from(digit_bytes: bytes, pair_list: list[Tuple[int, int]] | None = None) -> TwinBoard:
+    """
+    由互补数字节串构造孪生棋盘
+
+    Args:
+        digit_bytes: 互补数表示的局面
+        pair_list: 已知的该局面的可消除数字对，给出时不再重新列出
+
+    Returns:
+        twin_board: TwinBoard实例
+    """
+    # 字节串已经是互补数，直接设置局面，不经过Board实例，只建立一次邻居索引
+    twin_board = TwinBoard.__new__(TwinBoard)
+    twin_board.set_digits(list(digit_bytes), pair_list)
+    return twin_board
+
+
+def _score_chunk(digit_bytes: bytes, start: int, stop: int) -> tuple[int, int]:
+    """
+    在子进程中评估pair_list[start:stop]中的候选数字对
+
+    pair_list由局面唯一确定，因此只需传递局面和区间。
+
+    Args:
+        digit_bytes: 互补数表示的局面
+        start: 区间起点
+        stop: 区间终点（不含）
+
+    Returns:
+        best: (最高score, 取得最高score的第一个位置)
+    """
+    twin_board = twin_board_from(digit_bytes)
+    best_score, best_position = -1, start
+    for position in range(start, stop):
+        digit_pair = twin_board.pair_list[position]
+        twin_board.apply(digit_pair[0], digit_pair[1])
+        score = twin_board.score
+        twin_board.undo()
+        if score > best_score:
+            best_score, best_position = score, position
+    return best_score, best_position
+
+
+def _search_subtree(digit_bytes: bytes, tablebase_path: str | None) -> tuple[bool, list[tuple[int, int]], dict]:
+    """
+    在子进程中精确求解一棵子树
+
+    Args:
+        digit_bytes: 互补数表示的局面
+        tablebase_path: 残局库文件路径，子进程各自映射，为None时不使用残局库
+
+    Returns:
+        result: (是否能够清空棋盘, 消除路径, 搜索统计)
+    """
+    solver = Solver(tablebase=None if tablebase_path is None else open_tablebase(tablebase_path))
+    solver.twin_board = twin_board_from(digit_bytes)
+    solver.stats = {'nodes': 0, 'table_lookups': 0, 'table_hits': 0, 'tablebase_hits': 0}
+    solvability = solver._search(set())
+    return solvability, solver.path, solver.stats
+
+
+def _has_empty_row(digit_list: list[int]) -> bool:
+    """
+    局面中是否有空行
+
+    Args:
+        digit_list: 表示局面的整数列表，使用0表示空格
+
+    Returns:
+        has_empty_row: 如果有空行则返回True，否则返回False
+    """
+    return not all(any(digit_list[row_start: row_start + 9]) for row_start in range(0, len(digit_list), 9))
+
+
+def _remove_pair(digit_list: list[int], global_index1: int, global_index2: int, has_empty_row: bool) -> None:
+    """
+    在局面的拷贝上消除数字对，出现空行时原地删除
+
+    与Board.match()相同，局面中原有的空行在第一次消除后同时删除，之后只有被消除格子所在的行可能变为空行。
+
+    Args:
+        digit_list: 表示局面的整数列表，原地修改
+        global_index1: 全局索引（0-based）
+        global_index2: 全局索引（0-based）
+        has_empty_row: 消除前局面中是否有空行
+    """
+    digit_list[global_index1] = digit_list[global_index2] = 0
+    row_start1, row_start2 = global_index1 - global_index1 % 9, global_index2 - global_index2 % 9
+    if has_empty_row or not any(digit_list[row_start1: row_start1 + 9]) or \
+            not any(digit_list[row_start2: row_start2 + 9]):
+        for row_start in range((len(digit_list) - 1) // 9 * 9, -1, -9):
+            if not any(digit_list[row_start: row_start + 9]):
+                del digit_list[row_start: row_start + 9]
+
+
+def _playout(digit_list: list[int], rng: random.Random, move_list: list[tuple[int, int]],
+             has_empty_row: bool = False) -> int:
+    """
+    在局面的拷贝上随机消除直到无法继续
+
+    每一步从随机的非空格子开始按全局索引循环扫描，沿各视线轴逐格找到其后的第一个非空格子，
+    执行找到的第一个可消除数字对，规则与Board._is_pair()相同。
+    不建立邻居索引、不记日志也不撤销，整个模拟只修改digit_list这一个拷贝。
+
+    Args:
+        digit_list: 互补数表示的局面的拷贝，原地修改
+        rng: 随机数发生器
+        move_list: 消除路径，原地追加
+        has_empty_row: 局面中是否有空行
+
+    Returns:
+        remaining_count: 模拟结束时剩余的非空格子数
+    """
+    remaining_count = len(digit_list) - digit_list.count(0)
+    while remaining_count:
+        length = len(digit_list)
+        start = rng.randrange(length)
+        for offset in range(length):
+            global_index1 = start + offset
+            if global_index1 >= length:
+                global_index1 -= length
+            digit = digit_list[global_index1]
+            if not digit:
+                continue
+            # 全局索引顺序：跨行首尾只允许相邻两行
+            global_index2 = global_index1 + 1
+            while global_index2 < length and not digit_list[global_index2]:
+                global_index2 += 1
+            if global_index2 < length and digit_list[global_index2] == digit and \
+                    global_index2 // 9 - global_index1 // 9 <= 1:
+                break
+            # 相同列、主对角线、副对角线：沿对角线移动越过第8列或第0列时停止
+            for step, stop_col in ((9, -1), (10, 0), (8, 8)):
+                global_index2 = global_index1 + step
+                while global_index2 < length and global_index2 % 9 != stop_col and not digit_list[global_index2]:
+                    global_index2 += step
+                if global_index2 < length and global_index2 % 9 != stop_col and digit_list[global_index2] == digit:
+                    break
+            else:
+                continue
+            break
+        else:
+            return remaining_count
+
+        move_list.append((global_index1, global_index2))
+        _remove_pair(digit_list, global_index1, global_index2, has_empty_row)
+        has_empty_row = False
+        remaining_count -= 2
+    return 0
+
+
+def _mcts_rollouts(digit_bytes: bytes, rollouts: int, exploration: float, seed: int,
+                   initial_count: int) -> tuple[list[int], list[tuple[int, int]] | None, int]:
+    """
+    在子进程中从给定局面执行一组蒙特卡洛树搜索模拟
+
+    Args:
+        digit_bytes: 互补数表示的局面
+        rollouts: 模拟次数
+        exploration: 探索系数
+        seed: 随机种子
+        initial_count: 求解开始时的非空格子数，用于计算回报
+
+    Returns:
+        result: (根局面各候选数字对的访问次数，按pair_list排序, 清空棋盘的消除路径，没有找到时为None,
+                 随机模拟的消除次数)
+    """
+    solver = Solver()
+    solver.twin_board = twin_board_from(digit_bytes)
+    solver.stats = {'rollouts': 0, 'playout_moves': 0}
+    root = _Node()
+    solution = solver._rollouts(root, solver.twin_board.digit_list, rollouts, exploration, random.Random(seed),
+                                initial_count)
+    return [child.visits if child else 0 for child in root.children], solution, solver.stats['playout_moves']
+
+
+class _Node:
+    """蒙特卡洛搜索树的节点"""
+
+    __slots__ = ('visits', 'value', 'pairs', 'priors', 'children')
+
+    def __init__(self):
+        """初始化未展开的节点"""
+        self.visits = 0
+        self.value = 0.0
+        self.pairs = None
+        self.priors = None
+        self.children = None
+
 
 class Solver:
     """求解器类"""
 
-    def __init__(self):
-        """初始化求解器"""
+    def __init__(self, workers: int = 1, cache: SolutionCache | None = None, tablebase: Tablebase | None = None):
+        """
+        初始化求解器
+
+        Args:
+            workers: 评估候选数字对的进程数，大于1时在进程池中并行评估
+            cache: 求解结果缓存，求解前查询，求解后写入
+            tablebase: 残局库，精确求解时非空格子数不超过其上限的局面直接查询结果
+        """
         self.board = None
         self.twin_board = None
         self.path = []
+        self.stats = {}
+        self.status = None
+        self.workers = workers
+        self.cache = cache
+        self.tablebase = tablebase
+        self._progress = None
+        self._hint_memo = OrderedDict()
+        self._pool = None
+
+    def __enter__(self) -> 'Solver':
+        """
+        进入上下文
+
+        Returns:
+            solver: 求解器自身
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """退出上下文时关闭进程池"""
+        self.close()
+
+    def close(self) -> None:
+        """关闭进程池"""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor | None:
+        """
+        按需创建进程池
+
+        Returns:
+            pool: 进程池，workers不大于1时为None
+        """
+        if self._pool is None and self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
 
     def set_board(self, board: Board) -> None:
         """
@@ -23,39 +278,1027 @@ class Solver:
         self.board = board
         self.twin_board = TwinBoard(board)
         self.path = []
+        self.stats = {}
+        self.status = None
+        self._progress = None
+
+    def precheck(self) -> str | None:
+        """
+        检查只通过消除清空棋盘的必要条件
+
+        依次检查：棋盘为空（与各求解模式一致，视为无法清空）；某个互补数的格子数为奇数（每次消除同一互补数的两个格子，
+        奇偶性不变）；没有可消除数字对。前两项只读取互补数直方图，最后一项找到第一个数字对即返回。
 
-    def solve(self) -> bool:
+        Returns:
+            check: 未通过的检查，EMPTY_BOARD、ODD_CLASS或NO_PAIRS，全部通过时为None
+        """
+        class_histogram = self.twin_board.class_histogram
+        if len(self.twin_board.digit_list) == class_histogram[0]:
+            return EMPTY_BOARD
+        if any(count & 1 for count in class_histogram[1:]):
+            return ODD_CLASS
+        if not self.twin_board.has_pairs():
+            return NO_PAIRS
+        return None
+
+    def _rejected(self) -> bool:
+        """
+        求解前执行预检查，未通过时记录未通过的检查
+
+        Returns:
+            rejected: 如果未通过预检查则返回True，此时status为UNSOLVABLE，stats['rejected_by']为未通过的检查
+        """
+        check = self.precheck()
+        if check is None:
+            return False
+        self.stats = {'rejected_by': check}
+        self.status = UNSOLVABLE
+        self._progress = None
+        return True
+
+    def solve(self, deadline: float | None = None, max_nodes: int | None = None) -> bool:
         """
         是否能够清空棋盘
 
+        可以限制耗时或展开节点数（每模拟一个候选数字对计为一个节点）。超出限制时立即停止，
+        path保留已经执行的消除，status为TIMED_OUT；再次调用会从中断处继续求解。
+
+        Args:
+            deadline: 求解时限（秒），从调用时开始计时，默认不限制
+            max_nodes: 本次调用最多展开的节点数，默认不限制
+
         Returns:
             solvability: 如果能够清空棋盘则返回True，否则返回False
         """
-        while self.twin_board.pair_list:
-            best_digit_pair = None
-            best_score = -1
+        if self._rejected():
+            return False
+        return self._cached('greedy', lambda: self._greedy(deadline, max_nodes))
 
-            for digit_pair in self.twin_board.pair_list:
-                simulated_board = copy.deepcopy(self.twin_board)
-                simulated_board.match(digit_pair[0], digit_pair[1])
-                score = simulated_board.score
+    def solve_iter(self, deadline: float | None = None,
+                   max_nodes: int | None = None) -> Iterator[tuple[Tuple[int, int], tuple[int, ...]]]:
+        """
+        逐步贪心求解，每决定一步立即生成该步，选择与solve()完全相同
+
+        每一步生成(数字对, 被清理的行)：先将数字对的两个格子置为空格，再按从大到小的顺序删除被清理的行（行号为本步之前的编号），
+        即得到下一局面。调用方可以在任意两步之间停止迭代或调用close()取消，此时status为CANCELLED（已经清空棋盘时仍为SOLVED），path保留已经生成的各步，
+        再次调用solve()或solve_iter()会从当前局面继续。不查询缓存。
+
+        Args:
+            deadline: 求解时限（秒），从调用时开始计时，默认不限制
+            max_nodes: 本次调用最多展开的节点数，默认不限制
+
+        Returns:
+            moves: (数字对, 被清理的行)的迭代器，结束后status与solve()相同
+        """
+        if self._rejected():
+            return
+        try:
+            yield from self._greedy_moves(deadline, max_nodes, True)
+        except GeneratorExit:
+            if self.status != SOLVED:
+                self.status = CANCELLED
+            raise
+
+    def _greedy(self, deadline: float | None, max_nodes: int | None) -> bool:
+        """
+        贪心求解
+
+        Args:
+            deadline: 求解时限（秒），None表示不限制
+            max_nodes: 最多展开的节点数，None表示不限制
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        for _ in self._greedy_moves(deadline, max_nodes, False):
+            pass
+        return self.status == SOLVED
+
+    def _greedy_moves(self, deadline: float | None, max_nodes: int | None,
+                      with_rows: bool) -> Iterator[tuple[Tuple[int, int], tuple[int, ...]]]:
+        """
+        贪心求解，每执行一步消除生成一次
+
+        Args:
+            deadline: 求解时限（秒），None表示不限制
+            max_nodes: 最多展开的节点数，None表示不限制
+            with_rows: 是否计算每一步被清理的行，为False时生成空元组
+
+        Returns:
+            moves: (数字对, 被清理的行)的迭代器
+        """
+        end_time = None if deadline is None else time.perf_counter() + deadline
+        node_limit = -1 if max_nodes is None else max_nodes
+        nodes = 0
+        self.stats = {'nodes': 0}
+        self.status = UNSOLVABLE
+
+        while self.twin_board.has_pairs():
+            pair_list = self.twin_board.pair_list
+            # 消除后会重新构建pair_list，同一个对象说明局面未变，可以接着上次中断的位置评估
+            if self._progress is not None and self._progress[0] is pair_list:
+                _, position, best_digit_pair, best_score = self._progress
+            elif max_nodes is None and len(pair_list) >= PARALLEL_MIN_PAIRS and self._executor():
+                best_digit_pair = self._parallel_best_pair(end_time)
+                if best_digit_pair is None:
+                    self.stats['nodes'] = nodes
+                    self.status = TIMED_OUT
+                    return
+                nodes += len(pair_list)
+                position = len(pair_list)
+            else:
+                position, best_digit_pair, best_score = 0, None, -1
+
+            while position < len(pair_list):
+                # 一次时钟读取远快于一次apply()/undo()，因此每个节点都检查
+                if nodes == node_limit or end_time is not None and time.perf_counter() >= end_time:
+                    self._progress = (pair_list, position, best_digit_pair, best_score)
+                    self.stats['nodes'] = nodes
+                    self.status = TIMED_OUT
+                    return
+                nodes += 1
+                digit_pair = pair_list[position]
+                position += 1
+                self.twin_board.apply(digit_pair[0], digit_pair[1])
+                score = self.twin_board.score
+                self.twin_board.undo()
                 if score > best_score:
                     best_score = score
                     best_digit_pair = digit_pair
 
+            cleared_rows = self._cleared_rows(best_digit_pair) if with_rows else ()
+            self.path.append(best_digit_pair)
+            self.twin_board.match(best_digit_pair[0], best_digit_pair[1])
+            self.stats['nodes'] = nodes
+            if not self.twin_board.digit_list:
+                self.status = SOLVED
+                yield best_digit_pair, cleared_rows
+                return
+            yield best_digit_pair, cleared_rows
+
+    def _cleared_rows(self, digit_pair: Tuple[int, int]) -> tuple[int, ...]:
+        """
+        消除数字对之后将被清理的行
+
+        消除之后只要存在空行就会清理所有空行，因此包括消除之前已经为空的行。
+
+        Args:
+            digit_pair: 将要消除的数字对
+
+        Returns:
+            cleared_rows: 行号（0-based）的元组，按从小到大排序
+        """
+        digit_list = self.twin_board.digit_list
+        return tuple(row_index for row_index in range((len(digit_list) + 8) // 9)
+                     if all(not digit_list[global_index] or global_index in digit_pair
+                            for global_index in range(9 * row_index, min(9 * row_index + 9, len(digit_list)))))
+
+    def _parallel_best_pair(self, end_time: float | None) -> Tuple[int, int] | None:
+        """
+        将候选数字对按区间分给进程池评估
+
+        各区间返回其中score最高的第一个数字对，按区间顺序合并，score相同时取位置靠前者，
+        因此选择与逐个评估完全一致，不受进程调度影响。
+
+        Args:
+            end_time: 时限对应的time.perf_counter()时刻，None表示不限时
+
+        Returns:
+            best_digit_pair: 最优数字对，超出时限时为None
+        """
+        pair_list = self.twin_board.pair_list
+        digit_bytes = bytes(self.twin_board.digit_list)
+        chunk_size = -(-len(pair_list) // self.workers)
+        future_list = [self._pool.submit(_score_chunk, digit_bytes, start, min(start + chunk_size, len(pair_list)))
+                       for start in range(0, len(pair_list), chunk_size)]
+        timeout = None if end_time is None else max(end_time - time.perf_counter(), 0)
+        _, not_done = wait(future_list, timeout)
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            return None
+
+        best_score, best_position = -1, 0
+        for future in future_list:
+            score, position = future.result()
+            if score > best_score:
+                best_score, best_position = score, position
+        return pair_list[best_position]
+
+    def solve_exact(self) -> bool:
+        """
+        精确求解，完整搜索所有消除顺序
+
+        深度优先搜索，按消除后的score从高到低排序候选（与贪心的首选一致），
+        并用以zobrist_hash为键的置换表记录已证明无解的局面；设置了残局库时，剩余的残局直接查询结果。
+        返回True时path为找到的解法；返回False即证明不存在能够清空棋盘的消除顺序。
+        搜索统计记录在stats中：展开节点数、置换表查询次数、命中次数、命中率和残局库命中次数。
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        self.path = []
+        if self._rejected():
+            return False
+        return self._cached('exact', self._exact)
+
+    def _exact(self) -> bool:
+        """
+        精确求解
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        self.stats = {'nodes': 0, 'table_lookups': 0, 'table_hits': 0, 'tablebase_hits': 0}
+        if self.twin_board.has_pairs() and self._executor():
+            solvability = self._parallel_search()
+        else:
+            solvability = self.twin_board.has_pairs() and self._search(set())
+        self.stats['hit_rate'] = self.stats['table_hits'] / max(self.stats['table_lookups'], 1)
+        self.status = SOLVED if solvability else UNSOLVABLE
+        return solvability
+
+    def _parallel_search(self) -> bool:
+        """
+        将根局面的每个候选数字对之后的子树分给进程池精确求解
+
+        按候选顺序取第一个有解的子树，找到的路径与单进程深度优先搜索相同；
+        子进程之间不共享置换表。
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        self.stats['nodes'] += 1
+        self.stats['table_lookups'] += 1
+        future_list = []
+        for digit_pair in self._ordered_pairs():
+            self.twin_board.apply(digit_pair[0], digit_pair[1])
+            digit_bytes = bytes(self.twin_board.digit_list)
+            self.twin_board.undo()
+            future_list.append((digit_pair, self._pool.submit(
+                _search_subtree, digit_bytes, None if self.tablebase is None else self.tablebase.path)))
+
+        for index, (digit_pair, future) in enumerate(future_list):
+            solvability, path, stats = future.result()
+            for name in ('nodes', 'table_lookups', 'table_hits', 'tablebase_hits'):
+                self.stats[name] += stats[name]
+            if solvability:
+                for _, pending_future in future_list[index + 1:]:
+                    pending_future.cancel()
+                self._replay([digit_pair] + path)
+                return True
+        return False
+
+    def _search(self, unsolvable_set: set) -> bool:
+        """
+        从当前局面深度优先搜索，找到解法时保留在该局面上执行的消除
+
+        Args:
+            unsolvable_set: 置换表，已证明无解的局面
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        if not self.twin_board.digit_list:
+            return True
+
+        if self.tablebase is not None:
+            solvability = self._probe_tablebase()
+            if solvability is not None:
+                return solvability
+
+        key = self.twin_board.zobrist_hash
+        self.stats['table_lookups'] += 1
+        if key in unsolvable_set:
+            self.stats['table_hits'] += 1
+            return False
+
+        self.stats['nodes'] += 1
+        for digit_pair in self._ordered_pairs():
+            self.twin_board.apply(digit_pair[0], digit_pair[1])
+            self.path.append(digit_pair)
+            if self._search(unsolvable_set):
+                return True
+            self.path.pop()
+            self.twin_board.undo()
+
+        unsolvable_set.add(key)
+        return False
+
+    def _probe_tablebase(self) -> bool | None:
+        """
+        在残局库中查询当前局面，能够清空时沿残局库给出的每一步执行到清空棋盘
+
+        非空格子数由互补数直方图O(1)得到，超过残局库上限时不计算规范键。
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，无法清空则返回False，不在残局库中时为None
+        """
+        cell_count = len(self.twin_board.digit_list) - self.twin_board.class_histogram[0]
+        if cell_count > self.tablebase.max_cells:
+            return None
+        entry = self.tablebase.probe(self.twin_board.digit_list)
+        if entry is None:
+            return None
+        self.stats['tablebase_hits'] += 1
+        solvability, digit_pair = entry
+        while solvability and self.twin_board.digit_list:
+            self.twin_board.apply(digit_pair[0], digit_pair[1])
+            self.path.append(digit_pair)
+            if self.twin_board.digit_list:
+                solvability, digit_pair = self.tablebase.probe(self.twin_board.digit_list)
+        return solvability
+
+    def _ordered_pairs(self) -> List[Tuple[int, int]]:
+        """
+        按消除后的score从高到低排序的候选数字对，score相同时保持pair_list中的顺序
+
+        Returns:
+            pair_list: 排序后的候选数字对
+        """
+        score_list = []
+        for digit_pair in self.twin_board.pair_list:
+            self.twin_board.apply(digit_pair[0], digit_pair[1])
+            score_list.append(self.twin_board.score)
+            self.twin_board.undo()
+        order = sorted(range(len(score_list)), key=lambda i: -score_list[i])
+        return [self.twin_board.pair_list[i] for i in order]
+
+    def solve_beam(self, width: int = 8, max_states: int | None = None,
+                   evaluator: Callable[[TwinBoard], float] | None = None) -> bool:
+        """
+        束搜索求解，介于贪心与精确求解之间
+
+        每一层展开束中所有局面的全部候选数字对，去除重复局面后按评估值保留最好的width个局面。
+        以zobrist_hash识别重复局面。width为1时等价于贪心。返回False并不证明无解。
+
+        Args:
+            width: 束宽，每层保留的局面数
+            max_states: 同时保存在内存中的候选局面上限，默认为10 * width，不小于width
+            evaluator: 局面评估函数，值越大越好，默认使用TwinBoard.score
+
+        Returns:
+            solvability: 如果找到清空棋盘的消除路径则返回True，否则返回False
+        """
+        max_states = max(max_states or 10 * width, width)
+        self.path = []
+        if self._rejected():
+            return False
+        if evaluator is not None:
+            # 自定义评估函数的结果不写入缓存，缓存键无法区分不同的评估函数
+            return self._beam(width, max_states, evaluator)
+        return self._cached(f'beam:{width}:{max_states}',
+                            lambda: self._beam(width, max_states, lambda twin_board: twin_board.score))
+
+    def _beam(self, width: int, max_states: int, evaluator: Callable[[TwinBoard], float]) -> bool:
+        """
+        束搜索求解
+
+        Args:
+            width: 束宽
+            max_states: 同时保存在内存中的候选局面上限
+            evaluator: 局面评估函数
+
+        Returns:
+            solvability: 如果找到清空棋盘的消除路径则返回True，否则返回False
+        """
+        self.stats = {'nodes': 0, 'peak_states': 0}
+        self.status = UNSOLVABLE
+        beam = [(bytes(self.twin_board.digit_list), [])] if self.twin_board.has_pairs() else []
+
+        while beam:
+            # 局面的Zobrist哈希值 -> (评估值的相反数, 生成顺序, 路径, 互补数字节串)
+            candidate_dict = {}
+            # 裁剪后len(candidate_dict)会变小，生成顺序需要单独计数，评估值相同时才能保持先生成者在前
+            order = 0
+            for digit_bytes, path in beam:
+                twin_board = twin_board_from(digit_bytes)
+                self.stats['nodes'] += 1
+                for digit_pair in twin_board.pair_list:
+                    twin_board.apply(digit_pair[0], digit_pair[1])
+                    if not twin_board.digit_list:
+                        self._replay(path + [digit_pair])
+                        self.status = SOLVED
+                        return True
+                    key = twin_board.zobrist_hash
+                    if key not in candidate_dict:
+                        candidate_dict[key] = (-evaluator(twin_board), order, path + [digit_pair],
+                                               bytes(twin_board.digit_list))
+                        order += 1
+                    twin_board.undo()
+                    if len(candidate_dict) > max_states:
+                        candidate_dict = dict(sorted(candidate_dict.items(), key=lambda item: item[1][:2])[:width])
+                    self.stats['peak_states'] = max(self.stats['peak_states'], len(candidate_dict))
+            beam = [(candidate[3], candidate[2]) for candidate in sorted(candidate_dict.values())[:width]]
+
+        return False
+
+    def solve_lookahead(self, depth: int = 2, memo_size: int = 1 << 14) -> bool:
+        """
+        多步前瞻的贪心求解
+
+        每一步选择使之后depth步内能够达到的最高score最大的数字对，score相同时取pair_list中靠前者，
+        因此depth为1时与solve()的路径相同。清空棋盘的序列视为无穷大，前瞻范围内走入没有可消除数字对的局面视为-1。
+        已评估的局面记录在以zobrist_hash为键的备忘录中，超出memo_size个条目时淘汰最久未使用的条目。
+
+        Args:
+            depth: 前瞻步数，不小于1
+            memo_size: 备忘录的最大条目数
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        if self._rejected():
+            return False
+        return self._cached(f'lookahead:{depth}', lambda: self._lookahead(max(depth, 1), memo_size))
+
+    def _lookahead(self, depth: int, memo_size: int) -> bool:
+        """
+        多步前瞻求解
+
+        备忘录中有两类条目：(哈希值, 0)为局面的一步展开，即各候选数字对、消除后局面的哈希值及其score，
+        与前瞻步数无关，因此后续步骤经过同一局面时直接复用；(哈希值, k)为该局面向前看k步的值，
+        不同消除顺序到达的同一局面（例如先后消除两个互不相关的数字对）直接复用。
+
+        Args:
+            depth: 前瞻步数
+            memo_size: 备忘录的最大条目数
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        self.stats = {'nodes': 0, 'memo_lookups': 0, 'memo_hits': 0, 'evictions': 0}
+        self.status = UNSOLVABLE
+        memo = OrderedDict()
+
+        while self.twin_board.has_pairs():
+            best_value, best_digit_pair = None, None
+            for digit_pair, child_hash, child_score in self._expand(memo, memo_size):
+                if depth == 1 or child_score == float('inf'):
+                    value = child_score
+                else:
+                    value = self._child_value(digit_pair, child_hash, depth - 1, memo, memo_size)
+                if best_value is None or value > best_value:
+                    best_value, best_digit_pair = value, digit_pair
+
             self.path.append(best_digit_pair)
             self.twin_board.match(best_digit_pair[0], best_digit_pair[1])
+            if not self.twin_board.digit_list:
+                self.stats['hit_rate'] = self.stats['memo_hits'] / max(self.stats['memo_lookups'], 1)
+                self.status = SOLVED
+                return True
 
+        self.stats['hit_rate'] = self.stats['memo_hits'] / max(self.stats['memo_lookups'], 1)
+        return False
+
+    def _expand(self, memo: OrderedDict, memo_size: int) -> tuple:
+        """
+        当前局面的一步展开，优先从备忘录中读取
+
+        Args:
+            memo: 备忘录
+            memo_size: 备忘录的最大条目数
+
+        Returns:
+            expansion: (数字对, 消除后局面的哈希值, 消除后的score)的元组，按pair_list排序；清空棋盘时score为无穷大
+        """
+        key = (self.twin_board.zobrist_hash, 0)
+        expansion = self._memo_get(memo, key)
+        if expansion is None:
+            self.stats['nodes'] += 1
+            child_list = []
+            for digit_pair in self.twin_board.pair_list:
+                self.twin_board.apply(digit_pair[0], digit_pair[1])
+                child_score = self.twin_board.score if self.twin_board.digit_list else float('inf')
+                child_list.append((digit_pair, self.twin_board.zobrist_hash, child_score))
+                self.twin_board.undo()
+            expansion = tuple(child_list)
+            self._memo_put(memo, key, expansion, memo_size)
+        return expansion
+
+    def _child_value(self, digit_pair: Tuple[int, int], child_hash: int, depth: int, memo: OrderedDict,
+                     memo_size: int) -> float:
+        """
+        消除数字对之后的局面向前看depth步的值，命中备忘录时不需要在棋盘上执行消除
+
+        Args:
+            digit_pair: 数字对
+            child_hash: 消除后局面的哈希值
+            depth: 前瞻步数，不小于1
+            memo: 备忘录
+            memo_size: 备忘录的最大条目数
+
+        Returns:
+            value: 之后depth步内能够达到的最高score
+        """
+        value = self._memo_get(memo, (child_hash, depth))
+        if value is not None:
+            return value
+
+        self.twin_board.apply(digit_pair[0], digit_pair[1])
+        value = -1
+        for next_digit_pair, next_hash, next_score in self._expand(memo, memo_size):
+            if depth == 1 or next_score == float('inf'):
+                next_value = next_score
+            else:
+                next_value = self._child_value(next_digit_pair, next_hash, depth - 1, memo, memo_size)
+            value = max(value, next_value)
+            if value == float('inf'):
+                break
+        self.twin_board.undo()
+        self._memo_put(memo, (child_hash, depth), value, memo_size)
+        return value
+
+    def _memo_get(self, memo: OrderedDict, key: tuple):
+        """
+        查询备忘录，命中时将条目移到最近使用的位置
+
+        Args:
+            memo: 备忘录
+            key: 条目的键，前瞻为(哈希值, 前瞻步数)，提示为(哈希值, 局面的字节串)
+
+        Returns:
+            entry: 条目，未命中时为None
+        """
+        self.stats['memo_lookups'] += 1
+        entry = memo.get(key)
+        if entry is not None:
+            memo.move_to_end(key)
+            self.stats['memo_hits'] += 1
+        return entry
+
+    def _memo_put(self, memo: OrderedDict, key: tuple, entry, memo_size: int) -> None:
+        """
+        写入备忘录，超出容量时淘汰最久未使用的条目
+
+        Args:
+            memo: 备忘录
+            key: 条目的键
+            entry: 条目
+            memo_size: 备忘录的最大条目数
+        """
+        memo[key] = entry
+        while len(memo) > memo_size:
+            memo.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def solve_mcts(self, rollouts: int = 1000, exploration: float = 1.0, seed: int = 0) -> bool:
+        """
+        蒙特卡洛树搜索求解，适用于精确求解代价过高的大棋盘
+
+        每一步从当前局面执行rollouts次模拟后，执行访问次数最多的数字对，并保留其子树供下一步继续使用。
+        选择子节点时以消除后的score的softmax作为先验概率（PUCT），模拟时随机消除直到无法继续。
+        任意一次模拟清空棋盘时立即返回该路径。workers大于1时每一步的模拟分给进程池，合并各进程根局面的访问次数。
+        返回False并不证明无解。
+
+        Args:
+            rollouts: 每一步的模拟次数
+            exploration: 探索系数，越大越倾向于访问次数少的数字对
+            seed: 随机种子，相同的种子和进程数得到相同的路径
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        if self._rejected():
+            return False
+        return self._cached(f'mcts:{rollouts}:{exploration}:{seed}:{max(self.workers, 1)}',
+                            lambda: self._mcts(rollouts, exploration, seed))
+
+    def _mcts(self, rollouts: int, exploration: float, seed: int) -> bool:
+        """
+        蒙特卡洛树搜索求解
+
+        Args:
+            rollouts: 每一步的模拟次数
+            exploration: 探索系数
+            seed: 随机种子
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        self.stats = {'rollouts': 0, 'playout_moves': 0}
+        self.status = UNSOLVABLE
+        rng = random.Random(seed)
+        initial_count = len(self.twin_board.digit_list) - self.twin_board.class_histogram[0]
+        root = _Node()
+
+        while self.twin_board.has_pairs():
+            if self._executor():
+                visit_list, solution = self._parallel_rollouts(rollouts, exploration, rng, initial_count)
+                pair_list = self.twin_board.pair_list
+            else:
+                solution = self._rollouts(root, self.twin_board.digit_list, rollouts, exploration, rng, initial_count)
+                visit_list = [child.visits if child else 0 for child in root.children]
+                pair_list = root.pairs
+            if solution is not None:
+                prefix = self.path
+                self._replay(solution)
+                self.path = prefix + solution
+                self.status = SOLVED
+                return True
+
+            position = visit_list.index(max(visit_list))
+            digit_pair = pair_list[position]
+            self.path.append(digit_pair)
+            self.twin_board.match(digit_pair[0], digit_pair[1])
             if not self.twin_board.digit_list:
+                self.status = SOLVED
                 return True
+            root = root.children[position] if root.children and root.children[position] else _Node()
 
         return False
 
+    def _parallel_rollouts(self, rollouts: int, exploration: float, rng: random.Random,
+                           initial_count: int) -> tuple[list[int], list[tuple[int, int]] | None]:
+        """
+        将一步的模拟均分给进程池，各进程独立建树，合并根局面的访问次数
+
+        Args:
+            rollouts: 本步的模拟次数
+            exploration: 探索系数
+            rng: 生成各进程随机种子的随机数发生器
+            initial_count: 求解开始时的非空格子数
+
+        Returns:
+            result: (根局面各候选数字对的访问次数之和, 第一个进程找到的清空棋盘的路径，没有找到时为None)
+        """
+        digit_bytes = bytes(self.twin_board.digit_list)
+        # rollouts为0时不提交任务，各数字对的访问次数都为0，与单进程一致
+        chunk_size = max(-(-rollouts // self.workers), 1)
+        future_list = [self._pool.submit(_mcts_rollouts, digit_bytes, min(chunk_size, rollouts - start), exploration,
+                                         rng.getrandbits(64), initial_count)
+                       for start in range(0, rollouts, chunk_size)]
+        visit_list = [0] * len(self.twin_board.pair_list)
+        solution = None
+        for future in future_list:
+            child_visit_list, child_solution, playout_moves = future.result()
+            self.stats['playout_moves'] += playout_moves
+            for position, visits in enumerate(child_visit_list):
+                visit_list[position] += visits
+            if solution is None:
+                solution = child_solution
+        self.stats['rollouts'] += rollouts
+        return visit_list, solution
+
+    def _rollouts(self, root: _Node, root_digit_list: list[int], rollouts: int, exploration: float,
+                  rng: random.Random, initial_count: int,
+                  end_time: float | None = None) -> list[tuple[int, int]] | None:
+        """
+        从给定局面执行一组模拟：沿树选择、展开、随机模拟到底，再把回报沿路径回传
+
+        每次模拟只拷贝一次局面，沿树选择与随机模拟都在该拷贝上执行，不修改root_digit_list；
+        叶节点第二次被访问时才展开，此时才由拷贝构造TwinBoard列出数字对并评估score。
+        回报为被消除的格子占求解开始时非空格子的比例，清空棋盘时为1。
+
+        Args:
+            root: 该局面对应的节点
+            root_digit_list: 互补数表示的局面
+            rollouts: 模拟次数
+            exploration: 探索系数
+            rng: 随机数发生器
+            initial_count: 求解开始时的非空格子数
+            end_time: 截止时刻（time.perf_counter()），每次模拟之前与展开节点时检查，展开被截止时刻打断时放弃该次模拟，
+                None表示不限制
+
+        Returns:
+            solution: 某次模拟清空棋盘时从该局面起的消除路径，否则为None
+        """
+        root_has_empty_row = _has_empty_row(root_digit_list)
+        if root.pairs is None and not self._expand_node(root, list(root_digit_list), end_time):
+            return None
+
+        for _ in range(rollouts):
+            if end_time is not None and time.perf_counter() >= end_time:
+                break
+            digit_list = list(root_digit_list)
+            has_empty_row = root_has_empty_row
+            node, node_list, move_list = root, [root], []
+            while node.pairs:
+                position = self._select(node, exploration)
+                child = node.children[position]
+                if child is None:
+                    child = node.children[position] = _Node()
+                move_list.append(node.pairs[position])
+                _remove_pair(digit_list, *node.pairs[position], has_empty_row)
+                has_empty_row = False
+                node_list.append(child)
+                node = child
+                if node.pairs is None:
+                    if node.visits and not self._expand_node(node, digit_list, end_time):
+                        return None
+                    break
+
+            tree_depth = len(move_list)
+            remaining_count = _playout(digit_list, rng, move_list, has_empty_row)
+            self.stats['rollouts'] += 1
+            self.stats['playout_moves'] += len(move_list) - tree_depth
+            if not remaining_count:
+                return move_list
+            reward = 1.0 - remaining_count / initial_count
+            for visited_node in node_list:
+                visited_node.visits += 1
+                visited_node.value += reward
+        return None
+
+    def _select(self, node: _Node, exploration: float) -> int:
+        """
+        按PUCT公式选择子节点：平均回报 + exploration * 先验概率 * sqrt(父节点访问次数) / (1 + 子节点访问次数)
+
+        Args:
+            node: 已展开的节点
+            exploration: 探索系数
+
+        Returns:
+            position: 子节点在数字对列表中的位置
+        """
+        scale = exploration * math.sqrt(node.visits + 1)
+        best_value, best_position = -1.0, 0
+        for position, child in enumerate(node.children):
+            if child is None or not child.visits:
+                value = scale * node.priors[position]
+            else:
+                value = child.value / child.visits + scale * node.priors[position] / (1 + child.visits)
+            if value > best_value:
+                best_value, best_position = value, position
+        return best_position
+
+    @staticmethod
+    def _expand_node(node: _Node, digit_list: list[int], end_time: float | None = None) -> bool:
+        """
+        展开节点，以消除后score的softmax作为各数字对的先验概率
+
+        大棋盘上评估所有数字对需要数毫秒，因此每评估一个数字对检查一次截止时刻，超时时不展开节点。
+
+        Args:
+            node: 未展开的节点
+            digit_list: 该节点对应的互补数局面
+            end_time: 截止时刻（time.perf_counter()），None表示不限制
+
+        Returns:
+            expanded: 超时未展开时为False
+        """
+        twin_board = twin_board_from(bytes(digit_list))
+        score_list = []
+        for digit_pair in twin_board.pair_list:
+            twin_board.apply(digit_pair[0], digit_pair[1])
+            score_list.append(twin_board.score)
+            twin_board.undo()
+            if end_time is not None and time.perf_counter() >= end_time:
+                return False
+        max_score = max(score_list, default=0)
+        weight_list = [math.exp(score - max_score) for score in score_list]
+        total = sum(weight_list)
+        node.pairs = twin_board.pair_list
+        node.priors = [weight / total for weight in weight_list]
+        node.children = [None] * len(score_list)
+        return True
+
+    def hint(self, board: Board, budget: float = 0.01, exploration: float = 1.0,
+             seed: int = 0) -> tuple[Tuple[int, int] | None, float]:
+        """
+        在时限内推荐下一步消除的数字对，并给出置信度
+
+        不修改求解器的棋盘、路径和状态（stats除外）。依次复用已有的分析：缓存中该局面的清空路径，置信度为1；
+        此前提示同一局面时留下的清空路径或搜索树。之后在时限内执行与solve_mcts()相同的模拟：某次模拟清空棋盘时返回该路径的第一步，
+        置信度为1；否则把先验概率折算为伪访问次数（候选数 × 先验概率）与实际访问次数相加，返回该值最大的数字对，
+        置信度为其所占的比例：尚未完成任何模拟时即为先验概率，模拟越多越接近访问次数的比例。
+        时限在展开根局面（评估每个数字对）时也会检查，来不及展开时推荐第一个数字对，置信度为候选数的倒数。
+        推荐的数字对之后的清空路径或子树保留在备忘录中，按提示执行之后再次提示时继续使用。
+
+        Args:
+            board: Board实例
+            budget: 时限（秒），从调用时开始计时，包括构造TwinBoard与展开根局面；时限再小也会给出推荐
+            exploration: 探索系数
+            seed: 随机种子
+
+        Returns:
+            hint: (推荐的数字对, 置信度)，没有可消除数字对时为(None, 0.0)
+        """
+        end_time = time.perf_counter() + budget
+        twin_board = TwinBoard(board)
+        if not twin_board.has_pairs():
+            self.stats = {}
+            return None, 0.0
+
+        zobrist_hash = twin_board.zobrist_hash
+        digit_bytes = bytes(twin_board.digit_list)
+        # 命中缓存时同样把之后的路径写入备忘录，可能淘汰条目，因此先建立计数
+        self.stats = {'rollouts': 0, 'playout_moves': 0, 'memo_lookups': 0, 'memo_hits': 0, 'evictions': 0}
+        if self.cache is not None:
+            for mode in ('exact', 'greedy'):
+                entry = self.cache.get(mode, zobrist_hash, digit_bytes)
+                if entry is not None and entry[0]:
+                    self.stats['cache_hit'] = True
+                    return self._hint_line(twin_board, entry[1])
+
+        root = self._memo_get(self._hint_memo, (zobrist_hash, digit_bytes))
+        if isinstance(root, list):
+            return self._hint_line(twin_board, root)
+        if root is None:
+            root = _Node()
+            self._memo_put(self._hint_memo, (zobrist_hash, digit_bytes), root, HINT_MEMO_SIZE)
+        # 复用搜索树时换一个随机序列，不重复之前的模拟
+        rng = random.Random(f'{seed}:{root.visits}')
+        initial_count = len(twin_board.digit_list) - twin_board.class_histogram[0]
+        solution = self._rollouts(root, twin_board.digit_list, sys.maxsize, exploration, rng, initial_count, end_time)
+        if solution is not None:
+            return self._hint_line(twin_board, solution)
+        if root.pairs is None:
+            return twin_board.pair_list[0], 1.0 / len(twin_board.pair_list)
+
+        # 先验概率折算为与候选数相同的伪访问次数：模拟很少时PUCT会反复访问同一个数字对，只看访问比例会高估置信度
+        pseudo_count = len(root.pairs)
+        weight_list = [(child.visits if child else 0) + pseudo_count * prior
+                       for child, prior in zip(root.children, root.priors)]
+        position = weight_list.index(max(weight_list))
+        digit_pair = root.pairs[position]
+        child = root.children[position]
+        if child is not None:
+            twin_board.apply(digit_pair[0], digit_pair[1])
+            self._memo_put(self._hint_memo, (twin_board.zobrist_hash, bytes(twin_board.digit_list)), child,
+                           HINT_MEMO_SIZE)
+        return digit_pair, weight_list[position] / sum(weight_list)
+
+    def _hint_line(self, twin_board: TwinBoard, line: List[Tuple[int, int]]) -> tuple[Tuple[int, int], float]:
+        """
+        推荐清空棋盘路径的第一步，并把之后的路径记入备忘录，按提示执行之后再次提示时直接给出下一步
+
+        Args:
+            twin_board: 当前局面，会被修改
+            line: 从当前局面起清空棋盘的消除路径
+
+        Returns:
+            hint: (推荐的数字对, 置信度1.0)
+        """
+        digit_pair = line[0]
+        if len(line) > 1:
+            twin_board.apply(digit_pair[0], digit_pair[1])
+            self._memo_put(self._hint_memo, (twin_board.zobrist_hash, bytes(twin_board.digit_list)), list(line[1:]),
+                           HINT_MEMO_SIZE)
+        return digit_pair, 1.0
+
+    def solve_with_fills(self, max_fills: int = 1, fill_cost: int = 1, deadline: float | None = None,
+                         max_nodes: int | None = None) -> bool:
+        """
+        把拷贝填充也作为一步，求代价最小的清空棋盘的方案
+
+        每次消除的代价为1，每次填充的代价为fill_cost，最多填充max_fills次；path中的填充步骤为FILL_MOVE。
+        A*搜索，启发值（剩余非空格子数的一半，各互补数格子数的奇偶性要求的填充）不会高估，因此找到的方案代价最小。
+        返回False且status为UNSOLVABLE即证明在填充次数限制内不存在清空棋盘的方案。
+
+        Args:
+            max_fills: 最多填充的次数
+            fill_cost: 一次填充的代价
+            deadline: 求解时限（秒），从调用时开始计时，默认不限制
+            max_nodes: 最多展开的节点数，默认不限制
+
+        Returns:
+            solvability: 如果找到清空棋盘的方案则返回True，否则返回False
+        """
+        self.path = []
+        if deadline is not None or max_nodes is not None:
+            return self._fill_search(max_fills, fill_cost, deadline, max_nodes)
+        return self._cached(f'fill:{max_fills}:{fill_cost}',
+                            lambda: self._fill_search(max_fills, fill_cost, None, None))
+
+    def _fill_search(self, max_fills: int, fill_cost: int, deadline: float | None, max_nodes: int | None) -> bool:
+        """
+        A*搜索包含填充的方案
+
+        开放表中的局面以父局面的互补数字节串、父局面的pair_list和路径保存，同一父局面的各后继局面共享这两个对象。
+        展开时由父局面重建TwinBoard并执行路径的最后一步，该局面的数字对因此由父局面的pair_list增量得到，
+        填充后只检查新增的格子，不重新分析整个局面；再通过apply()/undo()逐个生成后继局面。消除使代价加1、启发值减1，f值不变，
+        因此f值相同时优先展开代价更大（更深）的局面，搜索在不需要填充的方案上近似深度优先。
+        以(zobrist_hash, 已填充次数)识别重复局面，只保留代价最小的一次。
+
+        Args:
+            max_fills: 最多填充的次数
+            fill_cost: 一次填充的代价
+            deadline: 求解时限（秒），None表示不限制
+            max_nodes: 最多展开的节点数，None表示不限制
+
+        Returns:
+            solvability: 如果找到清空棋盘的方案则返回True，否则返回False
+        """
+        end_time = None if deadline is None else time.perf_counter() + deadline
+        self.stats = {'nodes': 0, 'peak_states': 1, 'fills': 0}
+        self.status = UNSOLVABLE
+        if not self.twin_board.digit_list:
+            return False
+
+        def heuristic(twin_board: TwinBoard, fills: int) -> float:
+            """
+            之后至少还需的代价
+
+            消除不改变各互补数格子数的奇偶性，只有填充能使其变为偶数，因此有奇数个格子的互补数时至少还需一次填充，
+            且每个这样的互补数至少有一个格子被拷贝，填充次数用尽时则无法清空。
+            """
+            histogram = twin_board.class_histogram
+            remaining = len(twin_board.digit_list) - histogram[0]
+            odd_count = sum(count % 2 for count in histogram[1:])
+            if not odd_count:
+                return remaining // 2
+            if fills >= max_fills:
+                return float('inf')
+            return fill_cost + (remaining + odd_count + 1) // 2
+
+        # (f值, 代价的相反数, 生成顺序, 父局面的互补数字节串, 父局面的pair_list, 路径, 已填充次数)，初始局面没有父局面，
+        # 以自身代替且路径为空
+        open_list = [(heuristic(self.twin_board, 0), 0, 0, bytes(self.twin_board.digit_list), None, [], 0)]
+        best_cost_dict = {(self.twin_board.zobrist_hash, 0): 0}
+        sequence = 1
+        while open_list:
+            _, negative_cost, _, parent_bytes, parent_pair_list, path, fills = heapq.heappop(open_list)
+            twin_board = twin_board_from(parent_bytes, parent_pair_list)
+            if path:
+                twin_board.apply(path[-1][0], path[-1][1])
+            if not twin_board.digit_list:
+                self._replay(path)
+                self.stats['fills'] = fills
+                self.status = SOLVED
+                return True
+            if self.stats['nodes'] == max_nodes or end_time is not None and time.perf_counter() >= end_time:
+                self.status = TIMED_OUT
+                return False
+            self.stats['nodes'] += 1
+
+            digit_bytes = bytes(twin_board.digit_list)
+            pair_list = twin_board.pair_list
+            move_list = list(pair_list)
+            if fills < max_fills:
+                move_list.append(FILL_MOVE)
+            for move in move_list:
+                if not twin_board.apply(move[0], move[1]):
+                    continue
+                child_fills = fills + (move == FILL_MOVE)
+                cost = -negative_cost + (fill_cost if move == FILL_MOVE else 1)
+                key = (twin_board.zobrist_hash, child_fills)
+                estimate = heuristic(twin_board, child_fills)
+                if estimate != float('inf') and cost < best_cost_dict.get(key, cost + 1):
+                    best_cost_dict[key] = cost
+                    heapq.heappush(open_list, (cost + estimate, -cost, sequence, digit_bytes, pair_list,
+                                               path + [move], child_fills))
+                    sequence += 1
+                twin_board.undo()
+            self.stats['peak_states'] = max(self.stats['peak_states'], len(open_list))
+
+        return False
+
+    def _cached(self, mode: str, search: Callable[[], bool]) -> bool:
+        """
+        先查询缓存，未命中时求解并写入缓存
+
+        缓存以当前twin_board的zobrist_hash为键，命中时在twin_board上重放缓存的消除路径，
+        结果与重新求解相同。超出时限的结果不写入缓存。
+
+        Args:
+            mode: 求解模式，不同模式的结果分别缓存
+            search: 求解函数
+
+        Returns:
+            solvability: 如果能够清空棋盘则返回True，否则返回False
+        """
+        if self.cache is None:
+            return search()
+
+        zobrist_hash = self.twin_board.zobrist_hash
+        digit_bytes = bytes(self.twin_board.digit_list)
+        entry = self.cache.get(mode, zobrist_hash, digit_bytes)
+        if entry is not None:
+            solvability, path = entry
+            prefix = self.path
+            self._replay(path)
+            self.path = prefix + path
+            self.stats = {'cache_hit': True}
+            self.status = SOLVED if solvability else UNSOLVABLE
+            self._progress = None
+            return solvability
+
+        prefix_length = len(self.path)
+        solvability = search()
+        if self.status != TIMED_OUT:
+            self.cache.put(mode, zobrist_hash, digit_bytes, solvability, self.path[prefix_length:])
+        return solvability
+
+    def _replay(self, path: List[Tuple[int, int]]) -> None:
+        """
+        在twin_board上依次执行消除路径，并记录为求解结果
+
+        Args:
+            path: 消除路径，FILL_MOVE表示拷贝填充
+        """
+        for digit_pair in path:
+            if digit_pair == FILL_MOVE:
+                self.twin_board.fill()
+            else:
+                self.twin_board.match(digit_pair[0], digit_pair[1])
+        self.path = path
+
     def get_solution(self) -> List[Tuple[int, int]]:
         """
         获取最优消除路径
 
         Returns:
-            path: 最优消除路径
+            path: 最优消除路径，solve_with_fills()的路径中FILL_MOVE表示拷贝填充
         """
         return self.path
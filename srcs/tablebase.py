@@ -0,0 +1,238 @@
+import argparse
+import mmap
+import sys
+import time
+from functools import lru_cache
+from itertools import combinations
+from typing import Iterator, Tuple
+from srcs.twin_board import TwinBoard
+
+# 文件头：魔数、版本号、非空格子数上限、保留字节
+MAGIC = b'NMTB'
+VERSION = 1
+HEADER_SIZE = 8
+
+# 非空格子数上限的最大值：结果字节为1 + a * max_cells + b（a、b小于max_cells），不超过255
+MAX_CELLS = 15
+
+
+def canonical_key(digit_list: list[int], max_cells: int) -> tuple[bytes, list[int]] | None:
+    """
+    残局的规范键
+
+    只有非空格子的位置和互补数是否相同决定残局的结果：
+    开头的空行在第一次消除时被清理，所有格子上移整行，视线关系不变，因此位置从第一个非空行起算；
+    末尾的空格不在任何两个非空格子之间，忽略；互补数按第一次出现的顺序重新编号为1、2、……。
+    非空行之间的空行会改变对角线的对齐，这样的局面不在残局库中。
+
+    Args:
+        digit_list: 互补数表示的局面
+        max_cells: 非空格子数上限
+
+    Returns:
+        key: (规范键, 各非空格子的全局索引)，非空格子数为0或超过上限、或非空行之间有空行时为None
+    """
+    index_list = [global_index for global_index, digit in enumerate(digit_list) if digit]
+    if not index_list or len(index_list) > max_cells:
+        return None
+    first_row, last_row = index_list[0] // 9, index_list[-1] // 9
+    if len({global_index // 9 for global_index in index_list}) != last_row - first_row + 1:
+        return None
+
+    label_dict = {}
+    class_bytes = bytes(label_dict.setdefault(digit_list[global_index], len(label_dict) + 1)
+                        for global_index in index_list)
+    position_bytes = bytes(global_index - 9 * first_row + 1 for global_index in index_list)
+    padding = bytes(max_cells - len(index_list))
+    return position_bytes + padding + class_bytes + padding, index_list
+
+
+class Tablebase:
+    """残局库类，以内存映射读取build_tablebase()生成的文件，按规范键二分查找"""
+
+    def __init__(self, path: str):
+        """
+        打开残局库
+
+        Args:
+            path: 残局库文件路径
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self._mmap[:HEADER_SIZE]
+        if header[:4] != MAGIC or header[4] != VERSION:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a tablebase file')
+        self.max_cells = header[5]
+        self._key_size = 2 * self.max_cells
+        self._record_size = self._key_size + 1
+        self._count = (len(self._mmap) - HEADER_SIZE) // self._record_size
+
+    def __len__(self) -> int:
+        """
+        条目数
+
+        Returns:
+            length: 条目数
+        """
+        return self._count
+
+    def close(self) -> None:
+        """关闭内存映射"""
+        self._mmap.close()
+
+    def probe(self, digit_list: list[int]) -> tuple[bool, Tuple[int, int] | None] | None:
+        """
+        查询残局的结果
+
+        Args:
+            digit_list: 互补数表示的局面
+
+        Returns:
+            entry: (是否能够清空棋盘, 清空棋盘的第一步，无法清空时为None)，不在残局库中时为None
+        """
+        key = canonical_key(digit_list, self.max_cells)
+        if key is None:
+            return None
+        key_bytes, index_list = key
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER_SIZE + middle * self._record_size
+            if self._mmap[offset:offset + self._key_size] < key_bytes:
+                low = middle + 1
+            else:
+                high = middle
+        offset = HEADER_SIZE + low * self._record_size
+        if low == self._count or self._mmap[offset:offset + self._key_size] != key_bytes:
+            return None
+
+        move = self._mmap[offset + self._key_size]
+        if not move:
+            return False, None
+        position1, position2 = divmod(move - 1, self.max_cells)
+        return True, (index_list[position1], index_list[position2])
+
+
+@lru_cache(maxsize=4)
+def open_tablebase(path: str) -> Tablebase:
+    """
+    打开残局库，同一进程中相同路径只映射一次
+
+    Args:
+        path: 残局库文件路径
+
+    Returns:
+        tablebase: Tablebase实例
+    """
+    return Tablebase(path)
+
+
+def _layouts(cell_count: int, row_count: int = 0) -> Iterator[tuple[int, ...]]:
+    """
+    非空格子的所有排列位置，每一行至少有一个非空格子
+
+    Args:
+        cell_count: 剩余的非空格子数
+        row_count: 已经排列的行数
+
+    Returns:
+        layouts: 各非空格子全局索引的迭代器，按全局索引升序
+    """
+    for row_size in range(1, min(cell_count, 9) + 1):
+        for col_tuple in combinations(range(9), row_size):
+            row = tuple(9 * row_count + col_index for col_index in col_tuple)
+            if row_size == cell_count:
+                yield row
+            else:
+                for rest in _layouts(cell_count - row_size, row_count + 1):
+                    yield row + rest
+
+
+def _labelings(cell_count: int, prefix: tuple[int, ...] = ()) -> Iterator[tuple[int, ...]]:
+    """
+    按第一次出现的顺序编号、每个互补数的格子数都为偶数的所有互补数序列
+
+    Args:
+        cell_count: 序列长度
+        prefix: 已经确定的前缀
+
+    Returns:
+        labelings: 互补数序列的迭代器
+    """
+    if len(prefix) == cell_count:
+        if all(prefix.count(label) % 2 == 0 for label in set(prefix)):
+            yield prefix
+        return
+    for label in range(1, min(max(prefix, default=0) + 1, 5) + 1):
+        yield from _labelings(cell_count, prefix + (label,))
+
+
+def build_tablebase(path: str, max_cells: int = 4) -> int:
+    """
+    生成残局库文件
+
+    按非空格子数从小到大动态规划：每个残局的每一步消除之后剩下的非空格子少两个，
+    清理空行后仍在残局库中，因此直接查询已经得到的结果，不需要搜索。
+    格子数为奇数的互补数无法只通过消除清空，这样的残局不列出（由预检查拒绝）。
+
+    Args:
+        path: 输出文件路径
+        max_cells: 非空格子数上限，1到MAX_CELLS
+
+    Returns:
+        count: 条目数
+    """
+    if not 0 < max_cells <= MAX_CELLS:
+        raise ValueError(f'max_cells must be between 1 and {MAX_CELLS}, got {max_cells}')
+    result_dict = {}
+    for cell_count in range(2, max_cells + 1, 2):
+        for layout in _layouts(cell_count):
+            for labeling in _labelings(cell_count):
+                digit_list = [0] * (layout[-1] + 1)
+                for global_index, label in zip(layout, labeling):
+                    digit_list[global_index] = label
+                twin_board = TwinBoard.__new__(TwinBoard)
+                twin_board.set_digits(digit_list)
+                key_bytes, _ = canonical_key(digit_list, max_cells)
+                move = 0
+                for global_index1, global_index2 in twin_board.pair_list:
+                    twin_board.apply(global_index1, global_index2)
+                    solvability = not twin_board.digit_list or \
+                        result_dict[canonical_key(twin_board.digit_list, max_cells)[0]] > 0
+                    twin_board.undo()
+                    if solvability:
+                        move = 1 + layout.index(global_index1) * max_cells + layout.index(global_index2)
+                        break
+                result_dict[key_bytes] = move
+
+    with open(path, 'wb') as file:
+        file.write(MAGIC + bytes([VERSION, max_cells, 0, 0]))
+        for key_bytes in sorted(result_dict):
+            file.write(key_bytes + bytes([result_dict[key_bytes]]))
+    return len(result_dict)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    命令行入口，离线生成残局库
+
+    Args:
+        argv: 命令行参数，默认使用sys.argv[1:]
+    """
+    parser = argparse.ArgumentParser(description='生成NumberMatch残局库')
+    parser.add_argument('-n', '--max-cells', type=int, default=4, help=f'非空格子数上限，1到{MAX_CELLS}，默认为4')
+    parser.add_argument('-o', '--output', default='tablebase.bin', help='输出文件，默认为tablebase.bin')
+    args = parser.parse_args(argv)
+    if not 0 < args.max_cells <= MAX_CELLS:
+        parser.error(f'--max-cells must be between 1 and {MAX_CELLS}')
+
+    start = time.perf_counter()
+    count = build_tablebase(args.output, args.max_cells)
+    print(f'{count} positions in {time.perf_counter() - start:.1f}s', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
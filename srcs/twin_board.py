@@ -1,9 +1,12 @@
+from typing import Any, Callable, Iterator
 from srcs.board import Board
 
 
 class TwinBoard(Board):
     """孪生棋盘类"""
 
+    __slots__ = ('score', '_pair_list', '_pair_patch', '_class_counts')
+
     def __init__(self, board: Board):
         """
         初始化孪生棋盘
@@ -12,8 +15,148 @@ class TwinBoard(Board):
             board: Board实例
         """
         super().__init__()
-        self.digit_list = [min(digit, 10 - digit) if digit else 0 for digit in board.digit_list]
-        self._analyze()
+        self.set_digits([min(digit, 10 - digit) if digit else 0 for digit in board.digit_list])
+
+    def set_digits(self, digit_list: list[int], pair_list: list[tuple[int, int]] | None = None) -> None:
+        """
+        设置局面，pair_list在下次读取时重新列出
+
+        Args:
+            digit_list: 表示局面的整数列表，使用0表示空格
+            pair_list: 已知的该局面的可消除数字对，给出时不再重新列出；调用方保证与局面一致且之后不原地修改
+        """
+        super().set_digits(digit_list)
+        self._class_counts = [0] * 6
+        for digit in self.digit_list:
+            self._class_counts[digit] += 1
+        self.score = sum(count * (count - 1) // 2 for count in self._class_counts)
+        self._pair_list = pair_list
+        self._pair_patch = None
+
+    @property
+    def pair_list(self) -> list[tuple[int, int]]:
+        """
+        所有可消除数字对，按全局索引排序
+
+        只在读取时构建并缓存。上次构建之后若只有消除与填充而没有清理空行，则在缓存的基础上增量更新：
+        删除包含被消除格子的数字对，再检查各被消除格子在各视线轴上前后最近的非空格子，以及各新增格子在各视线轴上前一个非空格子；
+        否则完整重新列出。
+
+        Returns:
+            pair_list: 可消除数字对列表
+        """
+        if self._pair_list is None:
+            if self._pair_patch is None:
+                self._pair_list = self._find_pairs()
+            else:
+                base_pair_list, cleared, base_length = self._pair_patch
+                cleared_set = set(cleared)
+                pair_set = {pair for pair in base_pair_list
+                            if pair[0] not in cleared_set and pair[1] not in cleared_set}
+                for global_index in cleared:
+                    for axis in range(4):
+                        prev_index, next_index = self._neighbours(global_index, axis)
+                        if prev_index >= 0 and next_index >= 0 and self._is_pair(prev_index, next_index):
+                            pair_set.add((prev_index, next_index))
+                for global_index2 in range(base_length, len(self.digit_list)):
+                    if not self.digit_list[global_index2]:
+                        continue
+                    for axis in range(4):
+                        global_index1 = self._neighbours(global_index2, axis)[0]
+                        if global_index1 >= 0 and self._is_pair(global_index1, global_index2):
+                            pair_set.add((global_index1, global_index2))
+                self._pair_list = sorted(pair_set)
+            self._pair_patch = None
+        return self._pair_list
+
+    def iter_pairs(self, digit_class: int | None = None,
+                   key: Callable[[tuple[int, int]], Any] | None = None) -> Iterator[tuple[int, int]]:
+        """
+        按需逐个生成可消除数字对，调用方可以随时停止
+
+        pair_list已经构建时直接遍历；否则按全局索引顺序扫描，每个非空格子只检查其在各视线轴上的下一个非空格子，
+        生成顺序与pair_list相同，且不会构建pair_list。
+
+        Args:
+            digit_class: 只生成该互补数的数字对，默认不过滤
+            key: 排序函数，指定时先收集全部数字对再排序，默认按全局索引排序
+
+        Returns:
+            pairs: 可消除数字对的迭代器
+        """
+        if key is not None:
+            yield from sorted(self.iter_pairs(digit_class), key=key)
+            return
+
+        if self._pair_list is not None:
+            for pair in self._pair_list:
+                if digit_class is None or self.digit_list[pair[0]] == digit_class:
+                    yield pair
+            return
+
+        for global_index1, digit in enumerate(self.digit_list):
+            if not digit or digit_class is not None and digit != digit_class:
+                continue
+            next_index_set = set()
+            for axis in range(4):
+                global_index2 = self._neighbours(global_index1, axis)[1]
+                if global_index2 >= 0 and self._is_pair(global_index1, global_index2):
+                    next_index_set.add(global_index2)
+            for global_index2 in sorted(next_index_set):
+                yield global_index1, global_index2
+
+    def has_pairs(self) -> bool:
+        """
+        是否存在可消除数字对，找到第一个即返回
+
+        Returns:
+            has_pairs: 如果存在可消除数字对则返回True，否则返回False
+        """
+        return next(self.iter_pairs(), None) is not None
+
+    @property
+    def class_histogram(self) -> tuple[int, ...]:
+        """
+        各互补数的格子数
+
+        Returns:
+            class_histogram: 长度为6的元组，第d项为互补数d的格子数，第0项为空格数
+        """
+        return tuple(self._class_counts)
+
+    def _add_count(self, digit_class: int, delta: int) -> None:
+        """
+        调整一个互补数的格子数，并同步更新score
+
+        score为各互补数（包括空格）C(count, 2)之和，count变为count + delta时score的变化量为
+        C(count + delta, 2) - C(count, 2) = delta * (2 * count + delta - 1) / 2。
+
+        Args:
+            digit_class: 互补数（0表示空格）
+            delta: 格子数的变化量
+        """
+        count = self._class_counts[digit_class]
+        self.score += delta * (2 * count + delta - 1) // 2
+        self._class_counts[digit_class] = count + delta
+
+    def _fill(self) -> None:
+        """
+        拷贝填充，每个互补数的格子数翻倍，pair_list在下次读取时增量更新
+
+        原有格子之间的视线不经过新增的格子，因此原有的数字对不变；新增的数字对至少包含一个新增的格子，
+        且一定是某个新增格子与其在某视线轴上的前一个非空格子，读取时只检查新增的格子。
+        填充会重建邻居索引，此前被消除的格子不再有指针，因此尚有未完成的消除增量时先完成它。
+        pair_list尚未构建时仍在下次读取时完整列出。
+        """
+        length = len(self.digit_list)
+        if self._pair_patch is not None and self._pair_patch[1]:
+            self.pair_list
+        pair_patch = (self._pair_list, (), length) if self._pair_list is not None else self._pair_patch
+        super()._fill()
+        for digit_class in range(1, 6):
+            self._add_count(digit_class, self._class_counts[digit_class])
+        self._pair_list = None
+        self._pair_patch = pair_patch
 
     def _can_match(self, global_index1: int, global_index2: int) -> bool:
         """
@@ -29,24 +172,62 @@ class TwinBoard(Board):
         return self.digit_list[global_index1] == self.digit_list[global_index2]
 
     def _analyze(self) -> None:
-        """更新信息"""
-        self.pair_list = []
-        self.score = 0
-
-        for i in range(len(self.digit_list)):
-            for j in range(i + 1, len(self.digit_list)):
-                if self._can_match(i, j):
-                    self.score += 1
-                if self._is_pair(i, j):
-                    self.pair_list.append((i, j))
+        """更新信息，重建邻居索引并完整重新列出pair_list"""
+        self._build_index()
+        self._pair_list = self._find_pairs()
+        self._pair_patch = None
 
-    def match(self, global_index1: int, global_index2: int) -> None:
+    def _match(self, global_index1: int, global_index2: int) -> None:
         """
         配对消除
 
+        只记录被消除的格子，pair_list在下次读取时增量更新；若有空行被清理，则在下次读取时重新列出。
+
+        Args:
+            global_index1: 全局索引（0-based）
+            global_index2: 全局索引（0-based）
+        """
+        if not self._is_pair(global_index1, global_index2):
+            return
+
+        digit_class = self.digit_list[global_index1]
+        length = len(self.digit_list)
+        super()._match(global_index1, global_index2)
+        self._add_count(digit_class, -2)
+        # 被清理的空行中的格子全部是空格
+        self._add_count(0, 2 - (length - len(self.digit_list)))
+
+        if len(self.digit_list) != length:
+            self._pair_patch = None
+        elif self._pair_list is not None:
+            self._pair_patch = (self._pair_list, (global_index1, global_index2), length)
+        elif self._pair_patch is not None:
+            base_pair_list, cleared, base_length = self._pair_patch
+            self._pair_patch = (base_pair_list, cleared + (global_index1, global_index2), base_length)
+        self._pair_list = None
+
+    def _journal_entry(self, global_index1: int, global_index2: int) -> tuple:
+        """
+        记录消除或填充前的局面及配对信息
+
+        pair_list及其增量更新记录都不会被原地修改，因此同样只需保存引用；各互补数的格子数原地更新，需要拷贝。
+
         Args:
             global_index1: 全局索引（0-based）
             global_index2: 全局索引（0-based）
+
+        Returns:
+            entry: 日志条目
+        """
+        return (super()._journal_entry(global_index1, global_index2), self._pair_list, self._pair_patch, self.score,
+                list(self._class_counts))
+
+    def _rollback(self, entry: tuple) -> None:
+        """
+        根据日志条目撤销一次消除或填充
+
+        Args:
+            entry: _journal_entry()返回的日志条目
         """
-        super().match(global_index1, global_index2)
-        self._analyze()
+        board_entry, self._pair_list, self._pair_patch, self.score, self._class_counts = entry
+        super()._rollback(board_entry)
@@ -0,0 +1,135 @@
+import random
+import pytest
+from srcs.board import Board
+from srcs.twin_board import TwinBoard
+from srcs.bitboard import BitBoard, BitTwinBoard, line_masks
+
+
+def random_digits(rng, max_length=80):
+    """随机局面，空格比例随机"""
+    density = rng.random()
+    return [rng.randint(1, 9) if rng.random() < density else 0 for _ in range(rng.randint(0, max_length))]
+
+
+class TestLineMasks:
+    """测试视线掩码"""
+
+    def test_column_mask(self):
+        """测试相同列的掩码"""
+        axis_mask_list = line_masks(27)[0]
+        assert axis_mask_list[1][4] == (1 << 4) | (1 << 13) | (1 << 22)
+
+    def test_diagonal_masks_do_not_wrap(self):
+        """测试对角线掩码不跨越左右边界"""
+        axis_mask_list = line_masks(27)[0]
+        assert axis_mask_list[2][8] == 1 << 8
+        assert axis_mask_list[3][0] == 1 << 0
+        assert axis_mask_list[2][0] == (1 << 0) | (1 << 10) | (1 << 20)
+
+
+class TestBitBoard:
+    """测试BitBoard与列表引擎结果一致"""
+
+    def test_is_pair_matches_list_engine(self):
+        """测试_is_pair结果一致"""
+        rng = random.Random(0)
+        for _ in range(50):
+            digit_list = random_digits(rng, 40)
+            board = Board()
+            board.set_digits(list(digit_list))
+            bit_board = BitBoard()
+            bit_board.set_digits(list(digit_list))
+            for i in range(len(digit_list)):
+                for j in range(len(digit_list)):
+                    assert bit_board._is_pair(i, j) == board._is_pair(i, j)
+
+    def test_find_pairs_matches_list_engine(self):
+        """测试_find_pairs结果一致"""
+        rng = random.Random(1)
+        for _ in range(200):
+            digit_list = random_digits(rng)
+            board = Board()
+            board.set_digits(list(digit_list))
+            bit_board = BitBoard()
+            bit_board.set_digits(list(digit_list))
+            assert bit_board._find_pairs() == board._find_pairs()
+
+    def test_empty_board(self):
+        """测试空棋盘"""
+        bit_board = BitBoard()
+        assert bit_board._find_pairs() == []
+        assert bit_board._empty_row_count == 0
+
+    def test_zobrist_hash(self):
+        """测试消除、撤销和填充后哈希值一致"""
+        rng = random.Random(3)
+        for _ in range(30):
+            digit_list = random_digits(rng)
+            board = Board()
+            board.set_digits(list(digit_list))
+            bit_board = BitBoard()
+            bit_board.set_digits(list(digit_list))
+            for _ in range(10):
+                pair_list = board._find_pairs()
+                if not pair_list:
+                    break
+                digit_pair = rng.choice(pair_list)
+                board.match(*digit_pair)
+                bit_board.apply(*digit_pair)
+                assert bit_board.zobrist_hash == board.zobrist_hash
+            if bit_board._journal:
+                bit_board.undo()
+            bit_board.fill()
+            board = Board()
+            board.set_digits(list(bit_board.digit_list))
+            assert bit_board.zobrist_hash == board.zobrist_hash
+
+    def test_match_and_fill(self):
+        """测试消除和填充后结果一致"""
+        board = Board()
+        board.set_digits([1, 2, 3, 0, 0, 0, 0, 0, 0, 9, 8, 7])
+        bit_board = BitBoard()
+        bit_board.set_digits([1, 2, 3, 0, 0, 0, 0, 0, 0, 9, 8, 7])
+        for target in (board, bit_board):
+            target.match(2, 11)
+            target.fill()
+        assert bit_board.digit_list == board.digit_list
+        assert bit_board._find_pairs() == board._find_pairs()
+
+
+class TestBitTwinBoard:
+    """测试BitTwinBoard与列表引擎结果一致"""
+
+    def test_random_apply_undo(self):
+        """测试随机消除和撤销后配对信息一致"""
+        rng = random.Random(2)
+        for _ in range(50):
+            digit_list = random_digits(rng)
+            board = Board()
+            board.set_digits(list(digit_list))
+            twin = TwinBoard(board)
+            bit_twin = BitTwinBoard(board)
+            depth = 0
+            while twin.pair_list:
+                assert bit_twin.pair_list == twin.pair_list
+                assert bit_twin.score == twin.score
+                pair = rng.choice(twin.pair_list)
+                twin.apply(*pair)
+                bit_twin.apply(*pair)
+                depth += 1
+            for _ in range(depth):
+                twin.undo()
+                bit_twin.undo()
+                assert bit_twin.digit_list == twin.digit_list
+                assert bit_twin.pair_list == twin.pair_list
+                assert bit_twin._find_pairs() == twin._find_pairs()
+
+    def test_tall_filled_board(self):
+        """测试多次填充得到的高棋盘"""
+        rng = random.Random(3)
+        board = Board()
+        board.set_digits([rng.randint(1, 9) for _ in range(27)])
+        for _ in range(4):
+            board.match(*board._find_pairs()[0])
+            board.fill()
+        assert TwinBoard(board).pair_list == BitTwinBoard(board).pair_list
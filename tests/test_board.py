@@ -1,5 +1,6 @@
+import random
 import pytest
-from srcs.board import Board
+from srcs.board import Board, FILL_MOVE, LENGTH_KEYS
 
 
 class TestBoardInit:
@@ -334,3 +335,217 @@ class TestBoardIntegration:
         board.match(2, 3)
         board.match(4, 5)
         assert board.digit_list == []
+
+
+def reference_is_pair(board, global_index1, global_index2):
+    """逐格检查路径的参考实现"""
+    digit_list = board.digit_list
+    if not board._can_match(global_index1, global_index2) or global_index1 == global_index2:
+        return False
+    if digit_list[global_index1] == 0 or digit_list[global_index2] == 0:
+        return False
+    global_index1, global_index2 = min(global_index1, global_index2), max(global_index1, global_index2)
+    row_index1, col_index1 = divmod(global_index1, 9)
+    row_index2, col_index2 = divmod(global_index2, 9)
+    if row_index1 == row_index2 or (abs(row_index1 - row_index2) == 1 and col_index1 != col_index2 and
+                                    abs(col_index1 - col_index2) != 1):
+        return not any(digit_list[global_index1 + 1: global_index2])
+    if col_index1 == col_index2:
+        return not any(digit_list[global_index1 + 9: global_index2: 9])
+    if row_index1 + col_index1 == row_index2 + col_index2:
+        return not any(digit_list[global_index1 + 8: global_index2: 8])
+    if row_index1 - row_index2 == col_index1 - col_index2:
+        return not any(digit_list[global_index1 + 10: global_index2: 10])
+    return False
+
+
+class TestBoardNeighbourIndex:
+    """测试最近非空邻居索引"""
+
+    @staticmethod
+    def _assert_index_consistent(board):
+        """索引判断与逐格检查一致"""
+        length = len(board.digit_list)
+        expected = [(i, j) for i in range(length) for j in range(i + 1, length) if reference_is_pair(board, i, j)]
+        assert board._find_pairs() == expected
+        for i in range(length):
+            for j in range(length):
+                assert board._is_pair(i, j) == reference_is_pair(board, i, j)
+
+    def test_random_boards(self):
+        """测试随机棋盘经过消除和填充后索引仍然正确"""
+        rng = random.Random(0)
+        for _ in range(30):
+            density = rng.random()
+            board = Board()
+            board.set_digits([rng.randint(1, 9) if rng.random() < density else 0 for _ in range(rng.randint(0, 60))])
+            self._assert_index_consistent(board)
+            for _ in range(10):
+                pair_list = board._find_pairs()
+                if not pair_list:
+                    break
+                board.match(*rng.choice(pair_list))
+                self._assert_index_consistent(board)
+            board.fill()
+            self._assert_index_consistent(board)
+
+    def test_match_removes_existing_empty_rows(self):
+        """测试消除时同时清理原有的空行"""
+        board = Board()
+        board.set_digits([1, 1, 2, 0, 0, 0, 0, 0, 0,
+                          0, 0, 0, 0, 0, 0, 0, 0, 0,
+                          2, 0, 0, 0, 0, 0, 0, 0, 0])
+        board.match(0, 1)
+        assert board.digit_list == [0, 0, 2, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0]
+        assert board._is_pair(2, 9)
+
+
+class TestBoardJournal:
+    """测试apply/undo日志"""
+
+    @staticmethod
+    def _state(board):
+        """局面及索引的快照"""
+        return (list(board.digit_list), [list(axis) for axis in board._next_list],
+                [list(axis) for axis in board._prev_list], list(board._row_count_list), board._empty_row_count)
+
+    def test_apply_invalid_pair(self):
+        """测试无效配对不记入日志"""
+        board = Board()
+        board.set_digits([1, 2, 1])
+        assert board.apply(0, 2) is False
+        assert board._journal == []
+
+    def test_undo_restores_removed_rows(self):
+        """测试撤销后恢复被清理的空行"""
+        board = Board()
+        board.set_digits([1, 0, 0, 0, 0, 0, 0, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0, 0, 2, 3])
+        state = self._state(board)
+        assert board.apply(0, 9) is True
+        assert board.digit_list == [2, 3]
+        board.undo()
+        assert self._state(board) == state
+
+    def test_random_apply_undo(self):
+        """测试随机多步消除后逐步撤销恢复每一步的局面"""
+        rng = random.Random(1)
+        for _ in range(30):
+            density = rng.random()
+            board = Board()
+            board.set_digits([rng.randint(1, 9) if rng.random() < density else 0 for _ in range(rng.randint(0, 60))])
+            states = []
+            while len(states) < 10 and board._find_pairs():
+                states.append(self._state(board))
+                assert board.apply(*rng.choice(board._find_pairs()))
+            while states:
+                board.undo()
+                assert self._state(board) == states.pop()
+
+    def test_apply_fill(self):
+        """测试填充记入日志，撤销后恢复填充前的局面"""
+        board = Board()
+        board.set_digits([1, 0, 2])
+        digit_list = board.digit_list
+        state = self._state(board)
+        zobrist_hash = board.zobrist_hash
+        assert board.apply(*FILL_MOVE) is True
+        assert board.digit_list == [1, 0, 2, 1, 2]
+        assert digit_list == [1, 0, 2]
+        board.undo()
+        assert self._state(board) == state
+        assert board.zobrist_hash == zobrist_hash
+
+    def test_match_clears_journal(self):
+        """测试不记入日志的match()清空日志，之后不能撤销到不对应当前局面的条目"""
+        board = Board()
+        board.set_digits([1, 1, 2, 2, 3, 3, 4, 4, 5, 5])
+        assert board.apply(0, 1) is True
+        board.match(2, 3)
+        assert board._journal == []
+        assert board.digit_list == [0, 0, 0, 0, 3, 3, 4, 4, 5, 5]
+        with pytest.raises(IndexError):
+            board.undo()
+        assert board.digit_list == [0, 0, 0, 0, 3, 3, 4, 4, 5, 5]
+        expected = Board()
+        expected.set_digits([0, 0, 0, 0, 3, 3, 4, 4, 5, 5])
+        assert board.zobrist_hash == expected.zobrist_hash
+
+    def test_apply_fill_empty_board(self):
+        """测试没有剩余数字时不填充也不记入日志"""
+        board = Board()
+        board.set_digits([0, 0])
+        assert board.apply(*FILL_MOVE) is False
+        assert board._journal == []
+
+    def test_random_apply_fill_undo(self):
+        """测试随机消除与填充后逐步撤销恢复每一步的局面"""
+        rng = random.Random(3)
+        for _ in range(30):
+            board = Board()
+            board.set_digits([rng.randint(1, 9) for _ in range(rng.randint(1, 30))])
+            states = []
+            for _ in range(12):
+                states.append(self._state(board))
+                pair_list = board._find_pairs()
+                if pair_list and rng.random() < 0.8:
+                    assert board.apply(*rng.choice(pair_list))
+                elif not board.apply(*FILL_MOVE):
+                    states.pop()
+                    break
+            while states:
+                board.undo()
+                assert self._state(board) == states.pop()
+
+
+class TestBoardZobristHash:
+    """测试Zobrist哈希"""
+
+    @staticmethod
+    def _fresh_hash(board):
+        """重新计算的哈希值"""
+        fresh_board = Board()
+        fresh_board.set_digits(list(board.digit_list))
+        return fresh_board.zobrist_hash
+
+    def test_empty_board(self):
+        """测试空棋盘只包含长度键"""
+        board = Board()
+        assert board.zobrist_hash == LENGTH_KEYS[0]
+        assert 0 <= board.zobrist_hash < 1 << 64
+
+    def test_distinguishes_states(self):
+        """测试位置、数字和长度不同的局面哈希值不同"""
+        hash_set = set()
+        for digit_list in ([1, 1], [1, 2], [2, 1], [1, 1, 0], [0, 1, 1], [1, 0, 1], []):
+            board = Board()
+            board.set_digits(digit_list)
+            hash_set.add(board.zobrist_hash)
+        assert len(hash_set) == 7
+
+    def test_match_clear_fill(self):
+        """测试随机消除、清理空行和填充后与重新计算的哈希值一致"""
+        rng = random.Random(2)
+        for _ in range(50):
+            density = rng.random()
+            board = Board()
+            board.set_digits([rng.randint(1, 9) if rng.random() < density else 0 for _ in range(rng.randint(0, 60))])
+            assert board.zobrist_hash == self._fresh_hash(board)
+            for _ in range(20):
+                pair_list = board._find_pairs()
+                if pair_list:
+                    board.match(*rng.choice(pair_list))
+                elif len(board.digit_list) < 200:
+                    board.fill()
+                else:
+                    break
+                assert board.zobrist_hash == self._fresh_hash(board)
+
+    def test_undo(self):
+        """测试撤销后恢复哈希值"""
+        board = Board()
+        board.set_digits([1, 0, 0, 0, 0, 0, 0, 0, 0, 9, 0, 0, 0, 0, 0, 0, 0, 0, 2, 3])
+        zobrist_hash = board.zobrist_hash
+        board.apply(0, 9)
+        assert board.zobrist_hash == self._fresh_hash(board)
+        board.undo()
+        assert board.zobrist_hash == zobrist_hash
@@ -0,0 +1,77 @@
+import pytest
+from srcs.cache import SolutionCache
+
+
+class TestSolutionCacheMemory:
+    """测试内存LRU缓存"""
+
+    def test_miss_then_hit(self):
+        """测试未命中与命中计数"""
+        cache = SolutionCache()
+        assert cache.get('greedy', 1, b'\x01\x01') is None
+        cache.put('greedy', 1, b'\x01\x01', True, [(0, 1)])
+        assert cache.get('greedy', 1, b'\x01\x01') == (True, [(0, 1)])
+        assert cache.stats == {'memory_hits': 1, 'disk_hits': 0, 'misses': 1, 'evictions': 0}
+
+    def test_modes_are_separate(self):
+        """测试不同求解模式分别缓存"""
+        cache = SolutionCache()
+        cache.put('greedy', 1, b'\x01', False, [])
+        assert cache.get('exact', 1, b'\x01') is None
+
+    def test_hash_collision(self):
+        """测试哈希值相同但局面不同时视为未命中"""
+        cache = SolutionCache()
+        cache.put('greedy', 1, b'\x01\x01', True, [(0, 1)])
+        assert cache.get('greedy', 1, b'\x02\x02') is None
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = SolutionCache(capacity=2)
+        cache.put('greedy', 1, b'\x01', False, [])
+        cache.put('greedy', 2, b'\x02', False, [])
+        cache.get('greedy', 1, b'\x01')
+        cache.put('greedy', 3, b'\x03', False, [])
+        assert len(cache) == 2
+        assert cache.stats['evictions'] == 1
+        assert cache.get('greedy', 2, b'\x02') is None
+        assert cache.get('greedy', 1, b'\x01') is not None
+
+    def test_returned_path_is_copy(self):
+        """测试修改返回的路径不影响缓存"""
+        cache = SolutionCache()
+        cache.put('greedy', 1, b'\x01\x01', True, [(0, 1)])
+        cache.get('greedy', 1, b'\x01\x01')[1].append((2, 3))
+        assert cache.get('greedy', 1, b'\x01\x01') == (True, [(0, 1)])
+
+
+class TestSolutionCacheDisk:
+    """测试sqlite持久化"""
+
+    def test_persists_across_instances(self, tmp_path):
+        """测试重新打开数据库后仍能命中"""
+        path = str(tmp_path / 'cache.sqlite')
+        cache = SolutionCache(path)
+        cache.put('greedy', (1 << 64) - 1, b'\x01\x01\x02\x02', True, [(0, 1), (0, 1)])
+        cache.close()
+
+        cache = SolutionCache(path)
+        assert cache.get('greedy', (1 << 64) - 1, b'\x01\x01\x02\x02') == (True, [(0, 1), (0, 1)])
+        assert cache.stats['disk_hits'] == 1
+        assert cache.get('greedy', (1 << 64) - 1, b'\x01\x01\x02\x02') == (True, [(0, 1), (0, 1)])
+        assert cache.stats['memory_hits'] == 1
+        cache.close()
+
+    def test_evicted_entry_reloaded_from_disk(self, tmp_path):
+        """测试从内存淘汰的条目可以从数据库重新读取"""
+        cache = SolutionCache(str(tmp_path / 'cache.sqlite'), capacity=1)
+        cache.put('greedy', 1, b'\x01', False, [])
+        cache.put('greedy', 2, b'\x02', False, [])
+        assert cache.get('greedy', 1, b'\x01') == (False, [])
+        assert cache.stats == {'memory_hits': 0, 'disk_hits': 1, 'misses': 0, 'evictions': 2}
+        cache.close()
+
+    @pytest.mark.parametrize('path', [[], [(0, 1)], [(70000, 70001), (3, 12)], [(0, 1), (-1, -1), (2, 9)]])
+    def test_path_encoding(self, path):
+        """测试消除路径的编码与解码"""
+        assert list(SolutionCache._decode_path(SolutionCache._encode_path(tuple(path)))) == path
@@ -0,0 +1,114 @@
+import random
+import pytest
+from srcs.board import Board
+from srcs.twin_board import TwinBoard
+from srcs.compact_board import CompactBoard, CompactTwinBoard
+
+
+class TestCompactBoardStorage:
+    """测试CompactBoard的存储方式"""
+
+    def test_digits_stored_in_bytearray(self):
+        """测试数字以bytearray存储"""
+        board = CompactBoard()
+        board.set_digits([1, 0, 2])
+        assert isinstance(board.digit_list, bytearray)
+        assert list(board.digit_list) == [1, 0, 2]
+
+    def test_no_instance_dict(self):
+        """测试使用__slots__，实例没有__dict__"""
+        board = CompactBoard()
+        board.set_digits([1, 1])
+        assert not hasattr(board, '__dict__')
+        assert not hasattr(CompactTwinBoard(board), '__dict__')
+
+    def test_storage_kept_after_operations(self):
+        """测试消除、清理和填充后仍为bytearray"""
+        board = CompactBoard()
+        board.set_digits([1, 1, 0, 0, 0, 0, 0, 0, 0, 2, 3])
+        board.match(0, 1)
+        assert isinstance(board.digit_list, bytearray)
+        assert list(board.digit_list) == [2, 3]
+        board.fill()
+        assert isinstance(board.digit_list, bytearray)
+        assert list(board.digit_list) == [2, 3, 2, 3]
+
+    def test_str(self):
+        """测试字符串表示与列表存储一致"""
+        board = Board()
+        board.set_digits([1, 0, 2, 3, 4, 5, 6, 7, 8, 9])
+        compact_board = CompactBoard()
+        compact_board.set_digits([1, 0, 2, 3, 4, 5, 6, 7, 8, 9])
+        assert str(compact_board) == str(board)
+
+    def test_lazy_index(self):
+        """测试只在需要时建立邻居索引，之后的结果与列表存储一致"""
+        board = Board()
+        board.set_digits([1, 2, 0, 0, 0, 0, 0, 0, 0, 3, 9, 8, 2, 7])
+        compact_board = CompactBoard()
+        compact_board.set_digits(board.digit_list)
+        assert compact_board._next_list is None
+        CompactTwinBoard(compact_board)
+        assert compact_board._next_list is None
+        assert compact_board._find_pairs() == board._find_pairs()
+        assert [list(axis) for axis in compact_board._next_list] == board._next_list
+
+    def test_lazy_index_apply_undo(self):
+        """测试消除清理空行后索引重新推迟建立，撤销后仍与列表存储一致"""
+        rng = random.Random(1)
+        for _ in range(30):
+            digit_list = [rng.randint(1, 9) if rng.random() < 0.6 else 0 for _ in range(rng.randint(2, 45))]
+            board = Board()
+            board.set_digits(list(digit_list))
+            compact_board = CompactBoard()
+            compact_board.set_digits(digit_list)
+            applied = 0
+            for _ in range(5):
+                pair_list = board._find_pairs()
+                if not pair_list:
+                    break
+                pair = rng.choice(pair_list)
+                assert compact_board.apply(*pair) and board.apply(*pair)
+                applied += 1
+                assert list(compact_board.digit_list) == board.digit_list
+            for _ in range(applied):
+                compact_board.undo()
+                board.undo()
+                assert list(compact_board.digit_list) == board.digit_list
+                assert compact_board._find_pairs() == board._find_pairs()
+
+
+class TestCompactTwinBoard:
+    """测试CompactTwinBoard与列表存储结果一致"""
+
+    def test_random_match_sequences(self):
+        """测试随机消除序列的配对信息一致"""
+        rng = random.Random(0)
+        for _ in range(50):
+            digit_list = [rng.randint(1, 9) if rng.random() < 0.7 else 0 for _ in range(rng.randint(0, 60))]
+            board = Board()
+            board.set_digits(list(digit_list))
+            compact_board = CompactBoard()
+            compact_board.set_digits(digit_list)
+            twin = TwinBoard(board)
+            compact_twin = CompactTwinBoard(compact_board)
+            assert isinstance(compact_twin.digit_list, bytearray)
+            while twin.pair_list:
+                assert compact_twin.pair_list == twin.pair_list
+                assert compact_twin.score == twin.score
+                assert list(compact_twin.digit_list) == twin.digit_list
+                pair = rng.choice(twin.pair_list)
+                twin.match(*pair)
+                compact_twin.match(*pair)
+            assert list(compact_twin.digit_list) == twin.digit_list
+
+    def test_apply_undo(self):
+        """测试紧凑存储下的apply/undo"""
+        board = CompactBoard()
+        board.set_digits([1, 0, 0, 0, 0, 0, 0, 0, 0, 9, 2, 3])
+        twin = CompactTwinBoard(board)
+        twin.apply(0, 9)
+        assert list(twin.digit_list) == [0, 2, 3]
+        twin.undo()
+        assert list(twin.digit_list) == [1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 2, 3]
+        assert twin.pair_list == [(0, 9)]
@@ -0,0 +1,107 @@
+import random
+import pytest
+from srcs.board import Board
+from srcs.compact_board import CompactBoard, CompactTwinBoard
+from srcs.corpus import RECORD_HEADER, Corpus, decode, encode, save_boards
+from srcs.twin_board import TwinBoard
+
+
+def random_board(rng, length):
+    """长度为length的随机局面，约四分之一为空格"""
+    return [rng.choice((0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9)) for _ in range(length)]
+
+
+@pytest.fixture(scope='module')
+def board_list():
+    """长度各异的随机局面"""
+    rng = random.Random(0)
+    return [random_board(rng, length) for length in list(range(41)) + [rng.randrange(1, 200) for _ in range(60)]]
+
+
+@pytest.fixture(scope='module')
+def corpus_path(tmp_path_factory, board_list):
+    """包含board_list的语料文件"""
+    path = str(tmp_path_factory.mktemp('corpus') / 'corpus.bin')
+    save_boards(path, iter(board_list))
+    return path
+
+
+class TestEncode:
+    """测试encode与decode函数"""
+
+    def test_round_trip(self, board_list):
+        """测试编码后解码得到原局面，包括最后一行不满与空局面"""
+        for digit_list in board_list:
+            assert list(decode(encode(digit_list))) == digit_list
+
+    def test_size(self):
+        """测试每格4位，外加宽度与行数"""
+        record = encode([1, 2, 3] * 6)
+        assert RECORD_HEADER.unpack_from(record) == (9, 2)
+        assert len(record) == RECORD_HEADER.size + 9
+        assert record[RECORD_HEADER.size] == 0x12
+        # 最后一行不满时以0xF填充，总格子数为奇数时再补半个字节
+        assert encode([5, 0, 7]).endswith(bytes([0x50, 0x7F, 0xFF, 0xFF, 0xFF]))
+
+    def test_invalid_width(self):
+        """测试不支持的宽度"""
+        with pytest.raises(ValueError):
+            decode(RECORD_HEADER.pack(7, 1) + bytes(4))
+
+
+class TestCorpus:
+    """测试save_boards函数与Corpus类"""
+
+    def test_len_and_index(self, corpus_path, board_list):
+        """测试棋盘数与随机访问"""
+        with Corpus(corpus_path) as corpus:
+            assert len(corpus) == len(board_list)
+            for index in random.Random(1).sample(range(len(board_list)), 30):
+                assert list(corpus[index]) == board_list[index]
+            assert list(corpus[-1]) == board_list[-1]
+            with pytest.raises(IndexError):
+                corpus[len(board_list)]
+            with pytest.raises(IndexError):
+                corpus[-len(board_list) - 1]
+
+    def test_iter(self, corpus_path, board_list):
+        """测试按顺序解码所有棋盘"""
+        with Corpus(corpus_path) as corpus:
+            assert [list(digit_list) for digit_list in corpus] == board_list
+
+    def test_empty(self, tmp_path):
+        """测试不含棋盘的语料"""
+        path = str(tmp_path / 'empty.bin')
+        assert save_boards(path, []) == 0
+        with Corpus(path) as corpus:
+            assert len(corpus) == 0
+            assert list(corpus) == []
+
+    def test_invalid_file(self, tmp_path):
+        """测试不是语料的文件"""
+        path = tmp_path / 'other.bin'
+        path.write_bytes(b'SQLite format 3\x00' * 4)
+        with pytest.raises(ValueError):
+            Corpus(str(path))
+        path.write_bytes(b'NMBC')
+        with pytest.raises(ValueError):
+            Corpus(str(path))
+
+    @pytest.mark.parametrize('board_class, twin_class', [(Board, TwinBoard), (CompactBoard, CompactTwinBoard)])
+    def test_board(self, corpus_path, board_list, board_class, twin_class):
+        """测试解码为棋盘与孪生棋盘，与由列表构造的结果一致"""
+        with Corpus(corpus_path) as corpus:
+            for index in range(35, len(board_list), 7):
+                expected = board_class()
+                expected.set_digits(list(board_list[index]))
+                board = corpus.board(index, board_class)
+                assert type(board) is board_class
+                assert board.digit_list == expected.digit_list
+                assert board._find_pairs() == expected._find_pairs()
+
+                expected_twin = twin_class(expected)
+                twin_board = corpus.twin_board(index, twin_class)
+                assert type(twin_board) is twin_class
+                assert twin_board.digit_list == expected_twin.digit_list
+                assert twin_board.score == expected_twin.score
+                assert twin_board.pair_list == expected_twin.pair_list
@@ -0,0 +1,107 @@
+import io
+import json
+import random
+import pytest
+from srcs.board import Board, FILL_MOVE
+from srcs.corpus import Corpus
+from srcs.generator import generate, iter_boards, write_boards, main
+from srcs.main import iter_boards as read_boards, parse_board
+
+
+def replay(digit_list, path):
+    """按路径执行消除与填充，返回是否每一步都合法且最终清空棋盘"""
+    board = Board()
+    board.set_digits(list(digit_list))
+    for digit_pair in path:
+        if not board.apply(*digit_pair):
+            return False
+    return not any(board.digit_list)
+
+
+class TestGenerate:
+    """测试generate函数"""
+
+    @pytest.mark.parametrize('rows, density, difficulty', [
+        (1, 1.0, 0.5), (3, 0.5, 0.0), (5, 1.0, 1.0), (10, 0.3, 0.5), (2, 0.1, 1.0),
+    ])
+    def test_path_clears_board(self, rows, density, difficulty):
+        """测试按生成的路径能够清空棋盘"""
+        rng = random.Random(0)
+        for _ in range(200):
+            digit_list, path = generate(rng, rows, density, 0, difficulty)
+            assert FILL_MOVE not in path
+            assert replay(digit_list, path)
+
+    @pytest.mark.parametrize('fills', [1, 2, 3])
+    def test_fills(self, fills):
+        """测试路径中包含给定次数的填充"""
+        rng = random.Random(0)
+        for _ in range(100):
+            digit_list, path = generate(rng, 4, 0.8, fills)
+            assert path.count(FILL_MOVE) == fills
+            assert replay(digit_list, path)
+
+    def test_size(self):
+        """测试行数与非空格子数"""
+        rng = random.Random(0)
+        for _ in range(100):
+            digit_list, path = generate(rng, 4, 0.5)
+            assert (len(digit_list) + 8) // 9 == 4
+            assert sum(1 for digit in digit_list if digit) == 18 == 2 * len(path)
+
+    def test_no_empty_rows(self):
+        """测试生成的棋盘没有空行"""
+        rng = random.Random(0)
+        for _ in range(100):
+            digit_list, _ = generate(rng, 6, 0.3, 1)
+            assert all(any(digit_list[row_start: row_start + 9]) for row_start in range(0, len(digit_list), 9))
+
+
+class TestIterBoards:
+    """测试iter_boards函数"""
+
+    def test_deterministic(self):
+        """测试相同种子生成相同的棋盘，第i个棋盘与生成的数量无关"""
+        assert list(iter_boards(20, 5)) == list(iter_boards(20, 5))
+        assert list(iter_boards(20, 5))[:10] == list(iter_boards(10, 5))
+        assert list(iter_boards(10, 5)) != list(iter_boards(10, 6))
+
+
+class TestWriteBoards:
+    """测试write_boards函数"""
+
+    def test_text(self):
+        """测试text格式可以作为批量求解的输入"""
+        stream = io.StringIO()
+        assert write_boards(stream, 5, seed=1, rows=3) == 5
+        stream.seek(0)
+        line_list = [line for _, line in read_boards(stream)]
+        assert [parse_board(line) for line in line_list] == [digit_list for digit_list, _ in iter_boards(5, 1, 3)]
+
+    def test_jsonl(self):
+        """测试jsonl格式包含清空棋盘的路径"""
+        stream = io.StringIO()
+        write_boards(stream, 3, rows=2, fills=1, fmt='jsonl')
+        record_list = [json.loads(line) for line in stream.getvalue().splitlines()[1:]]
+        assert len(record_list) == 3
+        for record in record_list:
+            assert [-1, -1] in record['path']
+            assert replay(parse_board(record['board']), [tuple(digit_pair) for digit_pair in record['path']])
+
+    def test_cli(self, tmp_path, capsys):
+        """测试命令行生成棋盘文件"""
+        path = tmp_path / 'boards.txt'
+        main(['-n', '50', '-o', str(path), '--rows', '3', '--difficulty', '1'])
+        assert '50 boards' in capsys.readouterr().err
+        assert len(path.read_text(encoding='utf-8').splitlines()) == 51
+
+    def test_cli_binary(self, tmp_path, capsys):
+        """测试命令行生成二进制语料文件"""
+        path = tmp_path / 'boards.bin'
+        main(['-n', '20', '-o', str(path), '--format', 'binary'])
+        assert '20 boards' in capsys.readouterr().err
+        with Corpus(str(path)) as corpus:
+            assert [list(digit_list) for digit_list in corpus] == [
+                digit_list for digit_list, _ in iter_boards(20, 0)]
+        with pytest.raises(SystemExit):
+            main(['-n', '1', '--format', 'binary'])
@@ -0,0 +1,104 @@
+import json
+import pytest
+from srcs.board import Board
+from srcs.instrument import Instrumentation
+from srcs.solver import Solver
+from srcs.twin_board import TwinBoard
+
+
+def solve(digit_list):
+    """贪心求解一个棋盘"""
+    board = Board()
+    board.set_digits(list(digit_list))
+    solver = Solver()
+    solver.set_board(board)
+    solver.solve()
+    return solver
+
+
+class TestInstrumentation:
+    """测试Instrumentation类"""
+
+    def test_disabled_restores_originals(self):
+        """测试停用后各方法恢复为原来的函数对象，继承的方法不留下类属性"""
+        originals = (Board._is_pair, Board._neighbours, Board._clear, TwinBoard._analyze, Solver.solve,
+                     TwinBoard.__dict__['pair_list'])
+        with Instrumentation() as instrumentation:
+            assert instrumentation.enabled
+            assert Board._is_pair is not originals[0]
+            assert 'apply' in TwinBoard.__dict__
+        assert not instrumentation.enabled
+        assert (Board._is_pair, Board._neighbours, Board._clear, TwinBoard._analyze, Solver.solve,
+                TwinBoard.__dict__['pair_list']) == originals
+        assert 'apply' not in TwinBoard.__dict__
+
+    def test_nothing_recorded_when_disabled(self):
+        """测试未启用时不统计"""
+        instrumentation = Instrumentation()
+        solve([1, 4, 6, 6, 2, 9, 9, 2, 1, 6])
+        assert instrumentation.snapshot() == {'calls': {}, 'seconds': {}, 'cells_scanned': 0, 'nodes': 0,
+                                              'peak_pair_list': 0}
+
+    def test_snapshot(self):
+        """测试求解时的统计结果"""
+        with Instrumentation() as instrumentation:
+            solver = solve([1, 4, 6, 6, 2, 9, 9, 2, 1, 6, 3, 3])
+        snapshot = instrumentation.snapshot()
+        assert snapshot['calls']['solve'] == 1
+        assert snapshot['calls']['precheck'] == 1
+        assert snapshot['calls']['is_pair'] > 0
+        assert snapshot['calls']['simulate'] == snapshot['calls']['undo'] == solver.stats['nodes']
+        assert snapshot['nodes'] == solver.stats['nodes']
+        assert snapshot['peak_pair_list'] >= 1
+        assert snapshot['cells_scanned'] > 0
+        assert snapshot['seconds']['solve'] >= snapshot['seconds']['simulate']
+        json.dumps(snapshot)
+
+    def test_analyze_and_clear(self):
+        """测试重新分析与清理空行的计数"""
+        twin_board = TwinBoard(Board())
+        twin_board.set_digits([1, 1, 0, 0, 0, 0, 0, 0, 0, 2, 2])
+        with Instrumentation() as instrumentation:
+            twin_board._analyze()
+            twin_board.match(0, 1)
+        assert instrumentation.calls['analyze'] == 1
+        assert instrumentation.calls['clear'] == 1
+        assert instrumentation.calls['find_pairs'] == 1
+        # 清理空行时扫描消除后的整个局面
+        assert instrumentation.cells_scanned >= 11
+        assert twin_board.digit_list == [2, 2]
+
+    def test_same_results(self):
+        """测试启用插桩不改变求解结果"""
+        digit_list = [1, 4, 6, 6, 2, 9, 9, 2, 1, 6, 3, 7, 5, 5]
+        expected = solve(digit_list).get_solution()
+        with Instrumentation():
+            assert solve(digit_list).get_solution() == expected
+
+    def test_single_active(self):
+        """测试同一时刻只能启用一个实例"""
+        with Instrumentation() as instrumentation:
+            instrumentation.enable()
+            with pytest.raises(RuntimeError):
+                Instrumentation().enable()
+        with Instrumentation():
+            pass
+
+    def test_reset(self):
+        """测试清零计数"""
+        with Instrumentation() as instrumentation:
+            solve([1, 1, 2, 2])
+        instrumentation.reset()
+        assert instrumentation.snapshot()['calls'] == {}
+
+    def test_export(self, tmp_path):
+        """测试每次导出追加一行JSON"""
+        path = tmp_path / 'metrics.jsonl'
+        with Instrumentation() as instrumentation:
+            solve([1, 1, 2, 2])
+            instrumentation.export(str(path))
+            solve([1, 1, 2, 2])
+            instrumentation.export(str(path))
+        record_list = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        assert [record['calls']['solve'] for record in record_list] == [1, 2]
+        assert record_list[0]['timestamp'] > 0
@@ -0,0 +1,129 @@
+import io
+import json
+import pytest
+from srcs.main import parse_board, iter_boards, solve_board, run, main
+from srcs.tablebase import build_tablebase
+
+
+class TestParseBoard:
+    """测试parse_board函数"""
+
+    def test_digits(self):
+        """测试连续数字"""
+        assert parse_board('123456789') == [1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+    def test_empty_cells(self):
+        """测试'0'和'.'表示空格"""
+        assert parse_board('1.0 9') == [1, 0, 0, 9]
+
+    def test_separators(self):
+        """测试空白和逗号分隔"""
+        assert parse_board('1, 2,3\t4') == [1, 2, 3, 4]
+
+    def test_invalid_character(self):
+        """测试非法字符"""
+        with pytest.raises(ValueError):
+            parse_board('12a')
+
+
+class TestIterBoards:
+    """测试iter_boards函数"""
+
+    def test_skips_blank_and_comment_lines(self):
+        """测试跳过空行和注释行，保留原始行号"""
+        stream = io.StringIO('11\n\n# comment\n  19  \n')
+        assert list(iter_boards(stream)) == [(1, '11'), (4, '19')]
+
+
+class TestSolveBoard:
+    """测试solve_board函数"""
+
+    def test_solvable(self):
+        """测试可解棋盘的结果字段"""
+        result = solve_board(3, '1122')
+        assert result['line'] == 3
+        assert result['solvable'] is True
+        assert result['status'] == 'solved'
+        assert result['steps'] == 2
+        assert result['path'] == [[0, 1], [2, 3]]
+        assert result['setup_seconds'] >= 0
+        assert result['solve_seconds'] >= 0
+
+    def test_modes(self):
+        """测试各求解模式"""
+        line = '1466299216'
+        assert solve_board(1, line)['solvable'] is False
+        assert solve_board(1, line, mode='exact')['solvable'] is True
+        assert solve_board(1, line, mode='beam', width=4)['solvable'] is True
+
+    def test_fill_mode(self):
+        """测试fill模式的路径中[-1, -1]表示拷贝填充"""
+        result = solve_board(1, '223', mode='fill')
+        assert result['solvable'] is True
+        assert result['path'] == [[0, 1], [-1, -1], [2, 3]]
+        assert solve_board(1, '223', mode='fill', max_fills=0)['solvable'] is False
+
+    def test_deadline(self):
+        """测试贪心求解的时限"""
+        assert solve_board(1, '1122', deadline=0)['status'] == 'timed_out'
+
+    def test_tablebase(self, tmp_path):
+        """测试exact模式使用残局库"""
+        path = str(tmp_path / 'tablebase.bin')
+        build_tablebase(path, 2)
+        result = solve_board(1, '1466299216', mode='exact', tablebase_path=path)
+        assert (result['solvable'], result['steps']) == (True, 5)
+
+    def test_rejected_by(self):
+        """测试未通过预检查时报告未通过的检查"""
+        assert solve_board(1, '1122')['rejected_by'] is None
+        result = solve_board(1, '1123')
+        assert (result['status'], result['rejected_by'], result['steps']) == ('unsolvable', 'odd_class', 0)
+        assert solve_board(1, '1919', mode='exact')['rejected_by'] is None
+        assert solve_board(1, '1212', mode='exact')['rejected_by'] == 'no_pairs'
+
+    def test_invalid_line(self):
+        """测试非法输入行"""
+        assert solve_board(2, '1x') == {'line': 2, 'error': "invalid character 'x'"}
+
+
+class TestRun:
+    """测试run函数"""
+
+    LINES = ['1122', '123456789', '1.9', '1466299216', '55', '1212']
+
+    def _run(self, workers, **kwargs):
+        """批量求解LINES，返回按行号排序的结果"""
+        output_stream = io.StringIO()
+        count = run(io.StringIO('\n'.join(self.LINES) + '\n'), output_stream, workers, **kwargs)
+        result_list = [json.loads(line) for line in output_stream.getvalue().splitlines()]
+        assert count == len(result_list) == len(self.LINES)
+        return sorted(result_list, key=lambda result: result['line'])
+
+    def test_single_process(self):
+        """测试单进程按输入顺序输出"""
+        result_list = self._run(1)
+        assert [result['line'] for result in result_list] == list(range(1, len(self.LINES) + 1))
+        assert [result['solvable'] for result in result_list] == [True, False, True, False, True, False]
+
+    def test_process_pool(self):
+        """测试进程池的结果与单进程一致"""
+        def strip_timings(result_list):
+            return [{key: value for key, value in result.items() if not key.endswith('seconds')}
+                    for result in result_list]
+
+        assert strip_timings(self._run(2, max_pending=2)) == strip_timings(self._run(1))
+
+
+class TestMain:
+    """测试命令行入口"""
+
+    def test_files(self, tmp_path, capsys):
+        """测试读写文件并在标准错误输出吞吐量"""
+        input_path = tmp_path / 'boards.txt'
+        output_path = tmp_path / 'results.jsonl'
+        input_path.write_text('1122\n1212\n', encoding='utf-8')
+        main([str(input_path), '-o', str(output_path), '-w', '1', '-m', 'exact'])
+        result_list = [json.loads(line) for line in output_path.read_text(encoding='utf-8').splitlines()]
+        assert [result['solvable'] for result in result_list] == [True, False]
+        assert 'boards/s' in capsys.readouterr().err
@@ -1,7 +1,21 @@
+import random
+import time
 import pytest
-from srcs.board import Board
+from benchmarks.boards import even_board
+from srcs.board import Board, FILL_MOVE
+from srcs.cache import SolutionCache
 from srcs.twin_board import TwinBoard
-from srcs.solver import Solver
+from srcs.solver import Solver, SOLVED, UNSOLVABLE, TIMED_OUT, CANCELLED, EMPTY_BOARD, ODD_CLASS, NO_PAIRS, HINT_MEMO_SIZE, \
+    _Node, _playout
+
+
+def make_solver(digit_list):
+    """构造设置好棋盘的求解器，棋盘使用局面的拷贝"""
+    board = Board()
+    board.set_digits(list(digit_list))
+    solver = Solver()
+    solver.set_board(board)
+    return solver
 
 
 class TestSolverInit:
@@ -186,6 +200,191 @@ class TestSolverSolve:
         assert result is False
 
 
+
+class TestSolverPrecheck:
+    """测试求解前的预检查"""
+
+    @pytest.mark.parametrize('digit_list, check', [
+        ([], EMPTY_BOARD),
+        ([0, 0, 0], EMPTY_BOARD),
+        ([1, 9, 2], ODD_CLASS),
+        ([1, 1, 3, 7, 7], ODD_CLASS),
+        ([1, 2, 1, 2], NO_PAIRS),
+        ([1, 9, 2, 8], None),
+    ])
+    def test_checks(self, digit_list, check):
+        """测试各项检查"""
+        assert make_solver(digit_list).precheck() == check
+
+    @pytest.mark.parametrize('mode', ['solve', 'solve_exact', 'solve_beam', 'solve_lookahead', 'solve_mcts'])
+    def test_rejection_reported(self, mode):
+        """测试各求解模式未通过预检查时立即返回并报告未通过的检查"""
+        solver = make_solver([5, 5, 5, 1, 9, 2, 2])
+        assert getattr(solver, mode)() is False
+        assert solver.status == UNSOLVABLE
+        assert solver.stats == {'rejected_by': ODD_CLASS}
+        assert solver.get_solution() == []
+
+    def test_rejection_with_evaluator(self):
+        """测试使用自定义评估函数的束搜索同样先执行预检查"""
+        solver = make_solver([5, 5, 5, 1, 9, 2, 2])
+        assert solver.solve_beam(evaluator=lambda twin_board: 0) is False
+        assert solver.status == UNSOLVABLE
+        assert solver.stats == {'rejected_by': ODD_CLASS}
+
+    def test_sound(self):
+        """测试未通过预检查的棋盘都无法清空"""
+        rng = random.Random(0)
+        for _ in range(200):
+            solver = make_solver([rng.randint(0, 9) for _ in range(rng.randint(0, 10))])
+            if solver.precheck() is not None:
+                assert solver._exact() is False
+
+    def test_fills_not_rejected(self):
+        """测试填充可以使格子数翻倍，solve_with_fills不执行奇偶性检查"""
+        solver = make_solver([6, 6, 1, 8, 8])
+        assert solver.precheck() == ODD_CLASS
+        assert solver.solve_with_fills() is True
+
+
+class TestSolverSolveBudget:
+    """测试solve方法的时限与节点数限制"""
+
+    def test_status(self):
+        """测试求解状态"""
+        solver = make_solver([1, 1, 2, 2])
+        assert solver.status is None
+        assert solver.solve() is True
+        assert solver.status == SOLVED
+
+        solver = make_solver([1, 2, 1, 2])
+        assert solver.solve() is False
+        assert solver.status == UNSOLVABLE
+
+    def test_deadline_expired(self):
+        """测试时限为0时立即停止"""
+        solver = make_solver([1, 1, 2, 2])
+        assert solver.solve(deadline=0) is False
+        assert solver.status == TIMED_OUT
+        assert solver.get_solution() == []
+        assert solver.stats['nodes'] == 0
+
+    def test_generous_deadline(self):
+        """测试时限充足时与不限时结果一致"""
+        digit_list = [1, 1, 2, 2, 3, 7, 5, 5, 9, 9]
+        solver = make_solver(digit_list)
+        expected = solver.solve()
+
+        solver = make_solver(digit_list)
+        assert solver.solve(deadline=60) is expected
+        assert solver.status == SOLVED
+
+    def test_max_nodes_partial_path(self):
+        """测试节点数用尽时保留已执行的消除，且为完整路径的前缀"""
+        rng = random.Random(0)
+        digit_list = even_board(rng, 46)
+        solver = make_solver(digit_list)
+        solver.solve()
+        full_path = solver.get_solution()
+        total_nodes = solver.stats['nodes']
+
+        for max_nodes in (1, total_nodes // 3, total_nodes - 1):
+            solver = make_solver(digit_list)
+            assert solver.solve(max_nodes=max_nodes) is False
+            assert solver.status == TIMED_OUT
+            assert solver.stats['nodes'] == max_nodes
+            path = solver.get_solution()
+            assert path == full_path[:len(path)]
+
+    def test_resume(self):
+        """测试超出限制后再次调用从当前局面继续求解"""
+        rng = random.Random(1)
+        digit_list = even_board(rng, 46)
+        solver = make_solver(digit_list)
+        expected = solver.solve()
+        full_path = solver.get_solution()
+        total_nodes = solver.stats['nodes']
+
+        solver = make_solver(digit_list)
+        nodes = 0
+        while solver.solve(max_nodes=3) is False and solver.status == TIMED_OUT:
+            nodes += solver.stats['nodes']
+        nodes += solver.stats['nodes']
+        assert solver.status == (SOLVED if expected else UNSOLVABLE)
+        assert solver.get_solution() == full_path
+        assert nodes == total_nodes
+
+class TestSolverSolveIter:
+    """测试solve_iter方法"""
+
+    def test_matches_solve(self):
+        """测试生成的各步与solve()的路径相同，结束后状态相同"""
+        rng = random.Random(0)
+        for _ in range(20):
+            digit_list = even_board(rng, rng.choice([10, 18, 28]))
+            solver = make_solver(digit_list)
+            solvability = solver.solve()
+            iter_solver = make_solver(digit_list)
+            assert [move[0] for move in iter_solver.solve_iter()] == solver.get_solution()
+            assert iter_solver.get_solution() == solver.get_solution()
+            assert iter_solver.status == solver.status == (SOLVED if solvability else UNSOLVABLE)
+
+    def test_cleared_rows(self):
+        """测试按生成的数字对与被清理的行更新局面，与Board的局面一致"""
+        rng = random.Random(1)
+        for _ in range(20):
+            digit_list = even_board(rng, 28)
+            digit_list[rng.randrange(9)] = 0
+            board = Board()
+            board.set_digits(list(digit_list))
+            state = list(digit_list)
+            for digit_pair, cleared_rows in make_solver(digit_list).solve_iter():
+                board.match(*digit_pair)
+                state[digit_pair[0]] = state[digit_pair[1]] = 0
+                for row_index in reversed(cleared_rows):
+                    del state[9 * row_index:9 * row_index + 9]
+                assert state == board.digit_list
+
+    def test_cancel(self):
+        """测试两步之间取消后保留已生成的各步，再次求解从当前局面继续"""
+        digit_list = [1, 4, 6, 6, 2, 9, 9, 2, 1, 6, 3, 3, 5, 5]
+        full_solver = make_solver(digit_list)
+        full_solver.solve()
+        solver = make_solver(digit_list)
+        moves = solver.solve_iter()
+        first_move = next(moves)
+        moves.close()
+        assert solver.status == CANCELLED
+        assert solver.get_solution() == [first_move[0]] == full_solver.get_solution()[:1]
+        solver.solve()
+        assert solver.get_solution() == full_solver.get_solution()
+
+    def test_break_after_last_move(self):
+        """测试生成最后一步后停止迭代，已经清空棋盘时status仍为SOLVED"""
+        solver = make_solver([1, 1])
+        moves = solver.solve_iter()
+        assert next(moves)[0] == (0, 1)
+        moves.close()
+        assert solver.status == SOLVED
+        assert solver.twin_board.digit_list == []
+
+        solver = make_solver([1, 2, 3, 4, 5, 5, 4, 3, 2, 1])
+        for _ in solver.solve_iter():
+            if not solver.twin_board.digit_list:
+                break
+        assert solver.status == SOLVED
+        assert len(solver.get_solution()) == 5
+
+    def test_budget_and_rejection(self):
+        """测试时限与预检查"""
+        solver = make_solver([1, 1, 2, 2])
+        assert list(solver.solve_iter(deadline=0)) == []
+        assert solver.status == TIMED_OUT
+        solver = make_solver([1, 1, 2])
+        assert list(solver.solve_iter()) == []
+        assert solver.stats == {'rejected_by': ODD_CLASS}
+
+
 class TestSolverGetSolution:
     """测试get_solution方法"""
 
@@ -334,3 +533,594 @@ class TestSolverIntegration:
         solver.set_board(board)
         solver.solve()
         assert board.digit_list == original_digits
+
+
+class TestSolverSolveExact:
+    """测试solve_exact方法"""
+
+    @staticmethod
+    def _replay(digit_list, path):
+        """在新棋盘上按路径消除，返回消除后的数字列表"""
+        board = Board()
+        board.set_digits(list(digit_list))
+        for global_index1, global_index2 in path:
+            assert board._is_pair(global_index1, global_index2)
+            board.match(global_index1, global_index2)
+        return board.digit_list
+
+    @pytest.mark.parametrize('digit_list', [
+        [1, 4, 6, 6, 2, 9, 9, 2, 1, 6],
+        [8, 8, 7, 7, 6, 6, 2, 9, 1, 1, 2, 1],
+        [4, 7, 6, 3, 5, 5, 6, 7, 2, 8, 3, 4],
+    ])
+    def test_solves_boards_greedy_misses(self, digit_list):
+        """测试贪心失败但实际可解的棋盘"""
+        board = Board()
+        board.set_digits(list(digit_list))
+        solver = Solver()
+        solver.set_board(board)
+        assert solver.solve() is False
+
+        solver.set_board(board)
+        assert solver.solve_exact() is True
+        assert self._replay(digit_list, solver.get_solution()) == []
+
+    def test_proves_unsolvable(self):
+        """测试证明无解"""
+        board = Board()
+        board.set_digits([1, 1, 2, 1, 2, 1])
+        solver = Solver()
+        solver.set_board(board)
+        assert solver.solve_exact() is False
+        assert solver.get_solution() == []
+        assert solver.stats['nodes'] > 0
+
+    def test_empty_board(self):
+        """测试空棋盘与贪心一致返回False"""
+        board = Board()
+        board.set_digits([])
+        solver = Solver()
+        solver.set_board(board)
+        assert solver.solve_exact() is False
+
+    def test_stats(self):
+        """测试搜索统计"""
+        board = Board()
+        board.set_digits([7, 1, 8, 6, 4, 6, 2, 4, 4, 4, 3, 9, 8, 2])
+        solver = Solver()
+        solver.set_board(board)
+        assert solver.solve_exact() is False
+        assert solver.stats['table_hits'] > 0
+        assert 0 < solver.stats['hit_rate'] <= 1
+        assert solver.stats['table_lookups'] == solver.stats['nodes'] + solver.stats['table_hits']
+
+    def test_agrees_with_brute_force(self):
+        """测试与不带置换表的穷举结果一致"""
+        def brute_force(twin_board):
+            if not twin_board.digit_list:
+                return True
+            for digit_pair in list(twin_board.pair_list):
+                twin_board.apply(*digit_pair)
+                solvability = brute_force(twin_board)
+                twin_board.undo()
+                if solvability:
+                    return True
+            return False
+
+        rng = random.Random(0)
+        for _ in range(100):
+            digit_list = [rng.randint(1, 9) for _ in range(rng.choice([4, 6, 8, 10]))]
+            board = Board()
+            board.set_digits(list(digit_list))
+            solver = Solver()
+            solver.set_board(board)
+            solvability = solver.solve_exact()
+            assert solvability == brute_force(TwinBoard(board))
+            if solvability:
+                assert self._replay(digit_list, solver.get_solution()) == []
+
+
+class TestSolverSolveBeam:
+    """测试solve_beam方法"""
+
+    def test_width_one_matches_greedy(self):
+        """测试束宽为1时与贪心的路径一致"""
+        rng = random.Random(0)
+        for _ in range(50):
+            digit_list = even_board(rng, rng.choice([6, 10, 14, 18]))
+            greedy_solver = make_solver(digit_list)
+            beam_solver = make_solver(digit_list)
+            if greedy_solver.solve():
+                assert beam_solver.solve_beam(1) is True
+                assert beam_solver.get_solution() == greedy_solver.get_solution()
+
+    @pytest.mark.parametrize('digit_list', [
+        [1, 4, 6, 6, 2, 9, 9, 2, 1, 6],
+        [8, 8, 7, 7, 6, 6, 2, 9, 1, 1, 2, 1],
+        [4, 7, 6, 3, 5, 5, 6, 7, 2, 8, 3, 4],
+    ])
+    def test_solves_boards_greedy_misses(self, digit_list):
+        """测试束宽大于1时能解开贪心失败的棋盘"""
+        solver = make_solver(digit_list)
+        assert solver.solve_beam(4) is True
+        assert TestSolverSolveExact._replay(digit_list, solver.get_solution()) == []
+        assert solver.twin_board.digit_list == []
+
+    def test_max_states(self):
+        """测试内存中的候选局面数不超过上限"""
+        solver = make_solver([8, 8, 7, 7, 6, 6, 2, 9, 1, 1, 2, 1])
+        solver.solve_beam(16)
+        assert solver.stats['peak_states'] > 4
+
+        solver = make_solver([8, 8, 7, 7, 6, 6, 2, 9, 1, 1, 2, 1])
+        solver.solve_beam(4, max_states=4)
+        assert 0 < solver.stats['peak_states'] <= 4
+
+    def test_duplicate_states(self):
+        """测试不同顺序到达的相同局面只保留一个"""
+        # 消除(0, 1)再消除(3, 4)与反过来的顺序得到相同局面
+        solver = make_solver([1, 1, 5, 2, 2, 5, 3, 3])
+        solver.solve_beam(64)
+        assert solver.stats['peak_states'] < 6
+
+    def test_custom_evaluator(self):
+        """测试自定义评估函数"""
+        evaluated_list = []
+
+        def evaluator(twin_board):
+            evaluated_list.append(twin_board)
+            return -twin_board.score
+
+        solver = make_solver([1, 4, 6, 6, 2, 9, 9, 2, 1, 6])
+        solver.solve_beam(2, evaluator=evaluator)
+        assert evaluated_list
+        assert all(isinstance(twin_board, TwinBoard) for twin_board in evaluated_list)
+
+    def test_no_pairs(self):
+        """测试没有可消除数字对的棋盘"""
+        for digit_list in ([], [1, 2]):
+            solver = make_solver(digit_list)
+            assert solver.solve_beam() is False
+            assert solver.get_solution() == []
+
+
+class TestSolverSolveLookahead:
+    """测试solve_lookahead方法"""
+
+    def test_depth_one_matches_greedy(self):
+        """测试前瞻1步时与贪心的路径一致"""
+        rng = random.Random(0)
+        for _ in range(50):
+            digit_list = even_board(rng, rng.choice([6, 10, 14, 18, 28]))
+            greedy_solver = make_solver(digit_list)
+            lookahead_solver = make_solver(digit_list)
+            assert lookahead_solver.solve_lookahead(1) is greedy_solver.solve()
+            assert lookahead_solver.get_solution() == greedy_solver.get_solution()
+
+    @pytest.mark.parametrize('digit_list', [
+        [1, 4, 6, 6, 2, 9, 9, 2, 1, 6],
+        [8, 8, 7, 7, 6, 6, 2, 9, 1, 1, 2, 1],
+    ])
+    def test_solves_boards_greedy_misses(self, digit_list):
+        """测试前瞻更多步时能解开贪心失败的棋盘"""
+        solver = make_solver(digit_list)
+        assert solver.solve_lookahead(4) is True
+        assert solver.status == SOLVED
+        assert TestSolverSolveExact._replay(digit_list, solver.get_solution()) == []
+
+    def test_memo_reuse(self):
+        """测试不同消除顺序及后续步骤复用备忘录"""
+        solver = make_solver([8, 8, 7, 7, 6, 6, 2, 9, 1, 1, 2, 1])
+        solver.solve_lookahead(3)
+        assert solver.stats['memo_hits'] > 0
+        assert solver.stats['hit_rate'] == solver.stats['memo_hits'] / solver.stats['memo_lookups']
+
+    def test_eviction_keeps_result(self):
+        """测试淘汰备忘录条目只影响耗时，不影响路径"""
+        rng = random.Random(1)
+        for _ in range(10):
+            digit_list = even_board(rng, 14)
+            full_solver = make_solver(digit_list)
+            full_solver.solve_lookahead(3)
+            small_solver = make_solver(digit_list)
+            small_solver.solve_lookahead(3, memo_size=4)
+            assert small_solver.get_solution() == full_solver.get_solution()
+            assert small_solver.stats['evictions'] >= full_solver.stats['evictions']
+            assert small_solver.stats['nodes'] >= full_solver.stats['nodes']
+
+    def test_no_pairs(self):
+        """测试没有可消除数字对的棋盘"""
+        for digit_list in ([], [1, 2]):
+            solver = make_solver(digit_list)
+            assert solver.solve_lookahead() is False
+            assert solver.status == UNSOLVABLE
+            assert solver.get_solution() == []
+
+
+class TestSolverSolveMcts:
+    """测试solve_mcts方法"""
+
+    def test_playout_follows_rules(self):
+        """测试随机模拟的每一步都是可消除数字对，且结束时的局面与棋盘一致"""
+        rng = random.Random(0)
+        for _ in range(300):
+            density = rng.random()
+            board = Board()
+            board.set_digits([rng.randint(1, 9) if rng.random() < density else 0 for _ in range(rng.randint(1, 60))])
+            twin = TwinBoard(board)
+            digit_list, move_list = list(twin.digit_list), []
+            remaining_count = _playout(digit_list, rng, move_list, True)
+            for global_index1, global_index2 in move_list:
+                assert twin._is_pair(global_index1, global_index2)
+                twin.match(global_index1, global_index2)
+            assert digit_list == twin.digit_list
+            assert not twin.has_pairs()
+            assert remaining_count == len(digit_list) - digit_list.count(0)
+
+    @pytest.mark.parametrize('digit_list', [
+        [1, 4, 6, 6, 2, 9, 9, 2, 1, 6],
+        [8, 8, 7, 7, 6, 6, 2, 9, 1, 1, 2, 1],
+        [4, 7, 6, 3, 5, 5, 6, 7, 2, 8, 3, 4],
+    ])
+    def test_solves_boards_greedy_misses(self, digit_list):
+        """测试能解开贪心失败的棋盘"""
+        solver = make_solver(digit_list)
+        assert solver.solve_mcts(200) is True
+        assert solver.status == SOLVED
+        assert solver.twin_board.digit_list == []
+        assert TestSolverSolveExact._replay(digit_list, solver.get_solution()) == []
+
+    def test_large_board_path(self):
+        """测试大棋盘上返回的路径合法，且与twin_board的局面一致"""
+        rng = random.Random(1)
+        digit_list = even_board(rng, 46)
+        solver = make_solver(digit_list)
+        solver.solve_mcts(50)
+        assert solver.stats['rollouts'] > 0
+        remaining = TestSolverSolveExact._replay(digit_list, solver.get_solution())
+        assert solver.twin_board.digit_list == [min(digit, 10 - digit) if digit else 0 for digit in remaining]
+        assert not solver.twin_board.has_pairs()
+
+    def test_seed(self):
+        """测试相同的种子得到相同的路径"""
+        rng = random.Random(2)
+        digit_list = even_board(rng, 36)
+        solver1, solver2 = make_solver(digit_list), make_solver(digit_list)
+        solver1.solve_mcts(30, seed=7)
+        solver2.solve_mcts(30, seed=7)
+        assert solver1.get_solution() == solver2.get_solution()
+
+    def test_no_pairs(self):
+        """测试没有可消除数字对的棋盘"""
+        for digit_list in ([], [1, 2]):
+            solver = make_solver(digit_list)
+            assert solver.solve_mcts() is False
+            assert solver.status == UNSOLVABLE
+            assert solver.get_solution() == []
+
+
+class TestSolverHint:
+    """测试hint方法"""
+
+    @staticmethod
+    def _board(digit_list):
+        """构造棋盘"""
+        board = Board()
+        board.set_digits(list(digit_list))
+        return board
+
+    def test_legal_move(self):
+        """测试推荐的数字对可以消除，置信度在0到1之间"""
+        rng = random.Random(0)
+        for _ in range(10):
+            board = self._board(even_board(rng, 46))
+            digit_pair, confidence = Solver().hint(board, 0.005)
+            assert digit_pair in TwinBoard(board).pair_list
+            assert 0 < confidence <= 1
+
+    def test_clearing_line(self):
+        """测试模拟找到清空棋盘的路径时置信度为1，且推荐之后仍能清空"""
+        board = self._board([1, 4, 6, 6, 2, 9, 9, 2, 1, 6])
+        digit_pair, confidence = Solver().hint(board, 1.0)
+        assert confidence == 1.0
+        board.match(*digit_pair)
+        solver = Solver()
+        solver.set_board(board)
+        assert solver.solve_exact() is True
+
+    def test_zero_budget(self):
+        """测试时限为0时来不及展开根局面，推荐第一个数字对，置信度为候选数的倒数"""
+        solver = Solver()
+        board = self._board([1, 1, 5, 2, 2, 5, 3, 3])
+        pair_list = TwinBoard(board).pair_list
+        assert solver.hint(board, 0) == (pair_list[0], 1 / len(pair_list))
+        assert solver.stats['rollouts'] == 0
+
+    def test_expansion_interrupted(self):
+        """测试展开节点时检查截止时刻，超时时不展开节点，之后不限时可以正常展开"""
+        digit_list = TwinBoard(self._board(even_board(random.Random(2), 360))).digit_list
+        node = _Node()
+        assert Solver._expand_node(node, digit_list, time.perf_counter()) is False
+        assert node.pairs is None
+        assert Solver._expand_node(node, digit_list) is True
+        assert len(node.priors) == len(node.pairs)
+
+    def test_no_pairs(self):
+        """测试没有可消除数字对的棋盘"""
+        assert Solver().hint(self._board([1, 2])) == (None, 0.0)
+        assert Solver().hint(self._board([])) == (None, 0.0)
+
+    def test_reuse_cache(self):
+        """测试复用缓存中的清空路径"""
+        board = self._board([1, 4, 6, 6, 2, 9, 9, 2, 1, 6])
+        solver = Solver(cache=SolutionCache())
+        solver.set_board(board)
+        solver.solve_exact()
+        assert solver.hint(board, 0) == (solver.get_solution()[0], 1.0)
+        assert solver.stats['cache_hit'] is True
+        assert solver.stats['rollouts'] == 0
+
+    def test_cache_hit_with_full_memo(self):
+        """测试备忘录已满时命中缓存，写入清空路径淘汰条目并计数"""
+        rng = random.Random(4)
+        solver = Solver(cache=SolutionCache())
+        for _ in range(HINT_MEMO_SIZE + 6):
+            solver.hint(self._board(even_board(rng, 10)), 0)
+        assert len(solver._hint_memo) == HINT_MEMO_SIZE
+        board = self._board([1, 4, 6, 6, 2, 9, 9, 2, 1, 6])
+        solver.set_board(board)
+        solver.solve_exact()
+        assert solver.hint(board, 0) == (solver.get_solution()[0], 1.0)
+        assert solver.stats['cache_hit'] is True
+        assert solver.stats['evictions'] == 1
+
+    def test_reuse_tree(self):
+        """测试再次提示同一局面或按提示执行之后的局面时复用清空路径或搜索树"""
+        rng = random.Random(1)
+        board = self._board(even_board(rng, 46))
+        solver = Solver()
+        digit_pair, _ = solver.hint(board, 0.01)
+        assert solver.stats['memo_hits'] == 0
+        solver.hint(board, 0.01)
+        assert solver.stats['memo_hits'] == 1
+        board.match(*digit_pair)
+        solver.hint(board, 0.01)
+        assert solver.stats['memo_hits'] == 1
+
+    def test_solver_state_unchanged(self):
+        """测试提示不修改当前求解的棋盘、路径和状态"""
+        solver = Solver()
+        solver.set_board(self._board([1, 1, 2, 2]))
+        solver.solve()
+        solver.hint(self._board([3, 3, 4, 4]))
+        assert solver.get_solution() == [(0, 1), (2, 3)]
+        assert solver.status == SOLVED
+
+
+class TestSolverSolveWithFills:
+    """测试solve_with_fills方法"""
+
+    @staticmethod
+    def _replay(digit_list, path):
+        """在新棋盘上按路径消除和填充，返回之后的数字列表"""
+        board = Board()
+        board.set_digits(list(digit_list))
+        for global_index1, global_index2 in path:
+            assert board.apply(global_index1, global_index2)
+        return board.digit_list
+
+    def test_no_fill_needed(self):
+        """测试不需要填充的棋盘不填充"""
+        solver = make_solver([1, 1, 2, 2])
+        assert solver.solve_with_fills() is True
+        assert solver.get_solution() == [(0, 1), (2, 3)]
+        assert solver.status == SOLVED
+        assert solver.stats['fills'] == 0
+
+    @pytest.mark.parametrize('digit_list, path', [
+        ([2, 2, 3], [(0, 1), FILL_MOVE, (2, 3)]),
+        # 先消除再填充只需拷贝一个格子，比先填充少两步
+        ([6, 6, 1, 8, 8], [(0, 1), (3, 4), FILL_MOVE, (2, 5)]),
+    ])
+    def test_fill_required(self, digit_list, path):
+        """测试精确求解无解、填充后可解的棋盘"""
+        assert make_solver(digit_list).solve_exact() is False
+        solver = make_solver(digit_list)
+        assert solver.solve_with_fills() is True
+        assert solver.get_solution() == path
+        assert solver.stats['fills'] == 1
+        assert solver.twin_board.digit_list == []
+        assert self._replay(digit_list, path) == []
+
+    def test_shortest_plan(self):
+        """测试找到的方案代价不超过先填充再精确求解的方案"""
+        rng = random.Random(0)
+        for _ in range(20):
+            digit_list = [rng.randint(1, 9) for _ in range(rng.randint(2, 8))]
+            solver = make_solver(digit_list)
+            if solver.solve_with_fills():
+                path = solver.get_solution()
+                assert self._replay(digit_list, path) == []
+                exact_solver = make_solver(digit_list + [digit for digit in digit_list if digit])
+                if exact_solver.solve_exact():
+                    assert len(path) <= len(exact_solver.get_solution()) + 1
+
+    def test_without_fills_matches_exact(self):
+        """测试不允许填充时与精确求解的结论一致"""
+        rng = random.Random(1)
+        for _ in range(30):
+            digit_list = [rng.randint(1, 9) for _ in range(rng.choice([4, 6, 8, 10]))]
+            solver = make_solver(digit_list)
+            solvability = solver.solve_with_fills(max_fills=0)
+            assert solvability is make_solver(digit_list).solve_exact()
+            if solvability:
+                assert len(solver.get_solution()) == len(digit_list) // 2
+
+    def test_fill_cost(self):
+        """测试填充代价计入方案代价"""
+        solver = make_solver([2, 2, 3])
+        assert solver.solve_with_fills(fill_cost=5) is True
+        assert solver.get_solution() == [(0, 1), FILL_MOVE, (2, 3)]
+
+    def test_fill_limit(self):
+        """测试填充次数用尽时证明无解"""
+        solver = make_solver([1, 2])
+        assert solver.solve_with_fills(max_fills=1) is False
+        assert solver.status == UNSOLVABLE
+        assert solver.get_solution() == []
+        assert make_solver([2, 2, 3]).solve_with_fills(max_fills=0) is False
+
+    def test_max_nodes(self):
+        """测试超出节点数限制"""
+        solver = make_solver([6, 6, 1, 8, 8])
+        assert solver.solve_with_fills(max_nodes=1) is False
+        assert solver.status == TIMED_OUT
+        assert solver.stats['nodes'] == 1
+
+    def test_empty_board(self):
+        """测试空棋盘与其他求解方式一致返回False"""
+        solver = make_solver([])
+        assert solver.solve_with_fills() is False
+        assert solver.status == UNSOLVABLE
+
+
+class TestSolverParallel:
+    """测试在进程池中并行求解"""
+
+    @staticmethod
+    def _solve(workers, digit_list, mode, **kwargs):
+        """使用给定进程数求解，返回结果、路径和状态"""
+        board = Board()
+        board.set_digits(list(digit_list))
+        with Solver(workers) as solver:
+            solver.set_board(board)
+            solvability = getattr(solver, mode)(**kwargs)
+            return solvability, solver.get_solution(), solver.status
+
+    def test_solve_matches_sequential(self):
+        """测试并行贪心的选择与单进程一致"""
+        rng = random.Random(0)
+        for workers in (2, 3):
+            digit_list = even_board(rng, 90)
+            assert self._solve(workers, digit_list, 'solve') == self._solve(1, digit_list, 'solve')
+
+    def test_solve_exact_matches_sequential(self):
+        """测试并行精确求解找到的路径与单进程一致"""
+        rng = random.Random(0)
+        for _ in range(5):
+            digit_list = even_board(rng, 10)
+            assert self._solve(2, digit_list, 'solve_exact') == self._solve(1, digit_list, 'solve_exact')
+        for digit_list in ([1, 4, 6, 6, 2, 9, 9, 2, 1, 6], [1, 9]):
+            solvability, path, _ = self._solve(2, digit_list, 'solve_exact')
+            assert solvability is True
+            assert TestSolverSolveExact._replay(digit_list, path) == []
+
+    def test_solve_mcts_parallel(self):
+        """测试并行模拟的路径合法且可复现"""
+        rng = random.Random(3)
+        digit_list = even_board(rng, 28)
+        result = self._solve(2, digit_list, 'solve_mcts', rollouts=40, seed=1)
+        assert result == self._solve(2, digit_list, 'solve_mcts', rollouts=40, seed=1)
+        TestSolverSolveExact._replay(digit_list, result[1])
+        solvability, path, status = self._solve(2, [1, 4, 6, 6, 2, 9, 9, 2, 1, 6], 'solve_mcts', rollouts=100)
+        assert (solvability, status) == (True, SOLVED)
+        assert TestSolverSolveExact._replay([1, 4, 6, 6, 2, 9, 9, 2, 1, 6], path) == []
+
+    def test_solve_mcts_zero_rollouts(self):
+        """测试模拟次数为0时并行与单进程一致，每一步都选择第一个数字对"""
+        rng = random.Random(5)
+        for _ in range(3):
+            digit_list = even_board(rng, 28)
+            assert self._solve(2, digit_list, 'solve_mcts', rollouts=0) == \
+                self._solve(1, digit_list, 'solve_mcts', rollouts=0)
+
+    def test_deadline(self):
+        """测试并行评估超出时限"""
+        rng = random.Random(0)
+        digit_list = even_board(rng, 90)
+        solvability, path, status = self._solve(2, digit_list, 'solve', deadline=0)
+        assert solvability is False
+        assert path == []
+        assert status == TIMED_OUT
+
+    def test_close(self):
+        """测试关闭进程池"""
+        solver = Solver(2)
+        solver.close()
+        board = Board()
+        board.set_digits([1, 1])
+        solver.set_board(board)
+        assert solver.solve_exact() is True
+        solver.close()
+        solver.close()
+
+
+class TestSolverCache:
+    """测试求解结果缓存"""
+
+    @staticmethod
+    def _solve(cache, digit_list, mode='solve', **kwargs):
+        """使用给定缓存求解，返回求解器"""
+        board = Board()
+        board.set_digits(list(digit_list))
+        solver = Solver(cache=cache)
+        solver.set_board(board)
+        getattr(solver, mode)(**kwargs)
+        return solver
+
+    @pytest.mark.parametrize('mode', ['solve', 'solve_exact', 'solve_beam', 'solve_lookahead', 'solve_mcts'])
+    def test_hit_matches_fresh_solve(self, mode):
+        """测试命中缓存时的结果与重新求解相同"""
+        rng = random.Random(0)
+        cache = SolutionCache()
+        for _ in range(20):
+            digit_list = even_board(rng, 12)
+            fresh = self._solve(None, digit_list, mode)
+            self._solve(cache, digit_list, mode)
+            cached = self._solve(cache, digit_list, mode)
+            assert cached.stats == {'cache_hit': True}
+            assert (cached.get_solution(), cached.status) == (fresh.get_solution(), fresh.status)
+            assert cached.twin_board.digit_list == fresh.twin_board.digit_list
+        assert cache.stats['memory_hits'] == 20
+
+    def test_fill_path_cached(self, tmp_path):
+        """测试包含填充步骤的路径经数据库缓存后重放结果相同"""
+        path = str(tmp_path / 'solutions.db')
+        cache = SolutionCache(path)
+        fresh = self._solve(cache, [6, 6, 1, 8, 8], 'solve_with_fills')
+        cache.close()
+        cache = SolutionCache(path)
+        cached = self._solve(cache, [6, 6, 1, 8, 8], 'solve_with_fills')
+        assert cached.stats == {'cache_hit': True}
+        assert cached.get_solution() == fresh.get_solution() == [(0, 1), (3, 4), FILL_MOVE, (2, 5)]
+        assert cached.twin_board.digit_list == []
+        cache.close()
+
+    def test_equivalent_boards_share_entry(self):
+        """测试互补数相同的棋盘共用缓存条目"""
+        cache = SolutionCache()
+        self._solve(cache, [1, 9, 2, 8])
+        solver = self._solve(cache, [9, 1, 8, 2])
+        assert solver.stats == {'cache_hit': True}
+        assert solver.status == SOLVED
+
+    def test_modes_cached_separately(self):
+        """测试贪心与精确求解分别缓存"""
+        cache = SolutionCache()
+        digit_list = [1, 4, 6, 6, 2, 9, 9, 2, 1, 6]
+        assert self._solve(cache, digit_list).status == UNSOLVABLE
+        assert self._solve(cache, digit_list, 'solve_exact').status == SOLVED
+
+    def test_timed_out_not_cached(self):
+        """测试超出时限的结果不写入缓存"""
+        cache = SolutionCache()
+        self._solve(cache, [1, 1, 2, 2], deadline=0)
+        solver = self._solve(cache, [1, 1, 2, 2])
+        assert solver.stats != {'cache_hit': True}
+        assert solver.status == SOLVED
+
+    def test_custom_evaluator_not_cached(self):
+        """测试自定义评估函数的束搜索不使用缓存"""
+        cache = SolutionCache()
+        self._solve(cache, [1, 1, 2, 2], 'solve_beam', evaluator=lambda twin_board: 0)
+        assert cache.stats['misses'] == 0
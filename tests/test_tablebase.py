@@ -0,0 +1,149 @@
+import random
+import pytest
+from srcs.board import Board
+from srcs.solver import Solver
+from srcs.tablebase import MAX_CELLS, Tablebase, build_tablebase, canonical_key, open_tablebase, main
+
+
+@pytest.fixture(scope='module')
+def tablebase_path(tmp_path_factory):
+    """上限为2的残局库文件"""
+    path = str(tmp_path_factory.mktemp('tablebase') / 'tablebase.bin')
+    build_tablebase(path, 2)
+    return path
+
+
+class TestCanonicalKey:
+    """测试canonical_key函数"""
+
+    def test_relabel_classes(self):
+        """测试互补数按第一次出现的顺序重新编号"""
+        assert canonical_key([3, 0, 5, 3, 5], 4) == canonical_key([1, 0, 4, 1, 4], 4)
+        assert canonical_key([3, 0, 5, 3, 5], 4)[0] != canonical_key([3, 0, 3, 5, 5], 4)[0]
+
+    def test_leading_rows_and_trailing_cells(self):
+        """测试忽略开头的空行与末尾的空格"""
+        key_bytes, index_list = canonical_key([0] * 9 + [0, 1, 0, 1, 0, 0], 2)
+        assert key_bytes == canonical_key([0, 1, 0, 1], 2)[0]
+        assert index_list == [10, 12]
+
+    def test_not_covered(self):
+        """测试不在残局库范围内的局面"""
+        assert canonical_key([], 4) is None
+        assert canonical_key([0, 0], 4) is None
+        assert canonical_key([1, 1, 2, 2, 3, 3], 4) is None
+        # 非空行之间有空行
+        assert canonical_key([1] + [0] * 17 + [1], 4) is None
+
+
+class TestTablebase:
+    """测试Tablebase类"""
+
+    def test_header(self, tablebase_path):
+        """测试读取文件头"""
+        tablebase = Tablebase(tablebase_path)
+        assert tablebase.max_cells == 2
+        assert len(tablebase) == 117
+        tablebase.close()
+
+    def test_invalid_file(self, tmp_path):
+        """测试不是残局库的文件"""
+        path = tmp_path / 'other.bin'
+        path.write_bytes(b'SQLite format 3\x00')
+        with pytest.raises(ValueError):
+            Tablebase(str(path))
+
+    def test_probe(self, tablebase_path):
+        """测试查询结果与规则一致"""
+        tablebase = open_tablebase(tablebase_path)
+        assert tablebase.probe([0, 3, 0, 3]) == (True, (1, 3))
+        assert tablebase.probe([4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4]) == (True, (0, 10))
+        # 相邻两行的两个格子总是线性相邻，两个格子的残局都能清空
+        assert tablebase.probe([0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2]) == (True, (1, 17))
+        assert tablebase.probe([1, 2]) is None
+        assert tablebase.probe([1, 1, 1, 1]) is None
+
+    def test_unsolvable_record(self, tmp_path):
+        """测试结果字节为0的记录表示无法清空"""
+        path = tmp_path / 'tablebase.bin'
+        key_bytes, _ = canonical_key([1, 2, 1, 2], 4)
+        path.write_bytes(b'NMTB' + bytes([1, 4, 0, 0]) + key_bytes + b'\x00')
+        tablebase = Tablebase(str(path))
+        assert tablebase.probe([0] * 9 + [3, 5, 3, 5]) == (False, None)
+        assert tablebase.probe([1, 1, 2, 2]) is None
+
+    def test_agrees_with_exact(self, tablebase_path):
+        """测试残局库覆盖的局面与精确求解的结论一致"""
+        tablebase = open_tablebase(tablebase_path)
+        rng = random.Random(0)
+        for _ in range(200):
+            digit_list = [0] * rng.randint(2, 27)
+            for global_index in rng.sample(range(len(digit_list)), 2):
+                digit_list[global_index] = 1
+            board = Board()
+            board.set_digits(digit_list)
+            solver = Solver()
+            solver.set_board(board)
+            entry = tablebase.probe(solver.twin_board.digit_list)
+            if entry is not None:
+                assert entry[0] == solver._exact()
+
+    def test_cli(self, tmp_path, capsys):
+        """测试命令行生成残局库"""
+        path = str(tmp_path / 'tablebase.bin')
+        main(['-n', '2', '-o', path])
+        assert '117 positions' in capsys.readouterr().err
+        assert len(Tablebase(path)) == 117
+
+    def test_max_cells_limit(self, tmp_path):
+        """测试结果字节容纳不下的上限在生成前即被拒绝"""
+        path = str(tmp_path / 'tablebase.bin')
+        for max_cells in (0, MAX_CELLS + 1):
+            with pytest.raises(ValueError):
+                build_tablebase(path, max_cells)
+        with pytest.raises(SystemExit):
+            main(['-n', str(MAX_CELLS + 1), '-o', path])
+
+
+class TestSolverTablebase:
+    """测试Solver使用残局库"""
+
+    @staticmethod
+    def _solver(digit_list, tablebase=None):
+        """构造设置好棋盘的求解器"""
+        board = Board()
+        board.set_digits(list(digit_list))
+        solver = Solver(tablebase=tablebase)
+        solver.set_board(board)
+        return solver
+
+    def test_same_conclusion(self, tablebase_path):
+        """测试使用残局库时精确求解的结论不变，找到的路径能够清空棋盘"""
+        tablebase = open_tablebase(tablebase_path)
+        rng = random.Random(0)
+        hits = 0
+        for _ in range(50):
+            half = [rng.randint(1, 9) for _ in range(rng.choice([3, 4, 5]))]
+            digit_list = half + half
+            rng.shuffle(digit_list)
+            solver = self._solver(digit_list, tablebase)
+            solvability = solver.solve_exact()
+            assert solvability == self._solver(digit_list).solve_exact()
+            if solvability:
+                assert solver.twin_board.digit_list == []
+                board = Board()
+                board.set_digits(list(digit_list))
+                for digit_pair in solver.get_solution():
+                    board.match(*digit_pair)
+                assert board.digit_list == []
+            hits += solver.stats.get('tablebase_hits', 0)
+        assert hits > 0
+
+    def test_parallel(self, tablebase_path):
+        """测试并行精确求解时子进程按路径打开残局库"""
+        with Solver(2, tablebase=open_tablebase(tablebase_path)) as solver:
+            board = Board()
+            board.set_digits([1, 4, 6, 6, 2, 9, 9, 2, 1, 6])
+            solver.set_board(board)
+            assert solver.solve_exact() is True
+            assert solver.stats['tablebase_hits'] > 0
@@ -1,5 +1,6 @@
+import random
 import pytest
-from srcs.board import Board
+from srcs.board import Board, FILL_MOVE
 from srcs.twin_board import TwinBoard
 
 
@@ -268,3 +269,260 @@ class TestTwinBoardIntegration:
         assert twin.digit_list[0] == twin.digit_list[1]
         assert twin.digit_list[2] == twin.digit_list[3]
         assert twin.digit_list[4] == twin.digit_list[5]
+
+
+class TestTwinBoardIncrementalMatch:
+    """测试TwinBoard增量维护配对信息"""
+
+    @staticmethod
+    def _assert_consistent(twin):
+        """增量结果与完整_analyze()结果一致"""
+        pair_list = list(twin.pair_list)
+        twin._analyze()
+        assert pair_list == twin.pair_list
+        class_histogram = tuple(twin.digit_list.count(digit_class) for digit_class in range(6))
+        assert twin.class_histogram == class_histogram
+        assert twin.score == sum(count * (count - 1) // 2 for count in class_histogram)
+        fresh_board = Board()
+        fresh_board.set_digits(list(twin.digit_list))
+        assert twin.zobrist_hash == fresh_board.zobrist_hash
+
+    def test_random_match_sequences(self):
+        """测试随机消除序列与完整分析一致"""
+        rng = random.Random(0)
+        for _ in range(100):
+            density = rng.random()
+            digits = [rng.randint(1, 9) if rng.random() < density else 0 for _ in range(rng.randint(0, 90))]
+            board = Board()
+            board.set_digits(digits)
+            twin = TwinBoard(board)
+            while twin.pair_list:
+                twin.match(*rng.choice(twin.pair_list))
+                self._assert_consistent(twin)
+
+    def test_match_removes_row_between(self):
+        """测试清理中间行后跨越边界的数字对"""
+        board = Board()
+        board.set_digits([1, 0, 0, 0, 0, 0, 0, 0, 0,
+                          2, 0, 0, 0, 0, 0, 0, 0, 2,
+                          0, 0, 0, 1, 0, 0, 0, 0, 0])
+        twin = TwinBoard(board)
+        assert (0, 21) not in twin.pair_list
+        twin.match(9, 17)
+        assert twin.digit_list == [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0]
+        assert (0, 12) in twin.pair_list
+        self._assert_consistent(twin)
+
+    def test_match_after_fill(self):
+        """测试fill()之后的消除仍得到完整分析结果"""
+        board = Board()
+        board.set_digits([1, 2, 3, 4, 5, 6, 7, 8, 9, 1])
+        twin = TwinBoard(board)
+        twin.fill()
+        twin.match(0, 8)
+        self._assert_consistent(twin)
+
+    def test_invalid_match_keeps_information(self):
+        """测试无效配对不改变配对信息"""
+        board = Board()
+        board.set_digits([1, 2, 1, 2])
+        twin = TwinBoard(board)
+        pair_list, score = list(twin.pair_list), twin.score
+        twin.match(0, 2)
+        assert twin.pair_list == pair_list
+        assert twin.score == score
+
+
+class TestTwinBoardClassHistogram:
+    """测试各互补数的格子数"""
+
+    def test_construction(self):
+        """测试构造时统计各互补数的格子数"""
+        board = Board()
+        board.set_digits([1, 9, 5, 0, 2, 8, 3])
+        twin = TwinBoard(board)
+        assert twin.class_histogram == (1, 2, 2, 1, 0, 1)
+        assert twin.score == 2
+
+    def test_fill_doubles_counts(self):
+        """测试填充后各互补数的格子数翻倍，空格数不变"""
+        board = Board()
+        board.set_digits([1, 9, 5, 0, 2, 8, 3])
+        twin = TwinBoard(board)
+        twin.fill()
+        assert twin.class_histogram == (1, 4, 4, 2, 0, 2)
+        twin._analyze()
+        TestTwinBoardIncrementalMatch._assert_consistent(twin)
+
+    def test_fill_pairs_incremental(self, monkeypatch):
+        """测试填充后增量列出的数字对与完整分析一致，且不完整重新列出"""
+        rng = random.Random(6)
+        for _ in range(100):
+            board = Board()
+            board.set_digits([rng.randint(1, 9) if rng.random() < 0.6 else 0 for _ in range(rng.randint(1, 40))])
+            twin = TwinBoard(board)
+            for _ in range(rng.randint(0, 4)):
+                if twin.has_pairs():
+                    twin.match(*rng.choice(twin.pair_list))
+            twin.pair_list
+            with monkeypatch.context() as patch:
+                patch.setattr(TwinBoard, '_find_pairs', None)
+                twin.fill()
+                pair_list = twin.pair_list
+            fresh_board = Board()
+            fresh_board.set_digits(list(twin.digit_list))
+            assert pair_list == TwinBoard(fresh_board).pair_list
+
+    def test_apply_fill_undo(self):
+        """测试填充记入日志，撤销后恢复配对信息"""
+        board = Board()
+        board.set_digits([1, 2, 3, 0, 0, 0, 0, 0, 0, 4])
+        twin = TwinBoard(board)
+        pair_list = twin.pair_list
+        state = (list(twin.digit_list), twin.score, twin.class_histogram, twin.zobrist_hash)
+        assert twin.apply(*FILL_MOVE) is True
+        TestTwinBoardIncrementalMatch._assert_consistent(twin)
+        twin.undo()
+        assert (list(twin.digit_list), twin.score, twin.class_histogram, twin.zobrist_hash) == state
+        assert twin.pair_list is pair_list
+
+    def test_random_match_fill_undo(self):
+        """测试随机消除、填充和撤销后与重新统计一致"""
+        rng = random.Random(4)
+        for _ in range(50):
+            board = Board()
+            board.set_digits([rng.randint(0, 9) for _ in range(rng.randint(0, 50))])
+            twin = TwinBoard(board)
+            for _ in range(15):
+                if twin.pair_list:
+                    twin.apply(*rng.choice(twin.pair_list))
+                elif len(twin.digit_list) < 200:
+                    twin.fill()
+                    twin._analyze()
+                TestTwinBoardIncrementalMatch._assert_consistent(twin)
+            while twin._journal:
+                twin.undo()
+                TestTwinBoardIncrementalMatch._assert_consistent(twin)
+
+
+class TestTwinBoardLazyPairs:
+    """测试按需构建pair_list与iter_pairs"""
+
+    @staticmethod
+    def _twin(digit_list):
+        """由数字列表构造孪生棋盘"""
+        board = Board()
+        board.set_digits(list(digit_list))
+        return TwinBoard(board)
+
+    def test_iter_pairs_matches_pair_list(self):
+        """测试逐个生成的数字对及顺序与pair_list一致"""
+        rng = random.Random(5)
+        for _ in range(100):
+            twin = self._twin([rng.randint(0, 9) for _ in range(rng.randint(0, 60))])
+            for _ in range(rng.randint(0, 5)):
+                if twin.has_pairs():
+                    twin.match(*next(twin.iter_pairs()))
+            lazy_pair_list = list(twin.iter_pairs())
+            assert twin._pair_list is None
+            assert lazy_pair_list == twin.pair_list
+            assert list(twin.iter_pairs()) == twin.pair_list
+
+    def test_digit_class_filter(self):
+        """测试按互补数过滤"""
+        twin = self._twin([1, 9, 2, 8, 3, 3])
+        assert list(twin.iter_pairs(digit_class=2)) == [(2, 3)]
+        twin.pair_list
+        assert list(twin.iter_pairs(digit_class=3)) == [(4, 5)]
+        assert list(twin.iter_pairs(digit_class=4)) == []
+
+    def test_key_ordering(self):
+        """测试指定排序函数"""
+        twin = self._twin([1, 9, 2, 8, 3, 3])
+        assert list(twin.iter_pairs(key=lambda pair: -pair[0])) == [(4, 5), (2, 3), (0, 1)]
+
+    def test_has_pairs_stops_early(self):
+        """测试has_pairs找到第一个数字对即返回且不构建pair_list"""
+        twin = self._twin([1, 1] + [2, 3] * 40)
+        assert twin.has_pairs() is True
+        assert twin._pair_list is None
+        assert self._twin([1, 2, 1, 2]).has_pairs() is False
+        assert self._twin([]).has_pairs() is False
+
+    def test_pair_list_built_on_read(self):
+        """测试消除后只在读取时构建pair_list，撤销后恢复原对象"""
+        twin = self._twin([1, 1, 2, 5, 2, 3, 3, 4, 4])
+        pair_list = twin.pair_list
+        assert twin.pair_list is pair_list
+        twin.apply(0, 1)
+        twin.apply(5, 6)
+        assert twin._pair_list is None
+        assert twin.pair_list == [(7, 8)]
+        twin.undo()
+        twin.undo()
+        assert twin.pair_list is pair_list
+
+    def test_fill_refreshes_pair_list(self):
+        """测试填充后读取pair_list得到新局面的数字对"""
+        twin = self._twin([1] + [0] * 8)
+        assert twin.pair_list == []
+        twin.fill()
+        assert twin.pair_list == [(0, 9)]
+
+    def test_fill_is_lazy(self):
+        """测试填充只记录增量，读取时只检查新增的格子，结果与完整分析一致"""
+        twin = self._twin([1, 2, 3, 9, 4, 4, 5, 0, 6])
+        pair_list = twin.pair_list
+        twin.apply(*FILL_MOVE)
+        assert twin._pair_list is None
+        assert twin._pair_patch == (pair_list, (), 9)
+        TestTwinBoardIncrementalMatch._assert_consistent(twin)
+        twin.undo()
+        assert twin.pair_list is pair_list
+
+    def test_random_match_fill_sequences(self):
+        """测试随机交替消除、填充与读取时增量结果与完整分析一致"""
+        rng = random.Random(6)
+        for _ in range(60):
+            twin = self._twin([rng.randint(1, 9) if rng.random() < 0.8 else 0 for _ in range(rng.randint(1, 27))])
+            for _ in range(8):
+                if rng.random() < 0.5:
+                    twin.pair_list
+                pair_list = list(twin.iter_pairs())
+                if pair_list and rng.random() < 0.75:
+                    twin.match(*rng.choice(pair_list))
+                elif any(twin.digit_list) and len(twin.digit_list) < 150:
+                    twin.fill()
+                else:
+                    break
+            TestTwinBoardIncrementalMatch._assert_consistent(twin)
+
+    def test_set_digits_with_known_pairs(self):
+        """测试设置局面时给出已知的数字对则不再重新列出"""
+        twin = self._twin([1, 1, 2])
+        pair_list = twin.pair_list
+        other = TwinBoard.__new__(TwinBoard)
+        other.set_digits([1, 1, 2], pair_list)
+        assert other.pair_list is pair_list
+
+
+class TestTwinBoardJournal:
+    """测试TwinBoard的apply/undo日志"""
+
+    def test_undo_restores_information(self):
+        """测试撤销后恢复配对信息"""
+        rng = random.Random(2)
+        for _ in range(30):
+            board = Board()
+            board.set_digits([rng.randint(1, 9) if rng.random() < 0.7 else 0 for _ in range(rng.randint(0, 60))])
+            twin = TwinBoard(board)
+            states = []
+            while twin.pair_list:
+                states.append((list(twin.digit_list), twin.pair_list, twin.score, twin.zobrist_hash))
+                twin.apply(*rng.choice(twin.pair_list))
+            while states:
+                twin.undo()
+                assert (twin.digit_list, twin.pair_list, twin.score, twin.zobrist_hash) == states.pop()
+            if twin.pair_list:
+                twin.apply(*twin.pair_list[0])
+            TestTwinBoardIncrementalMatch._assert_consistent(twin)